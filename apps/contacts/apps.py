@@ -5,3 +5,6 @@ class ContactsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.contacts'
 
+    
+    def ready(self):
+        import apps.contacts.signals  # noqa
@@ -2,7 +2,7 @@
 Contact forms
 """
 from django import forms
-from apps.contacts.models import Contact
+from apps.contacts.models import Contact, normalize_email
 
 
 class ContactForm(forms.ModelForm):
@@ -35,7 +35,9 @@ class ContactForm(forms.ModelForm):
     
     def clean_email(self):
         email = self.cleaned_data.get('email')
-        if email and Contact.objects.filter(email=email).exclude(pk=self.instance.pk).exists():
+        if email and Contact.objects.filter(
+            email_key=normalize_email(email)
+        ).exclude(pk=self.instance.pk).exists():
             raise forms.ValidationError("Email already exists")
         return email
 
@@ -0,0 +1,33 @@
+# Generated by Django 5.0.1 on 2026-10-18 17:05
+
+from django.db import migrations, models
+
+
+def backfill_email_keys(apps, schema_editor):
+    """Key the oldest contact of each email; later duplicates keep NULL"""
+    Contact = apps.get_model('contacts', 'Contact')
+    table = schema_editor.quote_name(Contact._meta.db_table)
+    schema_editor.execute(
+        f"UPDATE {table} SET email_key = LOWER(TRIM(email)) "
+        f"WHERE id IN ("
+        f"SELECT MIN(id) FROM {table} "
+        f"WHERE email IS NOT NULL AND TRIM(email) <> '' "
+        f"GROUP BY LOWER(TRIM(email))"
+        f")"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contacts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contact',
+            name='email_key',
+            field=models.CharField(blank=True, editable=False, max_length=254, null=True, unique=True),
+        ),
+        migrations.RunPython(backfill_email_keys, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 5.0.1 on 2026-10-18 18:37
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+# Names and companies are not stemmed ('simple' config); emails are also
+# indexed split on punctuation so 'doe' or 'example' find john.doe@example.com
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('simple', coalesce({row}full_name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce({row}company, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce({row}email, '')), 'C') || "
+    "setweight(to_tsvector('simple', regexp_replace(coalesce({row}email, ''), '[@._+-]+', ' ', 'g')), 'C') || "
+    "setweight(to_tsvector('simple', coalesce({row}title, '')), 'D')"
+)
+
+CREATE_TRIGGER_SQL = f"""
+CREATE OR REPLACE FUNCTION contacts_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector := {SEARCH_VECTOR_SQL.format(row='NEW.')};
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS contacts_search_vector_trigger ON contacts;
+CREATE TRIGGER contacts_search_vector_trigger
+BEFORE INSERT OR UPDATE OF full_name, company, email, title ON contacts
+FOR EACH ROW EXECUTE FUNCTION contacts_search_vector_update();
+"""
+
+DROP_TRIGGER_SQL = """
+DROP TRIGGER IF EXISTS contacts_search_vector_trigger ON contacts;
+DROP FUNCTION IF EXISTS contacts_search_vector_update();
+"""
+
+BACKFILL_SQL = f"UPDATE contacts SET search_vector = {SEARCH_VECTOR_SQL.format(row='')} WHERE id >= %s AND id < %s"
+
+BACKFILL_BATCH_SIZE = 50000
+
+
+def backfill_search_vectors(apps, schema_editor):
+    """Fill search_vector for existing contacts in id batches, each committed on its own"""
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT COALESCE(MIN(id), 0), COALESCE(MAX(id), -1) FROM contacts")
+        low, high = cursor.fetchone()
+        for start in range(low, high + 1, BACKFILL_BATCH_SIZE):
+            cursor.execute(BACKFILL_SQL, [start, start + BACKFILL_BATCH_SIZE])
+
+
+class Migration(migrations.Migration):
+    # Backfill batches commit separately and the index is built CONCURRENTLY
+    atomic = False
+
+    dependencies = [
+        ('contacts', '0003_contact_created_at_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contact',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        # Trigger first so contacts written during the backfill are covered
+        migrations.RunSQL(CREATE_TRIGGER_SQL, reverse_sql=DROP_TRIGGER_SQL),
+        migrations.RunPython(backfill_search_vectors, migrations.RunPython.noop),
+        migrations.RunSQL(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS contacts_search_vector_idx ON contacts USING gin (search_vector);",
+            reverse_sql="DROP INDEX CONCURRENTLY IF EXISTS contacts_search_vector_idx;",
+        ),
+    ]
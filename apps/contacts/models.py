@@ -4,9 +4,20 @@ Migrated from Stremlit/models/contact.py
 """
 from django.db import models
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.search import SearchVectorField
 
 User = get_user_model()
 
+# Fields the contact list offers as filter facets with cached counts
+FACET_FIELDS = ('industry', 'country')
+
+
+def normalize_email(email):
+    """Normalized form of an email used as the contact's unique key"""
+    if not email:
+        return None
+    return email.strip().lower() or None
+
 
 class Contact(models.Model):
     """Contact model with all 40+ fields from Streamlit"""
@@ -17,6 +28,10 @@ class Contact(models.Model):
     last_name = models.CharField(max_length=150)
     title = models.CharField(max_length=255, blank=True)
     email = models.EmailField(db_index=True)
+    # Lowercased email, unique across contacts; upserts and duplicate checks use it.
+    # Saving a contact whose email is taken raises IntegrityError. Only legacy
+    # contacts that duplicated an email before the key existed keep NULL.
+    email_key = models.CharField(max_length=254, unique=True, null=True, blank=True, editable=False)
     phone = models.CharField(max_length=50, blank=True)
     
     # Company Information
@@ -71,6 +86,9 @@ class Contact(models.Model):
     user_id = models.CharField(max_length=255, null=True, blank=True)  # Supabase UUID
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Full-text search document, maintained by a database trigger on PostgreSQL
+    # (see migration 0004); NULL on other databases.
+    search_vector = SearchVectorField(null=True, editable=False)
     
     class Meta:
         db_table = 'contacts'
@@ -81,11 +99,36 @@ class Contact(models.Model):
             models.Index(fields=['industry'], name='industry_idx'),
             models.Index(fields=['country'], name='country_idx'),
             models.Index(fields=['city'], name='city_idx'),
+            models.Index(fields=['created_at', 'id'], name='created_at_id_idx'),
         ]
     
     def __str__(self):
         return f"{self.full_name} ({self.email})"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored email so save() can tell legacy NULL keys from edits
+        if 'email' in instance.__dict__:
+            instance._saved_email = instance.email
+        # And the stored facet values, so facet counts can move without a query
+        if all(field in instance.__dict__ for field in FACET_FIELDS):
+            instance._saved_facets = {field: instance.__dict__[field] for field in FACET_FIELDS}
+        return instance
+    
+    def save(self, *args, **kwargs):
+        email_key = normalize_email(self.email)
+        is_legacy = (
+            self.email_key is None and not self._state.adding
+            and self.email == getattr(self, '_saved_email', self.email)
+        )
+        if email_key != self.email_key and not is_legacy:
+            self.email_key = email_key
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = set(kwargs['update_fields']) | {'email_key'}
+        super().save(*args, **kwargs)
+        self._saved_email = self.email
+    
     def __repr__(self):
         return f"<Contact {self.full_name} ({self.email})>"
 
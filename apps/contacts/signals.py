@@ -0,0 +1,55 @@
+"""
+Signal handlers for the contacts app.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from apps.contacts.models import Contact
+from services.contact_facet_service import FACET_FIELDS, ContactFacetService
+from services.contact_prefix_index import contact_prefix_index
+
+
+@receiver(post_save, sender=Contact)
+def index_contact(sender, instance, **kwargs):
+    """Keep this worker's typeahead index current once the write commits"""
+    pk, full_name, company, email = instance.pk, instance.full_name, instance.company, instance.email
+    transaction.on_commit(lambda: contact_prefix_index.update(pk, full_name, company, email))
+
+
+@receiver(post_delete, sender=Contact)
+def unindex_contact(sender, instance, **kwargs):
+    pk = instance.pk
+    transaction.on_commit(lambda: contact_prefix_index.remove(pk))
+
+
+@receiver(pre_save, sender=Contact)
+def remember_facet_values(sender, instance, **kwargs):
+    """Note the stored facet values of an existing contact before it changes"""
+    instance._facet_previous = None
+    if not instance._state.adding and instance.pk:
+        # Loaded and saved contacts carry them; only others (e.g. loaded with
+        # the facet fields deferred) need a query
+        instance._facet_previous = getattr(instance, '_saved_facets', None)
+        if instance._facet_previous is None:
+            instance._facet_previous = Contact.objects.filter(pk=instance.pk).values(*FACET_FIELDS).first()
+
+
+@receiver(post_save, sender=Contact)
+def adjust_facets_on_save(sender, instance, **kwargs):
+    """Move the contact's facet counts to its new values once the write commits"""
+    old = getattr(instance, '_facet_previous', None)
+    update_fields = kwargs.get('update_fields')
+    new = {
+        # Fields left out of update_fields keep their stored value
+        field: old[field] if old and update_fields is not None and field not in update_fields
+        else getattr(instance, field)
+        for field in FACET_FIELDS
+    }
+    instance._saved_facets = new
+    transaction.on_commit(lambda: ContactFacetService.contact_changed(old, new))
+
+
+@receiver(post_delete, sender=Contact)
+def adjust_facets_on_delete(sender, instance, **kwargs):
+    old = {field: getattr(instance, field) for field in FACET_FIELDS}
+    transaction.on_commit(lambda: ContactFacetService.contact_changed(old, None))
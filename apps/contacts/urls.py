@@ -11,10 +11,12 @@ urlpatterns = [
     path('add/', views.ContactCreateView.as_view(), name='create'),
     path('<int:pk>/edit/', views.ContactUpdateView.as_view(), name='update'),
     path('<int:pk>/delete/', views.ContactDeleteView.as_view(), name='delete'),
+    path('export/', views.ContactExportView.as_view(), name='export'),
     
     # Bulk operation API endpoints
     path('api/bulk-export/', views.bulk_export_api, name='bulk_export_api'),
     path('api/bulk-delete/', views.bulk_delete_api, name='bulk_delete_api'),
     path('api/bulk-update/', views.bulk_update_api, name='bulk_update_api'),
+    path('api/typeahead/', views.typeahead_api, name='typeahead_api'),
 ]
 
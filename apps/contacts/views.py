@@ -5,16 +5,28 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
 from django.views import View
 from django.views.generic import ListView, CreateView, UpdateView, DeleteView
-from django.urls import reverse_lazy
+from django.urls import reverse, reverse_lazy
 from django.http import JsonResponse, HttpResponse
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.auth.decorators import login_required
-import pandas as pd
-import io
+from django.conf import settings
 
 from apps.contacts.models import Contact
 from apps.contacts.forms import ContactForm, ContactFilterForm
+from apps.exports.models import ExportLog
+from apps.exports.tasks import process_export_task
+from services.contact_export_service import (
+    BULK_EXPORT_COLUMNS, CONTACT_EXPORT_COLUMNS, ContactExportService
+)
+from services.contact_facet_service import FACET_FIELDS, ContactFacetService
+from services.contact_prefix_index import contact_prefix_index
+from services.contact_search_service import ContactSearchService
 from services.contact_service import ContactService
+from services.keyset_paginator import ApproximateCountPaginator, KeysetPaginator
+
+
+TYPEAHEAD_LIMIT = 10
+TYPEAHEAD_MAX_LIMIT = 20
 
 
 class ContactListView(LoginRequiredMixin, ListView):
@@ -23,6 +35,7 @@ class ContactListView(LoginRequiredMixin, ListView):
     template_name = 'contacts/list.html'
     context_object_name = 'contacts'
     paginate_by = 25
+    paginator_class = ApproximateCountPaginator
     
     def get_queryset(self):
         """Filter contacts based on query parameters"""
@@ -31,12 +44,7 @@ class ContactListView(LoginRequiredMixin, ListView):
         # Search
         search = self.request.GET.get('search', '')
         if search:
-            from django.db.models import Q
-            queryset = queryset.filter(
-                Q(full_name__icontains=search) |
-                Q(company__icontains=search) |
-                Q(email__icontains=search)
-            )
+            queryset = ContactSearchService.filter(queryset, search)
         
         # Filter by industry
         industry = self.request.GET.getlist('industry')
@@ -48,14 +56,36 @@ class ContactListView(LoginRequiredMixin, ListView):
         if country:
             queryset = queryset.filter(country__in=country)
         
-        return queryset.order_by('-created_at')
+        return queryset.order_by('-created_at', '-id')
+    
+    def paginate_queryset(self, queryset, page_size):
+        """Page by cursor, or by page number for ?page= links"""
+        if 'page' in self.request.GET:
+            return super().paginate_queryset(queryset, page_size)
+        
+        paginator = KeysetPaginator(queryset, page_size)
+        page = paginator.get_page(self.request.GET.get('cursor'))
+        return paginator, page, page.object_list, page.has_other_pages()
+    
+    def _cursor_url(self, cursor):
+        """Current query string with the cursor replaced"""
+        params = self.request.GET.copy()
+        params.pop('page', None)
+        params['cursor'] = cursor
+        return '?' + params.urlencode()
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         
-        # Get unique values for filter dropdowns
-        context['industries'] = Contact.objects.filter(industry__isnull=False).values_list('industry', flat=True).distinct()
-        context['countries'] = Contact.objects.filter(country__isnull=False).values_list('country', flat=True).distinct()
+        page = context.get('page_obj')
+        context['keyset_pagination'] = isinstance(context.get('paginator'), KeysetPaginator)
+        if context['keyset_pagination']:
+            context['next_page_url'] = self._cursor_url(page.next_cursor) if page.has_next() else None
+            context['previous_page_url'] = self._cursor_url(page.previous_cursor) if page.has_previous() else None
+        
+        # Cached (value, count) pairs for the filter dropdowns
+        context['industries'] = ContactFacetService.get_facets('industry')
+        context['countries'] = ContactFacetService.get_facets('country')
         
         # Add search query
         context['search'] = self.request.GET.get('search', '')
@@ -140,39 +170,49 @@ class ContactExportView(LoginRequiredMixin, View):
         if country:
             contacts = contacts.filter(country__in=country)
         
-        # Create DataFrame
-        data = []
-        for contact in contacts:
-            data.append({
-                'ID': contact.id,
-                'First Name': contact.first_name,
-                'Last Name': contact.last_name,
-                'Full Name': contact.full_name,
-                'Email': contact.email,
-                'Phone': contact.phone,
-                'Company': contact.company,
-                'Industry': contact.industry,
-                'Title': contact.title,
-                'Website': contact.website,
-                'City': contact.city,
-                'State': contact.state,
-                'Country': contact.country,
-                'LinkedIn': contact.linkedin,
-                'Notes': contact.notes,
-                'Created': contact.created_at.strftime('%Y-%m-%d') if contact.created_at else ''
+        # Large exports would outlive the request; write them in the background.
+        # The count stops one row past the limit instead of counting every match.
+        limit = settings.EXPORT_INLINE_ROW_LIMIT
+        if contacts.order_by()[:limit + 1].count() > limit:
+            return queue_contact_export(request, 'contacts', {
+                'layout': 'contact_list',
+                'industry': industry,
+                'country': country
             })
         
-        df = pd.DataFrame(data)
-        
-        # Generate CSV
-        output = io.BytesIO()
-        df.to_csv(output, index=False)
-        output.seek(0)
-        
-        response = HttpResponse(output, content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="contacts_export.csv"'
-        
-        return response
+        # Rows are read in chunks and written as they are sent
+        return ContactExportService.csv_response(
+            contacts, CONTACT_EXPORT_COLUMNS, 'contacts_export.csv'
+        )
+
+
+def queue_contact_export(request, export_type, filters):
+    """
+    Start a background CSV export and return its ExportLog id
+    
+    Args:
+        request: Current request
+        export_type: ExportLog export type
+        filters: Filters for the export task, including the column layout
+    
+    Returns:
+        202 JsonResponse with the export id and its status and download URLs
+    """
+    export = ExportLog.objects.create(
+        user=request.user,
+        export_type=export_type,
+        export_format='csv',
+        filters_applied=filters,
+        status='pending'
+    )
+    process_export_task.delay(export.id)
+    
+    return JsonResponse({
+        'export_id': export.id,
+        'status': export.status,
+        'status_url': reverse('exports:export_status_api', args=[export.id]),
+        'download_url': reverse('exports:download_export', args=[export.id])
+    }, status=202)
 
 
 @login_required
@@ -190,45 +230,25 @@ def bulk_export_api(request):
         if not contact_ids:
             return JsonResponse({'error': 'No contacts selected'}, status=400)
         
+        if format_type.lower() != 'csv':
+            return JsonResponse({'error': 'Unsupported format'}, status=400)
+        
         # Get contacts
         contacts = Contact.objects.filter(id__in=contact_ids)
         
         if not contacts.exists():
             return JsonResponse({'error': 'No contacts found'}, status=404)
         
-        # Prepare data
-        data_list = []
-        for contact in contacts:
-            data_list.append({
-                'Name': contact.full_name,
-                'Email': contact.email,
-                'Phone': contact.phone,
-                'Company': contact.company,
-                'Industry': contact.industry,
-                'Title': contact.title,
-                'Website': contact.website,
-                'City': contact.city,
-                'State': contact.state,
-                'Country': contact.country,
-                'LinkedIn': contact.linkedin,
-                'Notes': contact.notes,
-                'Created': contact.created_at.strftime('%Y-%m-%d') if contact.created_at else ''
+        # Large selections are written in the background
+        if len(contact_ids) > settings.EXPORT_INLINE_ROW_LIMIT:
+            return queue_contact_export(request, 'selected_contacts', {
+                'layout': 'selected_contacts',
+                'contact_ids': contact_ids
             })
         
-        df = pd.DataFrame(data_list)
-        
-        if format_type.lower() == 'csv':
-            # Generate CSV
-            output = io.BytesIO()
-            df.to_csv(output, index=False)
-            output.seek(0)
-            
-            response = HttpResponse(output, content_type='text/csv')
-            response['Content-Disposition'] = f'attachment; filename="contacts_export_{len(contact_ids)}_contacts.csv"'
-            
-            return response
-        else:
-            return JsonResponse({'error': 'Unsupported format'}, status=400)
+        return ContactExportService.csv_response(
+            contacts, BULK_EXPORT_COLUMNS, f'contacts_export_{len(contact_ids)}_contacts.csv'
+        )
             
     except json.JSONDecodeError:
         return JsonResponse({'error': 'Invalid JSON'}, status=400)
@@ -304,6 +324,12 @@ def bulk_update_api(request):
         
         # Update contacts
         updated_count = contacts.update(**{field: value})
+        if field == 'company':
+            # queryset.update() sends no post_save, so re-index here
+            for row in contacts.values_list('id', 'full_name', 'company', 'email'):
+                contact_prefix_index.update(*row)
+        elif field in FACET_FIELDS:
+            ContactFacetService.invalidate([field])
         
         return JsonResponse({
             'success': True,
@@ -315,3 +341,15 @@ def bulk_update_api(request):
         return JsonResponse({'error': 'Invalid JSON'}, status=400)
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=500)
+
+
+@login_required
+def typeahead_api(request):
+    """Contact suggestions for the search box, served from the in-memory prefix index"""
+    query = request.GET.get('q', '')
+    try:
+        limit = min(max(int(request.GET.get('limit', TYPEAHEAD_LIMIT)), 1), TYPEAHEAD_MAX_LIMIT)
+    except ValueError:
+        return JsonResponse({'error': 'Invalid limit'}, status=400)
+    
+    return JsonResponse({'results': contact_prefix_index.search(query, limit)})
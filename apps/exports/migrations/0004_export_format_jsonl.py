@@ -0,0 +1,18 @@
+# Generated by Django 5.0.1 on 2026-10-18 11:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exports', '0003_remove_exportlog_user_export_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='exportlog',
+            name='export_format',
+            field=models.CharField(choices=[('csv', 'CSV'), ('excel', 'Excel'), ('json', 'JSON'), ('jsonl', 'JSON Lines'), ('pdf', 'PDF')], default='csv', max_length=20),
+        ),
+    ]
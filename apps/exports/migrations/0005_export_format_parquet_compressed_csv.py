@@ -0,0 +1,18 @@
+# Generated by Django 5.0.1 on 2026-10-18 12:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exports', '0004_export_format_jsonl'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='exportlog',
+            name='export_format',
+            field=models.CharField(choices=[('csv', 'CSV'), ('csv_gzip', 'CSV (gzip)'), ('csv_zstd', 'CSV (zstd)'), ('excel', 'Excel'), ('json', 'JSON'), ('jsonl', 'JSON Lines'), ('parquet', 'Parquet'), ('pdf', 'PDF')], default='csv', max_length=20),
+        ),
+    ]
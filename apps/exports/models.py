@@ -20,8 +20,12 @@ class ExportLog(models.Model):
     
     EXPORT_FORMAT_CHOICES = [
         ('csv', 'CSV'),
+        ('csv_gzip', 'CSV (gzip)'),
+        ('csv_zstd', 'CSV (zstd)'),
         ('excel', 'Excel'),
         ('json', 'JSON'),
+        ('jsonl', 'JSON Lines'),
+        ('parquet', 'Parquet'),
         ('pdf', 'PDF'),
     ]
     
@@ -4,6 +4,7 @@ Export tasks for background processing
 import os
 import csv
 import json
+import logging
 import pandas as pd
 from datetime import datetime
 from django.conf import settings
@@ -11,6 +12,11 @@ from celery import shared_task
 from django.utils import timezone
 from .models import ExportLog
 from apps.contacts.models import Contact
+from services.contact_export_service import (
+    EXPORT_FILE_EXTENSIONS, EXPORT_LAYOUTS, ContactExportService
+)
+
+logger = logging.getLogger(__name__)
 
 
 @shared_task
@@ -26,7 +32,8 @@ def process_export_task(export_id):
         
         # Generate filename
         timestamp = timezone.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"{export.export_type}_{timestamp}.{export.export_format}"
+        extension = EXPORT_FILE_EXTENSIONS.get(export.export_format, export.export_format)
+        filename = f"{export.export_type}_{timestamp}.{extension}"
         file_path = os.path.join(exports_dir, filename)
         
         # Process based on export type
@@ -50,7 +57,8 @@ def process_export_task(export_id):
             export.mark_as_completed(file_path=file_path, file_size=file_size)
             export.filename = filename
             export.save()
-        else:
+        elif export.status != 'failed':
+            # Exporters that failed on an exception already recorded its message
             export.mark_as_failed("Export processing failed")
     
     except ExportLog.DoesNotExist:
@@ -64,62 +72,64 @@ def process_export_task(export_id):
             pass
 
 
+def write_contacts(export, contacts, file_path):
+    """
+    Stream contacts to the export file and record progress on the export
+    
+    Columns follow the layout named in filters_applied['layout'] (default:
+    'export'), so exports queued from the contact views match their inline
+    downloads.
+    
+    Args:
+        export: ExportLog being processed
+        contacts: Contact queryset to export
+        file_path: Output file path
+    """
+    columns, date_format = EXPORT_LAYOUTS[(export.filters_applied or {}).get('layout', 'export')]
+    total = contacts.count()
+    
+    def report_progress(written):
+        # Kept below 100 until mark_as_completed
+        percentage = min(99.0, round(written * 100.0 / total, 1)) if total else 0.0
+        ExportLog.objects.filter(id=export.id).update(progress_percentage=percentage)
+        export.progress_percentage = percentage
+    
+    export.record_count = ContactExportService.write_file(
+        contacts, columns, file_path, export.export_format,
+        date_format=date_format, progress_callback=report_progress
+    )
+    export.save(update_fields=['record_count'])
+
+
 def export_contacts(export, file_path):
     """Export all contacts"""
     try:
         # Apply filters if any
-        contacts = Contact.objects.filter(user=export.user)
+        contacts = Contact.objects.all()
         
         filters = export.filters_applied
         if filters:
             if filters.get('status'):
                 contacts = contacts.filter(status=filters['status'])
-            if filters.get('industry'):
-                contacts = contacts.filter(industry=filters['industry'])
-            if filters.get('country'):
-                contacts = contacts.filter(country=filters['country'])
+            # Industry and country are a single value or a list of values
+            for field in ('industry', 'country'):
+                value = filters.get(field)
+                if value and isinstance(value, list):
+                    contacts = contacts.filter(**{f'{field}__in': value})
+                elif value:
+                    contacts = contacts.filter(**{field: value})
             if filters.get('date_from'):
                 contacts = contacts.filter(created_at__date__gte=filters['date_from'])
             if filters.get('date_to'):
                 contacts = contacts.filter(created_at__date__lte=filters['date_to'])
         
-        # Convert to DataFrame
-        data = []
-        for contact in contacts:
-            data.append({
-                'id': contact.id,
-                'first_name': contact.first_name,
-                'last_name': contact.last_name,
-                'email': contact.email,
-                'phone': contact.phone,
-                'company': contact.company,
-                'job_title': contact.job_title,
-                'industry': contact.industry,
-                'country': contact.country,
-                'city': contact.city,
-                'status': contact.status,
-                'created_at': contact.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-                'updated_at': contact.updated_at.strftime('%Y-%m-%d %H:%M:%S'),
-            })
-        
-        df = pd.DataFrame(data)
-        
-        # Export based on format
-        if export.export_format == 'csv':
-            df.to_csv(file_path, index=False)
-        elif export.export_format == 'excel':
-            df.to_excel(file_path, index=False)
-        elif export.export_format == 'json':
-            df.to_json(file_path, orient='records', indent=2)
-        
-        # Update record count
-        export.record_count = len(data)
-        export.save()
+        write_contacts(export, contacts, file_path)
         
         return True
     
     except Exception as e:
-        print(f"Error exporting contacts: {str(e)}")
+        logger.exception("Error exporting contacts for export %s", export.id)
+        export.mark_as_failed(str(e))
         return False
 
 
@@ -131,45 +141,15 @@ def export_bulk_contacts(export, file_path):
         if not contact_ids:
             return False
         
-        contacts = Contact.objects.filter(id__in=contact_ids, user=export.user)
-        
-        # Convert to DataFrame
-        data = []
-        for contact in contacts:
-            data.append({
-                'id': contact.id,
-                'first_name': contact.first_name,
-                'last_name': contact.last_name,
-                'email': contact.email,
-                'phone': contact.phone,
-                'company': contact.company,
-                'job_title': contact.job_title,
-                'industry': contact.industry,
-                'country': contact.country,
-                'city': contact.city,
-                'status': contact.status,
-                'created_at': contact.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-                'updated_at': contact.updated_at.strftime('%Y-%m-%d %H:%M:%S'),
-            })
+        contacts = Contact.objects.filter(id__in=contact_ids)
         
-        df = pd.DataFrame(data)
-        
-        # Export based on format
-        if export.export_format == 'csv':
-            df.to_csv(file_path, index=False)
-        elif export.export_format == 'excel':
-            df.to_excel(file_path, index=False)
-        elif export.export_format == 'json':
-            df.to_json(file_path, orient='records', indent=2)
-        
-        # Update record count
-        export.record_count = len(data)
-        export.save()
+        write_contacts(export, contacts, file_path)
         
         return True
     
     except Exception as e:
-        print(f"Error exporting bulk contacts: {str(e)}")
+        logger.exception("Error exporting bulk contacts for export %s", export.id)
+        export.mark_as_failed(str(e))
         return False
 
 
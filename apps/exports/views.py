@@ -14,6 +14,7 @@ from django.contrib import messages
 from django.conf import settings
 from .models import ExportLog, ExportLimit
 from .tasks import process_export_task
+from services.file_download_service import FileDownloadService
 
 
 @login_required
@@ -148,10 +149,10 @@ def download_export(request, export_id):
         return redirect('exports:history')
     
     try:
-        with open(export.file_path, 'rb') as f:
-            response = HttpResponse(f.read(), content_type='application/octet-stream')
-            response['Content-Disposition'] = f'attachment; filename="{export.filename}"'
-            return response
+        # Streamed in blocks (or sent by the front proxy); Range requests resume downloads
+        return FileDownloadService.file_response(
+            request, export.file_path, export.filename or os.path.basename(export.file_path)
+        )
     except Exception as e:
         messages.error(request, f'Error downloading file: {str(e)}')
         return redirect('exports:history')
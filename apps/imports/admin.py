@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import ImportJob
+from .models import ColumnMappingTemplate, ImportJob
 
 
 @admin.register(ImportJob)
@@ -28,3 +28,9 @@ class ImportJobAdmin(admin.ModelAdmin):
         }),
     )
 
+
+@admin.register(ColumnMappingTemplate)
+class ColumnMappingTemplateAdmin(admin.ModelAdmin):
+    list_display = ['id', 'user_id', 'use_count', 'updated_at']
+    search_fields = ['user_id']
+    readonly_fields = ['header_signature', 'created_at', 'updated_at']
@@ -0,0 +1,33 @@
+# Generated by Django 5.0.1 on 2026-10-18 17:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('imports', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importjob',
+            name='field_policies',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='importjob',
+            name='import_mode',
+            field=models.CharField(choices=[('insert', 'Insert new contacts only'), ('upsert', 'Insert new and update existing contacts')], default='insert', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='importjob',
+            name='merge_policy',
+            field=models.CharField(choices=[('overwrite', 'Overwrite with imported values'), ('fill_blanks', 'Only fill blank fields'), ('keep_existing', 'Keep existing values')], default='overwrite', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='importjob',
+            name='updated_count',
+            field=models.IntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.0.1 on 2026-10-18 19:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('imports', '0003_import_job_checkpoint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ColumnMappingTemplate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('user_id', models.CharField(max_length=255)),
+                ('header_signature', models.CharField(max_length=64)),
+                ('column_mapping', models.TextField()),
+                ('use_count', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'import_mapping_templates',
+                'ordering': ['-updated_at'],
+                'constraints': [models.UniqueConstraint(fields=('user_id', 'header_signature'), name='unique_mapping_template')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.1 on 2026-10-18 21:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('imports', '0004_column_mapping_template'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importjob',
+            name='partitions_dispatched_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
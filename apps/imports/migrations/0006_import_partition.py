@@ -0,0 +1,35 @@
+# Generated by Django 5.0.1 on 2026-10-18 21:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('imports', '0005_import_job_partitions_dispatched'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportPartition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('start_row', models.IntegerField()),
+                ('processed_rows', models.IntegerField(default=0)),
+                ('success_count', models.IntegerField(default=0)),
+                ('error_count', models.IntegerField(default=0)),
+                ('duplicate_count', models.IntegerField(default=0)),
+                ('updated_count', models.IntegerField(default=0)),
+                ('checkpoint_offset', models.BigIntegerField(blank=True, null=True)),
+                ('error_log', models.TextField(blank=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='partitions', to='imports.importjob')),
+            ],
+            options={
+                'db_table': 'import_partitions',
+                'ordering': ['job', 'start_row'],
+                'constraints': [models.UniqueConstraint(fields=('job', 'start_row'), name='unique_import_partition')],
+            },
+        ),
+    ]
@@ -2,6 +2,7 @@
 Import Job Model - Track background import jobs
 Migrated from Stremlit/models/import_job.py
 """
+import json
 from django.db import models
 from django.core.validators import MinValueValidator
 
@@ -17,6 +18,17 @@ class ImportJob(models.Model):
         ('CANCELLED', 'Cancelled'),
     ]
     
+    IMPORT_MODE_CHOICES = [
+        ('insert', 'Insert new contacts only'),
+        ('upsert', 'Insert new and update existing contacts'),
+    ]
+    
+    MERGE_POLICY_CHOICES = [
+        ('overwrite', 'Overwrite with imported values'),
+        ('fill_blanks', 'Only fill blank fields'),
+        ('keep_existing', 'Keep existing values'),
+    ]
+    
     # Job Information
     user_id = models.CharField(max_length=255, null=True, blank=True)  # Supabase UUID
     filename = models.CharField(max_length=500)
@@ -28,6 +40,7 @@ class ImportJob(models.Model):
     success_count = models.IntegerField(default=0)
     error_count = models.IntegerField(default=0)
     duplicate_count = models.IntegerField(default=0)
+    updated_count = models.IntegerField(default=0)  # Existing contacts updated in upsert mode
     
     # Status
     status = models.CharField(
@@ -45,6 +58,11 @@ class ImportJob(models.Model):
     error_log = models.TextField(blank=True)  # JSON string of errors
     column_mapping = models.TextField(blank=True)  # JSON string of column mappings
     
+    # Upsert Settings
+    import_mode = models.CharField(max_length=20, choices=IMPORT_MODE_CHOICES, default='insert')
+    merge_policy = models.CharField(max_length=20, choices=MERGE_POLICY_CHOICES, default='overwrite')
+    field_policies = models.TextField(blank=True)  # JSON string of per-field merge policies
+    
     # Performance Metrics
     processing_speed = models.FloatField(null=True, blank=True)  # rows per second
     estimated_completion = models.DateTimeField(null=True, blank=True)
@@ -53,6 +71,13 @@ class ImportJob(models.Model):
     current_batch = models.IntegerField(default=0)
     total_batches = models.IntegerField(default=0)
     
+    # Checkpoint of the last committed batch, used to resume streamed imports
+    checkpoint_row = models.IntegerField(default=0)  # Data rows committed
+    checkpoint_offset = models.BigIntegerField(null=True, blank=True)  # Byte offset of the next record
+    # Set once when a partitioned import dispatches its partition tasks,
+    # so a redelivered task never fans the file out twice
+    partitions_dispatched_at = models.DateTimeField(null=True, blank=True)
+    
     created_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
@@ -79,4 +104,63 @@ class ImportJob(models.Model):
     def get_remaining_rows(self):
         """Get number of rows remaining"""
         return max(0, self.total_rows - self.processed_rows)
+    
+    def get_field_policies(self):
+        """Get per-field merge policies as a dictionary"""
+        return json.loads(self.field_policies) if self.field_policies else {}
+
 
+class ImportPartition(models.Model):
+    """Progress and checkpoint of one partition of a partitioned import"""
+    
+    job = models.ForeignKey(ImportJob, on_delete=models.CASCADE, related_name='partitions')
+    start_row = models.IntegerField()  # Data row number of the partition's first record
+    
+    # Counts of the committed batches
+    processed_rows = models.IntegerField(default=0)
+    success_count = models.IntegerField(default=0)
+    error_count = models.IntegerField(default=0)
+    duplicate_count = models.IntegerField(default=0)
+    updated_count = models.IntegerField(default=0)
+    
+    # Checkpoint of the last committed batch
+    checkpoint_offset = models.BigIntegerField(null=True, blank=True)  # Byte offset of the next record
+    error_log = models.TextField(blank=True)  # JSON string of the partition's error tracker
+    
+    completed_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'import_partitions'
+        ordering = ['job', 'start_row']
+        constraints = [
+            models.UniqueConstraint(fields=['job', 'start_row'], name='unique_import_partition')
+        ]
+    
+    def __str__(self):
+        return f"ImportPartition {self.job_id}:{self.start_row}"
+
+
+class ColumnMappingTemplate(models.Model):
+    """Column mapping saved per user for a CSV header, reused for later uploads"""
+    
+    user_id = models.CharField(max_length=255)  # Supabase UUID
+    header_signature = models.CharField(max_length=64)  # CSVColumnMapper.header_signature
+    column_mapping = models.TextField()  # JSON string of column mappings
+    use_count = models.IntegerField(default=0)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'import_mapping_templates'
+        ordering = ['-updated_at']
+        constraints = [
+            models.UniqueConstraint(fields=['user_id', 'header_signature'], name='unique_mapping_template')
+        ]
+    
+    def __str__(self):
+        return f"ColumnMappingTemplate {self.id} ({self.user_id})"
+    
+    def get_mapping(self):
+        """Get column mapping as a dictionary"""
+        return json.loads(self.column_mapping) if self.column_mapping else {}
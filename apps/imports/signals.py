@@ -1,14 +1,15 @@
 """
 Signal handlers for the imports app.
 """
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from apps.imports.models import ImportJob
+from services.import_error_tracker import ImportErrorTracker
 
-# Add signal handlers here as needed
-# Example:
-# from django.db.models.signals import post_save
-# from django.dispatch import receiver
-# from .models import YourModel
-#
-# @receiver(post_save, sender=YourModel)
-# def your_signal_handler(sender, instance, created, **kwargs):
-#     pass
 
+@receiver(post_delete, sender=ImportJob)
+def delete_error_logs(sender, instance, **kwargs):
+    """Remove a deleted job's error log files once the delete commits"""
+    job_id = instance.id
+    transaction.on_commit(lambda: ImportErrorTracker.delete_job_logs(job_id))
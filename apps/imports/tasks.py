@@ -3,27 +3,46 @@ Celery tasks for background import processing
 Enhanced with type conversion, error tracking, and bulk operations
 """
 import os
+import time
 import pandas as pd
 from datetime import datetime, timedelta
-from celery import shared_task
+from celery import chord, shared_task
+from celery.exceptions import SoftTimeLimitExceeded
 from django.conf import settings
+from django.db import transaction
+from django.db.models import F
 from django.utils import timezone
-from apps.imports.models import ImportJob
+from apps.imports.models import ImportJob, ImportPartition
 from apps.contacts.models import Contact
+from services.contact_facet_service import ContactFacetService
 from services.contact_service import ContactService, validate_email
 from services.type_converter import TypeConverter
 from services.bulk_insert_service import BulkInsertService
+from services.copy_import_service import CopyImportService
+from services.csv_stream_reader import CSVStreamReader
+from services.file_validator import FileValidator
+from services.spark_import_service import SparkImportService
 from services.import_error_tracker import ImportErrorTracker
+from services.import_progress_publisher import ImportProgressPublisher
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
 import json
 
 
-@shared_task(bind=True)
+# Rows per batch when streaming a file through the ORM engines
+STREAM_BATCH_SIZE = 1000
+
+
+@shared_task(bind=True, acks_late=True, reject_on_worker_lost=True)
 def process_import_task(self, job_id, file_path, mapping, user_id):
     """
     Process CSV import in background with enhanced progress tracking
     
+    Streamed imports checkpoint every committed batch on the job. The task
+    is acknowledged only after it finishes, so a task lost with its worker
+    is redelivered and resumes from the checkpoint; long imports continue
+    in a new task before the time limit.
+    
     Args:
         job_id: ImportJob ID
         file_path: Path to CSV file
@@ -32,115 +51,130 @@ def process_import_task(self, job_id, file_path, mapping, user_id):
     """
     job = ImportJob.objects.get(id=job_id)
     
-    # Initialize services
-    bulk_service = BulkInsertService()
+    # A redelivered task for a finished job has nothing left to do
+    if job.is_complete():
+        return {
+            'success': job.status == 'COMPLETED',
+            'status': job.status
+        }
+    
+    # Nor does one whose partitions were already dispatched; the chord finishes the job
+    if job.partitions_dispatched_at:
+        return {
+            'success': True,
+            'status': job.status
+        }
+    
+    # Initialize services; errors are logged to the job's error file
+    error_tracker = ImportErrorTracker.for_job(job.id)
+    bulk_service = BulkInsertService(error_tracker=error_tracker)
+    
+    # Get channel layer for WebSocket updates
+    channel_layer = get_channel_layer()
     
     try:
-        # Update job status and start time
+        # Update job status and start time; a resumed job keeps its original start
+        resuming = job.checkpoint_offset is not None
         job.status = 'PROCESSING'
-        job.started_at = timezone.now()
-        job.save()
+        if not job.started_at:
+            job.started_at = timezone.now()
+        job.save(update_fields=['status', 'started_at'])
         
-        # Read CSV file
-        df = pd.read_csv(file_path)
-        job.total_rows = len(df)
-        job.total_batches = (len(df) // 1000) + 1
-        job.save()
+        # Engines by file size: Spark for very large files on PostgreSQL, then
+        # parallel partitions, then one stream. Batches of files over the COPY
+        # threshold are written with COPY, whether partitioned or streamed.
+        # Spark and COPY only insert new contacts, so upserts always use the ORM.
+        copy_service = None
+        if job.import_mode == 'insert':
+            if not resuming and SparkImportService.is_available() and FileValidator.should_use_pyspark(
+                    file_path, settings.SPARK_IMPORT_THRESHOLD_MB):
+                return run_file_import(
+                    job, SparkImportService(error_tracker=error_tracker), file_path, mapping, user_id
+                )
+            if CopyImportService.is_available() and FileValidator.should_use_copy(file_path):
+                copy_service = CopyImportService(error_tracker=error_tracker)
         
-        # Get channel layer for WebSocket updates
-        channel_layer = get_channel_layer()
+        if not resuming:
+            # Large files are split into record-aligned partitions imported in parallel
+            if settings.MAX_IMPORT_WORKERS > 1 and FileValidator.should_partition(file_path):
+                partitions = CSVStreamReader.plan_partitions(file_path, settings.MAX_IMPORT_WORKERS)
+                if len(partitions) > 1:
+                    return start_partitioned_import(
+                        job, partitions, file_path, mapping, user_id, use_copy=copy_service is not None
+                    )
+        else:
+            # Keep the errors reported before the checkpoint
+            error_tracker.load_json(job.error_log)
         
-        start_time = timezone.now()
+        # Count rows with a newline scan; batches are streamed so memory stays bounded
+        batch_size = copy_service.chunk_size if copy_service else STREAM_BATCH_SIZE
+        job.total_rows = CSVStreamReader.count_rows(file_path)
+        job.total_batches = (job.total_rows // batch_size) + 1
+        job.save(update_fields=['total_rows', 'total_batches'])
         
-        # Process in batches
-        batch_size = 1000
-        for i in range(0, len(df), batch_size):
-            batch = df.iloc[i:i+batch_size]
-            
-            # Use bulk insert service
-            batch_results = bulk_service.bulk_insert_from_dataframe(
-                batch, str(user_id), mapping
-            )
-            
-            # Update job progress
-            job.processed_rows = i + len(batch)
-            job.success_count = batch_results['success_count']
-            job.error_count = batch_results['error_count']
-            job.duplicate_count = batch_results['duplicate_count']
-            job.current_batch = (i // batch_size) + 1
-            
-            # Calculate processing speed
-            elapsed = timezone.now() - start_time
-            if elapsed.total_seconds() > 0:
-                job.processing_speed = job.processed_rows / elapsed.total_seconds()
+        publisher = ImportProgressPublisher(job, channel_layer)
+        deadline = time.monotonic() + settings.IMPORT_TASK_SLICE_SECONDS
+        
+        # Process in batches, starting after the last committed batch
+        batches = CSVStreamReader.iter_batches(
+            file_path, batch_size, start_offset=job.checkpoint_offset, start_row=job.checkpoint_row
+        )
+        for batch_number, batch in enumerate(batches, start=job.current_batch + 1):
+            # The batch, job counters and checkpoint commit together,
+            # so a resumed task never repeats a committed batch
+            with transaction.atomic():
+                batch_results = import_batch(bulk_service, job, batch.df, user_id, mapping, copy_service)
                 
-                # Estimate completion time
-                if job.processing_speed > 0 and job.total_rows > job.processed_rows:
-                    remaining_rows = job.total_rows - job.processed_rows
-                    eta_seconds = remaining_rows / job.processing_speed
-                    job.estimated_completion = timezone.now() + timedelta(seconds=eta_seconds)
-            
-            # Store errors in job
-            errors_json = bulk_service.get_error_tracker().to_json()
-            job.error_log = errors_json
-            job.save()
+                # Update job progress
+                job.processed_rows = batch.start_row + len(batch.df)
+                job.success_count += batch_results['success_count']
+                job.error_count += batch_results['error_count']
+                job.duplicate_count += batch_results['duplicate_count']
+                job.updated_count += batch_results.get('updated_count', 0)
+                job.current_batch = batch_number
+                job.checkpoint_row = job.processed_rows
+                job.checkpoint_offset = batch.end_offset
+                publisher.save_checkpoint(error_tracker)
             
-            # Send progress update via WebSocket
-            if channel_layer:
-                async_to_sync(channel_layer.group_send)(
-                    f'import_{job_id}',
-                    {
-                        'type': 'import_progress',
-                        'data': {
-                            'job_id': job_id,
-                            'status': job.status,
-                            'processed_rows': job.processed_rows,
-                            'total_rows': job.total_rows,
-                            'success_count': job.success_count,
-                            'error_count': job.error_count,
-                            'duplicate_count': job.duplicate_count,
-                            'progress': job.get_progress_percentage(),
-                            'processing_speed': job.processing_speed,
-                            'current_batch': job.current_batch,
-                            'total_batches': job.total_batches,
-                            'estimated_completion': job.estimated_completion.isoformat() if job.estimated_completion else None,
-                            'last_updated': timezone.now().isoformat()
-                        }
-                    }
-                )
+            # Speed, ETA and the WebSocket update are coalesced to the publisher's cadence
+            publisher.maybe_publish()
             
-            # Check if job was cancelled
-            job.refresh_from_db()
-            if job.status == 'CANCELLED':
+            if publisher.is_cancelled():
                 break
+            
+            # Hand the rest of the file to a new task well before the time limit
+            if time.monotonic() > deadline:
+                return continue_import(job, file_path, mapping, user_id)
         
-        # Mark as completed
-        job.status = 'COMPLETED'
-        job.processed_rows = len(df)
-        job.completed_at = timezone.now()
-        job.save()
+        # Mark as completed unless the job was cancelled meanwhile;
+        # the pre-pass row count can be off for multi-line records
+        completed_at = timezone.now()
+        completed = ImportJob.objects.filter(id=job_id).exclude(status='CANCELLED').update(
+            status='COMPLETED', total_rows=job.processed_rows, completed_at=completed_at
+        )
+        if completed:
+            job.status = 'COMPLETED'
+            job.total_rows = job.processed_rows
+        else:
+            job.refresh_from_db(fields=['status', 'completed_at'])
+        job.completed_at = job.completed_at or completed_at
+        ContactFacetService.invalidate()
         
         # Send final update
-        if channel_layer:
-            async_to_sync(channel_layer.group_send)(
-                f'import_{job_id}',
-                {
-                    'type': 'import_progress',
-                    'data': {
-                        'job_id': job_id,
-                        'status': job.status,
-                        'processed_rows': job.processed_rows,
-                        'total_rows': job.total_rows,
-                        'success_count': job.success_count,
-                        'error_count': job.error_count,
-                        'duplicate_count': job.duplicate_count,
-                        'progress': job.get_progress_percentage(),
-                        'completed_at': job.completed_at.isoformat(),
-                        'duration': str(job.completed_at - job.started_at),
-                        'last_updated': timezone.now().isoformat()
-                    }
-                }
-            )
+        publisher.send({
+            'job_id': job_id,
+            'status': job.status,
+            'processed_rows': job.processed_rows,
+            'total_rows': job.total_rows,
+            'success_count': job.success_count,
+            'error_count': job.error_count,
+            'duplicate_count': job.duplicate_count,
+            'updated_count': job.updated_count,
+            'progress': job.get_progress_percentage(),
+            'completed_at': job.completed_at.isoformat(),
+            'duration': str(job.completed_at - job.started_at),
+            'last_updated': timezone.now().isoformat()
+        })
         
         return {
             'success': True,
@@ -149,31 +183,417 @@ def process_import_task(self, job_id, file_path, mapping, user_id):
             'duplicate_count': job.duplicate_count
         }
         
+    except SoftTimeLimitExceeded as e:
+        # The interrupted batch was rolled back; continue from the last checkpoint.
+        # Spark imports have no checkpoint, so they fail instead.
+        job.refresh_from_db()
+        if job.checkpoint_offset is not None:
+            return continue_import(job, file_path, mapping, user_id)
+        error = e
+    
     except Exception as e:
-        # Mark as failed
-        job.status = 'FAILED'
-        job.error_log = str(e)
+        error = e
+    
+    # Mark as failed
+    job.status = 'FAILED'
+    job.error_log = str(error)
+    job.completed_at = timezone.now()
+    job.save()
+    
+    # Send error update
+    if channel_layer:
+        async_to_sync(channel_layer.group_send)(
+            f'import_{job_id}',
+            {
+                'type': 'import_progress',
+                'data': {
+                    'job_id': job_id,
+                    'status': job.status,
+                    'error_log': str(error),
+                    'completed_at': job.completed_at.isoformat(),
+                    'last_updated': timezone.now().isoformat()
+                }
+            }
+        )
+    
+    return {
+        'success': False,
+        'error': str(error)
+    }
+
+
+def run_file_import(job, import_service, file_path, mapping, user_id):
+    """
+    Import a whole file with a file-level engine (Spark)
+    
+    The engine loads the file in one pass, so progress reports cover the
+    reading phase and job counters are set once at the end, in the same
+    transaction that merges the imported rows.
+    
+    Args:
+        job: ImportJob being processed
+        import_service: SparkImportService
+        file_path: Path to CSV file
+        mapping: Column mapping dictionary
+        user_id: User ID
+    """
+    channel_layer = get_channel_layer()
+    start_time = timezone.now()
+    
+    def report_progress(staged_rows):
+        elapsed = (timezone.now() - start_time).total_seconds()
+        send_import_progress(channel_layer, job.id, {
+            'job_id': job.id,
+            'status': job.status,
+            'processed_rows': staged_rows,
+            'processing_speed': staged_rows / elapsed if elapsed > 0 else None,
+            'last_updated': timezone.now().isoformat()
+        })
+    
+    def complete_job(results):
+        job.total_rows = results['total_processed']
+        job.processed_rows = results['total_processed']
+        job.success_count = results['success_count']
+        job.error_count = results['error_count']
+        job.duplicate_count = results['duplicate_count']
+        job.current_batch = job.total_batches = 1
+        job.error_log = import_service.get_error_tracker().to_json()
+        job.status = 'COMPLETED'
         job.completed_at = timezone.now()
+        elapsed = (job.completed_at - start_time).total_seconds()
+        if elapsed > 0:
+            job.processing_speed = job.processed_rows / elapsed
         job.save()
+    
+    # The job completes in the merge transaction, so a redelivered task
+    # finds it finished instead of re-importing the merged rows as duplicates
+    import_service.import_file(
+        file_path, str(user_id), mapping, progress_callback=report_progress, on_merge=complete_job
+    )
+    ContactFacetService.invalidate()
+    
+    send_import_progress(channel_layer, job.id, {
+        'job_id': job.id,
+        'status': job.status,
+        'processed_rows': job.processed_rows,
+        'total_rows': job.total_rows,
+        'success_count': job.success_count,
+        'error_count': job.error_count,
+        'duplicate_count': job.duplicate_count,
+        'progress': job.get_progress_percentage(),
+        'completed_at': job.completed_at.isoformat(),
+        'duration': str(job.completed_at - job.started_at),
+        'last_updated': timezone.now().isoformat()
+    })
+    
+    return {
+        'success': True,
+        'success_count': job.success_count,
+        'error_count': job.error_count,
+        'duplicate_count': job.duplicate_count
+    }
+
+
+def continue_import(job, file_path, mapping, user_id):
+    """
+    Enqueue a new task that resumes a job from its checkpoint
+    
+    Args:
+        job: ImportJob being processed
+        file_path: Path to CSV file
+        mapping: Column mapping dictionary
+        user_id: User ID
+    """
+    process_import_task.apply_async(args=[job.id, file_path, mapping, user_id])
+    return {
+        'success': True,
+        'resumed_from_row': job.checkpoint_row
+    }
+
+
+def import_batch(bulk_service, job, df, user_id, mapping, copy_service=None):
+    """
+    Write one batch with the job's import mode
+    
+    Args:
+        bulk_service: BulkInsertService for the job
+        job: ImportJob being processed
+        df: Batch DataFrame
+        user_id: User ID
+        mapping: Column mapping dictionary
+        copy_service: CopyImportService for insert jobs written with COPY
+    """
+    if copy_service is not None:
+        return copy_service.import_batch(df, str(user_id), mapping)
+    if job.import_mode == 'upsert':
+        return bulk_service.bulk_upsert(
+            df, str(user_id), mapping,
+            merge_policy=job.merge_policy,
+            field_policies=job.get_field_policies()
+        )
+    # Set-based insert: one duplicate query and one insert per batch
+    return bulk_service.bulk_insert_set_based(df, str(user_id), mapping)
+
+
+def start_partitioned_import(job, partitions, file_path, mapping, user_id, use_copy=False):
+    """
+    Fan out an import as one Celery task per partition
+    
+    A chord runs the partition tasks in parallel and then
+    finalize_partitioned_import_task merges their results into the job.
+    The dispatch is claimed on the job first, so only one delivery of the
+    coordinating task ever starts the chord.
+    
+    Args:
+        job: ImportJob being processed
+        partitions: CSVPartition list from CSVStreamReader.plan_partitions
+        file_path: Path to CSV file
+        mapping: Column mapping dictionary
+        user_id: User ID
+        use_copy: Write the partitions' batches with COPY
+    """
+    job.total_rows = sum(partition.row_count for partition in partitions)
+    job.total_batches = len(partitions)
+    job.current_batch = 0
+    job.partitions_dispatched_at = timezone.now()
+    claimed = ImportJob.objects.filter(id=job.id, partitions_dispatched_at__isnull=True).update(
+        total_rows=job.total_rows,
+        total_batches=job.total_batches,
+        current_batch=job.current_batch,
+        partitions_dispatched_at=job.partitions_dispatched_at
+    )
+    if not claimed:
+        return {
+            'success': True,
+            'partitions': 0
+        }
+    
+    batch_size = settings.IMPORT_BATCH_SIZE if use_copy else STREAM_BATCH_SIZE
+    chord(
+        process_import_partition_task.s(
+            job.id, file_path, mapping, user_id,
+            partition.start_offset, partition.end_offset, partition.start_row,
+            batch_size=batch_size, use_copy=use_copy
+        )
+        for partition in partitions
+    )(finalize_partitioned_import_task.s(job.id))
+    
+    return {
+        'success': True,
+        'partitions': len(partitions)
+    }
+
+
+# Counters a partition keeps for its committed batches
+PARTITION_COUNT_FIELDS = ['processed_rows', 'success_count', 'error_count', 'duplicate_count', 'updated_count']
+
+
+@shared_task(acks_late=True, reject_on_worker_lost=True)
+def process_import_partition_task(job_id, file_path, mapping, user_id,
+                                  start_offset, end_offset, start_row, batch_size=STREAM_BATCH_SIZE,
+                                  use_copy=False):
+    """
+    Import one byte range of a CSV file
+    
+    Each batch commits together with the partition's checkpoint and an
+    atomic increment of the job counters, so partitions running on other
+    workers never overwrite each other's progress. The task is acknowledged
+    only after it finishes: a redelivered task resumes after the last
+    committed batch, and one for a finished partition returns its result.
+    In insert mode, an email first seen in another partition is counted as
+    a duplicate, whether that partition committed it before this batch's
+    check or the unique email_key rejects the insert.
+    
+    Args:
+        job_id: ImportJob ID
+        file_path: Path to CSV file
+        mapping: Column mapping dictionary
+        user_id: User ID
+        start_offset: Byte offset of the first record in the partition
+        end_offset: Byte offset just past the last record in the partition
+        start_row: Data row number of the first record
+        batch_size: Rows per insert batch
+        use_copy: Write batches with COPY (insert mode on PostgreSQL)
         
-        # Send error update
-        if channel_layer:
-            async_to_sync(channel_layer.group_send)(
-                f'import_{job_id}',
-                {
-                    'type': 'import_progress',
-                    'data': {
-                        'job_id': job_id,
-                        'status': job.status,
-                        'error_log': str(e),
-                        'completed_at': job.completed_at.isoformat(),
-                        'last_updated': timezone.now().isoformat()
-                    }
-                }
-            )
-        
+    Returns:
+        Dictionary with the partition's counts and error log JSON
+    """
+    partition, _ = ImportPartition.objects.get_or_create(job_id=job_id, start_row=start_row)
+    error_tracker = ImportErrorTracker.for_job(job_id, part=start_row)
+    error_tracker.load_json(partition.error_log)
+    
+    def result(**extra):
         return {
-            'success': False,
-            'error': str(e)
+            'success': True,
+            **{key: getattr(partition, key) for key in PARTITION_COUNT_FIELDS},
+            'error_log': error_tracker.to_json(),
+            **extra
         }
+    
+    if partition.completed_at:
+        return result()
+    
+    bulk_service = BulkInsertService(error_tracker=error_tracker)
+    copy_service = CopyImportService(error_tracker=error_tracker) if use_copy else None
+    job = ImportJob.objects.get(id=job_id)
+    publisher = ImportProgressPublisher(job)
+    saved_error_count = error_tracker.get_error_count()
+    
+    try:
+        batches = CSVStreamReader.iter_batches(
+            file_path, batch_size,
+            start_offset=start_offset if partition.checkpoint_offset is None else partition.checkpoint_offset,
+            end_offset=end_offset,
+            start_row=start_row + partition.processed_rows
+        )
+        for batch in batches:
+            if publisher.is_cancelled():
+                break
+            
+            # The batch, the partition checkpoint and the job counters commit together
+            with transaction.atomic():
+                batch_results = import_batch(bulk_service, job, batch.df, user_id, mapping, copy_service)
+                batch_counts = {
+                    'processed_rows': len(batch.df),
+                    'success_count': batch_results['success_count'],
+                    'error_count': batch_results['error_count'],
+                    'duplicate_count': batch_results['duplicate_count'],
+                    'updated_count': batch_results.get('updated_count', 0)
+                }
+                for key, value in batch_counts.items():
+                    setattr(partition, key, getattr(partition, key) + value)
+                partition.checkpoint_offset = batch.end_offset
+                fields = PARTITION_COUNT_FIELDS + ['checkpoint_offset']
+                if error_tracker.get_error_count() != saved_error_count:
+                    partition.error_log = error_tracker.to_json()
+                    fields.append('error_log')
+                partition.save(update_fields=fields)
+                ImportJob.objects.filter(id=job_id).update(
+                    **{key: F(key) + value for key, value in batch_counts.items()}
+                )
+            saved_error_count = error_tracker.get_error_count()
+            
+            if not publisher.is_due():
+                continue
+            
+            job = ImportJob.objects.get(id=job_id)
+            publisher.send({
+                'job_id': job_id,
+                'status': job.status,
+                'processed_rows': job.processed_rows,
+                'total_rows': job.total_rows,
+                'success_count': job.success_count,
+                'error_count': job.error_count,
+                'duplicate_count': job.duplicate_count,
+                'updated_count': job.updated_count,
+                'progress': job.get_progress_percentage(),
+                'current_batch': job.current_batch,
+                'total_batches': job.total_batches,
+                'last_updated': timezone.now().isoformat()
+            })
+        
+        with transaction.atomic():
+            partition.completed_at = timezone.now()
+            partition.save(update_fields=['completed_at'])
+            ImportJob.objects.filter(id=job_id).update(current_batch=F('current_batch') + 1)
+        return result()
+    except Exception as e:
+        # Returned rather than raised so the chord still runs the final aggregation
+        return result(success=False, error=str(e))
+
+
+@shared_task
+def finalize_partitioned_import_task(results, job_id):
+    """
+    Merge partition results into the ImportJob
+    
+    Args:
+        results: Partition task results, in file order
+        job_id: ImportJob ID
+    """
+    job = ImportJob.objects.get(id=job_id)
+    channel_layer = get_channel_layer()
+    
+    # Partitions are in file order, so the merged errors stay sorted by row
+    error_tracker = ImportErrorTracker.for_job(job_id)
+    for result in results:
+        error_tracker.load_json(result['error_log'])
+        ImportErrorTracker.delete_log(result['error_log'])
+    
+    job.processed_rows = sum(result['processed_rows'] for result in results)
+    job.success_count = sum(result['success_count'] for result in results)
+    job.error_count = sum(result['error_count'] for result in results)
+    job.duplicate_count = sum(result['duplicate_count'] for result in results)
+    job.updated_count = sum(result['updated_count'] for result in results)
+    job.completed_at = timezone.now()
+    
+    failures = [result['error'] for result in results if not result['success']]
+    if failures:
+        job.status = 'FAILED'
+        job.error_log = '; '.join(failures)
+    else:
+        if job.status != 'CANCELLED':
+            job.status = 'COMPLETED'
+            job.total_rows = job.processed_rows
+        job.error_log = error_tracker.to_json()
+    
+    elapsed = (job.completed_at - job.started_at).total_seconds() if job.started_at else 0
+    if elapsed > 0:
+        job.processing_speed = job.processed_rows / elapsed
+    job.save()
+    ContactFacetService.invalidate()
+    
+    send_import_progress(channel_layer, job_id, {
+        'job_id': job_id,
+        'status': job.status,
+        'processed_rows': job.processed_rows,
+        'total_rows': job.total_rows,
+        'success_count': job.success_count,
+        'error_count': job.error_count,
+        'duplicate_count': job.duplicate_count,
+        'updated_count': job.updated_count,
+        'progress': job.get_progress_percentage(),
+        'completed_at': job.completed_at.isoformat(),
+        'duration': str(job.completed_at - job.started_at) if job.started_at else None,
+        'last_updated': timezone.now().isoformat()
+    })
+    
+    return {
+        'success': not failures,
+        'success_count': job.success_count,
+        'error_count': job.error_count,
+        'duplicate_count': job.duplicate_count
+    }
+
+
+@shared_task
+def cleanup_import_error_logs_task():
+    """
+    Delete error log files of jobs finished more than IMPORT_ERROR_RETENTION_DAYS ago
+    
+    Each job's error_log keeps the error sample and summary.
+    
+    Returns:
+        Number of jobs whose logs were deleted
+    """
+    cutoff = timezone.now() - timedelta(days=settings.IMPORT_ERROR_RETENTION_DAYS)
+    jobs = ImportJob.objects.filter(completed_at__lt=cutoff, error_log__contains='"error_file": "')
+    cleaned = 0
+    for job in jobs.only('id', 'error_log').iterator():
+        ImportErrorTracker.delete_job_logs(job.id)
+        job.error_log = ImportErrorTracker.detach_log(job.error_log)
+        job.save(update_fields=['error_log'])
+        cleaned += 1
+    return cleaned
+
 
+def send_import_progress(channel_layer, job_id, data):
+    """Send a progress update to the import's WebSocket group"""
+    if channel_layer:
+        async_to_sync(channel_layer.group_send)(
+            f'import_{job_id}',
+            {
+                'type': 'import_progress',
+                'data': data
+            }
+        )
@@ -13,6 +13,7 @@ urlpatterns = [
     
     # API endpoints for progress tracking
     path('api/job/<int:job_id>/status/', views.job_status_api, name='job_status_api'),
+    path('api/job/<int:job_id>/errors/', views.job_errors_api, name='job_errors_api'),
     path('api/job/<int:job_id>/cancel/', views.cancel_job_api, name='cancel_job_api'),
     path('api/recent-jobs/', views.recent_jobs_api, name='recent_jobs_api'),
 ]
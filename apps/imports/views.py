@@ -4,6 +4,7 @@ Enhanced with local file selection and improved preview
 """
 import json
 import os
+import pandas as pd
 from datetime import datetime, timedelta
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
@@ -13,11 +14,14 @@ from django.conf import settings
 from django.core.files.storage import default_storage
 from django.utils import timezone
 from pathlib import Path
-import pandas as pd
 
 from apps.imports.models import ImportJob
 from services.csv_column_mapper import CSVColumnMapper
+from services.csv_preview_service import CSVPreviewService
 from services.file_validator import FileValidator
+from services.import_error_tracker import ImportErrorTracker
+from services.import_progress_publisher import ImportProgressPublisher
+from services.mapping_template_service import MappingTemplateService
 from apps.imports.tasks import process_import_task
 import json
 import ast
@@ -61,16 +65,17 @@ def upload_view(request):
     # If a file has been selected, show preview
     if selected_file_path and filename:
         try:
-            # Get file size
-            file_size_mb = FileValidator.get_file_size_mb(selected_file_path)
-            
-            # Read CSV for preview (first 10 rows)
-            df = pd.read_csv(selected_file_path, nrows=10)
-            total_rows = len(pd.read_csv(selected_file_path))  # Get total rows for preview
+            # Parse the first 10 rows and count the rest without parsing them
+            preview = CSVPreviewService.get_preview(selected_file_path)
+            df = preview.df
+            file_size_mb = preview.file_size_mb
+            total_rows = preview.total_rows
             
-            # Auto-detect column mapping
-            mapper = CSVColumnMapper()
-            auto_mapping = mapper.auto_map_columns(df)
+            # Reuse the user's mapping for this header, or auto-detect one
+            auto_mapping = MappingTemplateService.find_mapping(str(request.user.id), df.columns)
+            mapping_template = auto_mapping is not None
+            if not mapping_template:
+                auto_mapping = CSVColumnMapper().auto_map_columns(df, fuzzy=True)
             mapping_json = json.dumps(auto_mapping)
             
             context = {
@@ -84,6 +89,9 @@ def upload_view(request):
                 'auto_mapping': auto_mapping,
                 'mapping_json': mapping_json,
                 'mapping_count': len(auto_mapping),
+                'mapping_template': mapping_template,
+                'import_mode_choices': ImportJob.IMPORT_MODE_CHOICES,
+                'merge_policy_choices': ImportJob.MERGE_POLICY_CHOICES,
             }
             
             return render(request, 'imports/preview.html', context)
@@ -118,15 +126,38 @@ def start_import_view(request):
                     messages.error(request, 'Invalid column mapping format')
                     return redirect('imports:upload')
             
+            # Upsert settings default to inserting new contacts only
+            import_mode = request.POST.get('import_mode', 'insert')
+            merge_policy = request.POST.get('merge_policy', 'overwrite')
+            if import_mode not in dict(ImportJob.IMPORT_MODE_CHOICES) or \
+                    merge_policy not in dict(ImportJob.MERGE_POLICY_CHOICES):
+                messages.error(request, 'Invalid import mode')
+                return redirect('imports:upload')
+            try:
+                field_policies = json.loads(request.POST.get('field_policies') or '{}')
+            except json.JSONDecodeError:
+                field_policies = None
+            if not isinstance(field_policies, dict):
+                messages.error(request, 'Invalid merge policy format')
+                return redirect('imports:upload')
+            
             # Create import job
             job = ImportJob.objects.create(
                 user_id=str(request.user.id),
                 filename=os.path.basename(file_path),
                 file_size=os.path.getsize(file_path) if os.path.exists(file_path) else 0,
                 status='PENDING',
-                column_mapping=json.dumps(mapping)
+                column_mapping=json.dumps(mapping),
+                import_mode=import_mode,
+                merge_policy=merge_policy,
+                field_policies=json.dumps(field_policies) if field_policies else ''
             )
             
+            # Offer this mapping again for uploads with the same header
+            if os.path.exists(file_path):
+                columns = pd.read_csv(file_path, nrows=0).columns
+                MappingTemplateService.save_mapping(str(request.user.id), columns, mapping)
+            
             # Trigger background task
             process_import_task.delay(job.id, file_path, mapping, str(request.user.id))
             
@@ -186,6 +217,7 @@ def job_status_api(request, job_id):
             'success_count': job.success_count,
             'error_count': job.error_count,
             'duplicate_count': job.duplicate_count,
+            'updated_count': job.updated_count,
             'processing_speed': processing_speed,
             'current_batch': job.current_batch,
             'total_batches': job.total_batches,
@@ -207,6 +239,40 @@ def job_status_api(request, job_id):
         return JsonResponse({'error': str(e)}, status=500)
 
 
+@login_required
+def job_errors_api(request, job_id):
+    """Return one page of a job's row errors, read from its error log file"""
+    try:
+        job = get_object_or_404(ImportJob, id=job_id)
+        
+        try:
+            page = max(1, int(request.GET.get('page', 1)))
+            page_size = min(1000, max(1, int(request.GET.get('page_size', 100))))
+        except ValueError:
+            return JsonResponse({'error': 'Invalid page'}, status=400)
+        
+        try:
+            error_tracker = ImportErrorTracker.from_json(job.error_log)
+        except ValueError:
+            # Failed jobs store the failure message instead of an error log
+            error_tracker = ImportErrorTracker()
+        
+        errors = error_tracker.get_errors_page((page - 1) * page_size, page_size)
+        return JsonResponse({
+            'job_id': job.id,
+            'page': page,
+            'page_size': page_size,
+            'total_count': error_tracker.get_error_count(),
+            'summary': error_tracker.get_error_summary(),
+            'errors': [error.to_dict() for error in errors]
+        })
+        
+    except ImportJob.DoesNotExist:
+        return JsonResponse({'error': 'Job not found'}, status=404)
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+
+
 @login_required
 def cancel_job_api(request, job_id):
     """Cancel a running import job"""
@@ -219,9 +285,10 @@ def cancel_job_api(request, job_id):
         # Update job status
         job.status = 'CANCELLED'
         job.completed_at = timezone.now()
-        job.save()
+        job.save(update_fields=['status', 'completed_at'])
         
-        # TODO: Send cancellation signal to Celery task
+        # Running tasks poll this flag between batches
+        ImportProgressPublisher.request_cancel(job.id)
         
         return JsonResponse({
             'success': True,
@@ -26,6 +26,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     
     # Third party apps
     'channels',
@@ -209,12 +210,55 @@ SESSION_COOKIE_SECURE = not DEBUG
 # PySpark Configuration
 SPARK_DRIVER_MEMORY = os.getenv('SPARK_DRIVER_MEMORY', '4g')
 SPARK_EXECUTOR_MEMORY = os.getenv('SPARK_EXECUTOR_MEMORY', '4g')
+SPARK_JDBC_PACKAGES = os.getenv('SPARK_JDBC_PACKAGES', 'org.postgresql:postgresql:42.7.3')
+SPARK_IMPORT_THRESHOLD_MB = float(os.getenv('SPARK_IMPORT_THRESHOLD_MB', '1024'))
 IMPORT_BATCH_SIZE = int(os.getenv('IMPORT_BATCH_SIZE', '10000'))
 MAX_IMPORT_WORKERS = int(os.getenv('MAX_IMPORT_WORKERS', '4'))
 
+# Streamed imports hand over to a new task after this many seconds,
+# resuming from the job's checkpoint, to stay under the task time limits
+IMPORT_TASK_SLICE_SECONDS = int(os.getenv('IMPORT_TASK_SLICE_SECONDS', str(CELERY_TASK_SOFT_TIME_LIMIT - 5 * 60)))
+
+# Insert-mode imports of files larger than this (MB) write their batches
+# with PostgreSQL COPY, in each partition when the file is also partitioned
+COPY_IMPORT_THRESHOLD_MB = float(os.getenv('COPY_IMPORT_THRESHOLD_MB', '10'))
+
+# Files larger than this (MB) are split into MAX_IMPORT_WORKERS partitions
+# imported by parallel Celery tasks (files over SPARK_IMPORT_THRESHOLD_MB
+# go to Spark instead when it is available)
+PARTITIONED_IMPORT_THRESHOLD_MB = float(os.getenv('PARTITIONED_IMPORT_THRESHOLD_MB', '5'))
+
+# Compressed per-job import error logs (JSON Lines)
+IMPORT_ERROR_DIR = os.getenv('IMPORT_ERROR_DIR', str(MEDIA_ROOT / 'import_errors'))
+
+# Error log files of import jobs finished longer ago than this are deleted
+# daily; the job keeps its error sample and summary
+IMPORT_ERROR_RETENTION_DAYS = int(os.getenv('IMPORT_ERROR_RETENTION_DAYS', '30'))
+CELERY_BEAT_SCHEDULE = {
+    'cleanup-import-error-logs': {
+        'task': 'apps.imports.tasks.cleanup_import_error_logs_task',
+        'schedule': 24 * 60 * 60,
+    },
+}
+
+# In-memory typeahead index (per worker); rebuilt in the background after
+# about this many seconds to pick up contacts written without model signals
+TYPEAHEAD_INDEX_TTL = int(os.getenv('TYPEAHEAD_INDEX_TTL', '300'))
+
 # Export Configuration
 DEFAULT_DOWNLOAD_LIMIT = int(os.getenv('DEFAULT_DOWNLOAD_LIMIT', '100'))
 
+# Contact exports with more rows than this run as a background export task
+# instead of inside the request
+EXPORT_INLINE_ROW_LIMIT = int(os.getenv('EXPORT_INLINE_ROW_LIMIT', '50000'))
+
+# How export downloads are sent: '' streams the file from Django,
+# 'x-accel-redirect' (nginx) or 'x-sendfile' (Apache, lighttpd) hands it to
+# the front proxy. X-Accel-Redirect paths are PROTECTED_MEDIA_URL plus the
+# file's path under MEDIA_ROOT, so nginx needs an internal location for it.
+EXPORT_DOWNLOAD_MODE = os.getenv('EXPORT_DOWNLOAD_MODE', '')
+PROTECTED_MEDIA_URL = os.getenv('PROTECTED_MEDIA_URL', '/protected-media/')
+
 # Logging
 LOGGING = {
     'version': 1,
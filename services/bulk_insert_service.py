@@ -2,24 +2,68 @@
 Bulk Insert Service - Optimized database inserts for large CSV imports
 Migrated from Stremlit/services/bulk_insert_service.py
 """
-from typing import List, Dict, Any, Optional
+import re
+from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
 import pandas as pd
-from apps.contacts.models import Contact
+from django.db import IntegrityError, connection, models, transaction
+from django.utils import timezone
+from apps.contacts.models import Contact, normalize_email
+from services.contact_service import EMAIL_PATTERN, PHONE_PATTERN, URL_PATTERN, match_series
 from services.type_converter import TypeConverter
+from services.email_dedup_index import EmailDedupIndex
 from services.import_error_tracker import ImportErrorTracker
 
 
+# Marker for cells that are skipped (NaN or blank) when building contact data
+_SKIP = object()
+
+# Field-level merge policies for bulk_upsert
+MERGE_POLICIES = ('overwrite', 'fill_blanks', 'keep_existing')
+
+# Fields an upsert never changes on an existing contact
+UPSERT_PROTECTED_FIELDS = {'email_key', 'user_id', 'created_at'}
+
+# Format checks for imported values: field -> (pattern, reason). A row is
+# rejected for the first field in this order whose value does not match.
+FIELD_FORMATS = {
+    'email': (EMAIL_PATTERN, 'Invalid email format'),
+    'phone': (PHONE_PATTERN, 'Invalid phone format'),
+    'company_phone': (PHONE_PATTERN, 'Invalid phone format'),
+    **{
+        field.name: (URL_PATTERN, 'Invalid URL format')
+        for field in Contact._meta.concrete_fields if isinstance(field, models.URLField)
+    }
+}
+
+
+def import_fields() -> List[models.Field]:
+    """
+    Contact columns an import writes: editable fields plus email_key
+
+    The primary key, timestamps and the trigger-maintained search_vector
+    are left to the database.
+    """
+    return [
+        field for field in Contact._meta.concrete_fields
+        if not field.primary_key and (field.editable or field.name == 'email_key')
+    ]
+
+
 class BulkInsertService:
     """Handle bulk inserts of contacts with error tracking"""
     
-    def __init__(self, db_session=None):
+    def __init__(self, db_session=None, error_tracker: Optional[ImportErrorTracker] = None):
         """
         Initialize bulk insert service
         
         Args:
             db_session: Django doesn't need explicit session like SQLAlchemy
+            error_tracker: Tracker for row errors (default: a new tracker)
         """
-        self.error_tracker = ImportErrorTracker()
+        self.error_tracker = error_tracker or ImportErrorTracker()
+        # Emails seen so far in this import
+        self.dedup_index = EmailDedupIndex()
     
     def bulk_insert_from_dataframe(self, df: pd.DataFrame, user_id: str, 
                                    column_mapping: Dict[str, str]) -> Dict[str, Any]:
@@ -57,11 +101,12 @@ class BulkInsertService:
                 # Clean and merge names
                 contact_data = TypeConverter.clean_and_merge_names(contact_data)
                 
-                # Skip if email already exists
+                # Skip if email appeared earlier in the file (no query) or already exists
                 email = contact_data.get('email')
                 if email:
-                    existing = Contact.objects.filter(email=email).first()
-                    if existing:
+                    email_key = normalize_email(email)
+                    if not self.dedup_index.add(email_key) or \
+                            Contact.objects.filter(email_key=email_key).exists():
                         duplicate_count += 1
                         self.error_tracker.add_duplicate_error(idx + 1, email)
                         continue
@@ -74,10 +119,23 @@ class BulkInsertService:
                     )
                     continue
                 
+                # Validate formats, in the same order as the batch engines
+                invalid_field = next((
+                    field for field, (pattern, _) in FIELD_FORMATS.items()
+                    if contact_data.get(field) and re.match(pattern, str(contact_data[field])) is None
+                ), None)
+                if invalid_field:
+                    error_count += 1
+                    self.error_tracker.add_validation_error(
+                        idx + 1, invalid_field, contact_data[invalid_field], FIELD_FORMATS[invalid_field][1]
+                    )
+                    continue
+                
                 # Create contact
-                contact = Contact(**contact_data)
-                contact.save()
-                success_count += 1
+                if self._save_contact(idx, Contact(**contact_data)):
+                    success_count += 1
+                else:
+                    duplicate_count += 1
                 
             except Exception as e:
                 error_count += 1
@@ -96,9 +154,431 @@ class BulkInsertService:
             'total_processed': len(df)
         }
     
+    def bulk_insert_set_based(self, df: pd.DataFrame, user_id: str,
+                              column_mapping: Dict[str, str]) -> Dict[str, Any]:
+        """
+        Bulk insert contacts from DataFrame using set-based operations
+        
+        The batch is converted column-wise, emails seen earlier in this
+        import are rejected from the dedup index, the remaining ones are
+        looked up with a single ``email_key__in`` query and new contacts
+        are written with ``bulk_create`` inside one transaction.
+        Counts and error tracker entries match bulk_insert_from_dataframe.
+        
+        Args:
+            df: Pandas DataFrame with one batch of contact data
+            user_id: User ID for the contacts
+            column_mapping: Mapping of CSV columns to database fields
+            
+        Returns:
+            Dictionary with success_count, error_count, and duplicate_count
+        """
+        duplicate_count = 0
+        
+        records, invalid, error_count = self._build_batch_records(df, user_id, column_mapping)
+        
+        # Emails seen earlier in the file need no lookup; the rest take one query
+        existing_keys = self._existing_email_keys([
+            (idx, data) for idx, data in records
+            if data.get('email_key') and data['email_key'] not in self.dedup_index
+        ])
+        
+        pending: List[Tuple[int, Contact]] = []
+        for idx, contact_data in records:
+            email = contact_data.get('email')
+            if email:
+                # Existing rows and earlier rows of this file both count as duplicates
+                email_key = contact_data['email_key']
+                if not self.dedup_index.add(email_key) or email_key in existing_keys:
+                    duplicate_count += 1
+                    self.error_tracker.add_duplicate_error(idx + 1, email)
+                    continue
+            else:
+                error_count += 1
+                self.error_tracker.add_validation_error(
+                    idx + 1, 'email', contact_data.get('email'), 'Email is required'
+                )
+                continue
+            
+            if self._reject_invalid(idx, invalid):
+                error_count += 1
+                continue
+            
+            try:
+                pending.append((idx, Contact(**contact_data)))
+            except Exception as e:
+                error_count += 1
+                self.error_tracker.add_error(
+                    idx + 1, 'unknown', f"Error: {str(e)}", str(df.loc[idx].to_dict())
+                )
+        
+        success_count, insert_errors, insert_duplicates = self._write_contacts(df, pending)
+        error_count += insert_errors
+        duplicate_count += insert_duplicates
+        
+        return {
+            'success_count': success_count,
+            'error_count': error_count,
+            'duplicate_count': duplicate_count,
+            'total_processed': len(df)
+        }
+    
+    def bulk_upsert(self, df: pd.DataFrame, user_id: str,
+                    column_mapping: Dict[str, str],
+                    merge_policy: str = 'overwrite',
+                    field_policies: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """
+        Insert new contacts and update existing ones, keyed on normalized email
+        
+        Each batch is written with ``INSERT ... ON CONFLICT (email_key) DO UPDATE``.
+        Only fields present in a CSV row (blank cells are ignored) are
+        updated, following the field's merge policy:
+        
+        - overwrite: replace the stored value
+        - fill_blanks: set the value only if the stored one is NULL or empty
+        - keep_existing: never change the stored value
+        
+        Rows repeating an email within the batch are merged in file order
+        with the same policies, so the result matches upserting row by row.
+        
+        Args:
+            df: Pandas DataFrame with one batch of contact data
+            user_id: User ID for new contacts
+            column_mapping: Mapping of CSV columns to database fields
+            merge_policy: Policy for fields without an entry in field_policies
+            field_policies: Per-field merge policies
+            
+        Returns:
+            Dictionary with success_count (created + updated), created_count,
+            updated_count, error_count, and duplicate_count
+        """
+        policies = self._resolve_merge_policies(merge_policy, field_policies)
+        
+        merged: Dict[str, Tuple[Any, Dict[str, Any]]] = {}
+        merged_rows: Dict[str, int] = {}
+        records, invalid, error_count = self._build_batch_records(df, user_id, column_mapping)
+        for idx, contact_data in records:
+            if not contact_data.get('email'):
+                error_count += 1
+                self.error_tracker.add_validation_error(
+                    idx + 1, 'email', contact_data.get('email'), 'Email is required'
+                )
+                continue
+            
+            if self._reject_invalid(idx, invalid):
+                error_count += 1
+                continue
+            
+            key = contact_data['email_key']
+            if key in merged:
+                first_idx, earlier = merged[key]
+                merged[key] = (first_idx, self._merge_record(earlier, contact_data, policies))
+                merged_rows[key] = merged_rows.get(key, 0) + 1
+            else:
+                merged[key] = (idx, contact_data)
+        
+        records = list(merged.values())
+        existing_keys = self._existing_email_keys(records)
+        written, write_errors = self._write_upserts(df, records, policies)
+        error_count += write_errors
+        
+        created_count = sum(1 for _, data in written if data['email_key'] not in existing_keys)
+        updated_count = len(written) - created_count + sum(
+            merged_rows.get(data['email_key'], 0) for _, data in written
+        )
+        
+        return {
+            'success_count': created_count + updated_count,
+            'created_count': created_count,
+            'updated_count': updated_count,
+            'error_count': error_count,
+            'duplicate_count': 0,
+            'total_processed': len(df)
+        }
+    
+    @staticmethod
+    def _upsert_fields() -> List[models.Field]:
+        """Contact columns written by an upsert"""
+        return import_fields() + [Contact._meta.get_field('created_at'), Contact._meta.get_field('updated_at')]
+    
+    def _resolve_merge_policies(self, merge_policy: str,
+                                field_policies: Optional[Dict[str, str]]) -> Dict[str, str]:
+        """Map every updatable field to its merge policy"""
+        field_policies = field_policies or {}
+        for policy in [merge_policy, *field_policies.values()]:
+            if policy not in MERGE_POLICIES:
+                raise ValueError(f"Unknown merge policy: {policy}")
+        
+        field_names = {field.name for field in self._upsert_fields()} - UPSERT_PROTECTED_FIELDS
+        unknown = set(field_policies) - field_names
+        if unknown:
+            raise ValueError(f"Unknown contact fields in merge policies: {', '.join(sorted(unknown))}")
+        
+        return {name: field_policies.get(name, merge_policy) for name in field_names}
+    
+    @staticmethod
+    def _merge_record(earlier: Dict[str, Any], later: Dict[str, Any],
+                      policies: Dict[str, str]) -> Dict[str, Any]:
+        """Apply a later row for the same email to an earlier one"""
+        merged = dict(earlier)
+        for name, value in later.items():
+            policy = policies.get(name, 'keep_existing')
+            if policy == 'overwrite':
+                merged[name] = value
+            elif policy == 'fill_blanks':
+                current = merged.get(name, Contact._meta.get_field(name).get_default())
+                if current is None or current == '':
+                    merged[name] = value
+        return merged
+    
+    def _upsert_sql(self, fields: List[models.Field], update_fields: set,
+                    policies: Dict[str, str], row_count: int) -> str:
+        """Multi-row INSERT ... ON CONFLICT (email_key) statement"""
+        qn = connection.ops.quote_name
+        table = qn(Contact._meta.db_table)
+        
+        assignments = []
+        for field in fields:
+            if field.name not in update_fields or field.name in UPSERT_PROTECTED_FIELDS:
+                continue
+            column = qn(field.column)
+            policy = policies[field.name]
+            if policy == 'overwrite':
+                assignments.append(f"{column} = EXCLUDED.{column}")
+            elif policy == 'fill_blanks':
+                current = f"{table}.{column}"
+                if isinstance(field, (models.CharField, models.TextField)):
+                    current = f"NULLIF({current}, '')"
+                assignments.append(f"{column} = COALESCE({current}, EXCLUDED.{column})")
+        
+        if assignments:
+            updated_at = qn(Contact._meta.get_field('updated_at').column)
+            assignments.append(f"{updated_at} = EXCLUDED.{updated_at}")
+            action = f"DO UPDATE SET {', '.join(assignments)}"
+        else:
+            action = "DO NOTHING"
+        
+        placeholders = f"({', '.join(['%s'] * len(fields))})"
+        return (
+            f"INSERT INTO {table} ({', '.join(qn(field.column) for field in fields)}) "
+            f"VALUES {', '.join([placeholders] * row_count)} "
+            f"ON CONFLICT ({qn(Contact._meta.get_field('email_key').column)}) {action}"
+        )
+    
+    @staticmethod
+    def _upsert_params(fields: List[models.Field], contact_data: Dict[str, Any], now) -> List[Any]:
+        """Column values for one row, using model defaults for missing fields"""
+        params = []
+        for field in fields:
+            if field.name in ('created_at', 'updated_at'):
+                value = now
+            elif field.name in contact_data:
+                value = contact_data[field.name]
+            else:
+                value = field.get_default()
+            params.append(field.get_db_prep_save(value, connection))
+        return params
+    
+    def _write_upserts(self, df: pd.DataFrame, records: List[Tuple[Any, Dict[str, Any]]],
+                       policies: Dict[str, str]) -> Tuple[List[Tuple[Any, Dict[str, Any]]], int]:
+        """
+        Write upserts in multi-row statements, falling back to per-row statements
+        
+        Rows are grouped by the set of fields they provide, since each
+        statement updates one set of columns.
+        
+        Returns:
+            Tuple of (written records, error_count)
+        """
+        fields = self._upsert_fields()
+        max_params = connection.features.max_query_params or 65535
+        rows_per_statement = max(1, min(1000, max_params // len(fields)))
+        now = timezone.now()
+        
+        groups: Dict[frozenset, List[Tuple[Any, Dict[str, Any]]]] = {}
+        for record in records:
+            groups.setdefault(frozenset(record[1]), []).append(record)
+        
+        written = []
+        error_count = 0
+        for update_fields, group in groups.items():
+            for start in range(0, len(group), rows_per_statement):
+                chunk = group[start:start + rows_per_statement]
+                try:
+                    with transaction.atomic():
+                        with connection.cursor() as cursor:
+                            cursor.execute(
+                                self._upsert_sql(fields, update_fields, policies, len(chunk)),
+                                [param for _, data in chunk for param in self._upsert_params(fields, data, now)]
+                            )
+                    written.extend(chunk)
+                    continue
+                except Exception:
+                    pass
+                
+                # Attribute the failure to individual rows
+                for idx, contact_data in chunk:
+                    try:
+                        with transaction.atomic():
+                            with connection.cursor() as cursor:
+                                cursor.execute(
+                                    self._upsert_sql(fields, update_fields, policies, 1),
+                                    self._upsert_params(fields, contact_data, now)
+                                )
+                        written.append((idx, contact_data))
+                    except Exception as e:
+                        error_count += 1
+                        self.error_tracker.add_error(
+                            idx + 1, 'unknown', f"Error: {str(e)}", str(df.loc[idx].to_dict())
+                        )
+        
+        return written, error_count
+    
+    def _build_batch_records(self, df: pd.DataFrame, user_id: str,
+                             column_mapping: Dict[str, str]) -> Tuple[List[Tuple[Any, Dict[str, Any]]],
+                                                                      Dict[Any, Tuple[str, Any, str]], int]:
+        """
+        Convert a batch column-wise
+        
+        Rows with a value that cannot be converted are reported to the error
+        tracker and left out, like the row-by-row engine does.
+        
+        Returns:
+            Tuple of ((index, contact_data) pairs, invalid rows, number of
+            rows that failed conversion); invalid rows map an index to the
+            (field, value, reason) of its first bad value
+        """
+        conversion_errors: Dict[Any, Tuple[str, Exception]] = {}
+        converted_frame = TypeConverter.convert_frame(df, column_mapping, conversion_errors)
+        for idx, (csv_col, error) in conversion_errors.items():
+            self.error_tracker.add_error(
+                idx + 1, column_mapping[csv_col], f"Error: {str(error)}", str(df.loc[idx].to_dict())
+            )
+        converted_columns = []
+        blank_masks = {}
+        for csv_col, db_field in column_mapping.items():
+            if csv_col in df.columns:
+                blank_masks[csv_col] = self._blank_cells(df[csv_col])
+                converted = [
+                    _SKIP if blank else value
+                    for value, blank in zip(converted_frame[csv_col].tolist(), blank_masks[csv_col])
+                ]
+                converted_columns.append((db_field, converted))
+        
+        # Validate whole columns; the first failing field in FIELD_FORMATS order is reported
+        invalid: Dict[Any, Tuple[str, Any, str]] = {}
+        for field, (pattern, reason) in FIELD_FORMATS.items():
+            for csv_col, db_field in column_mapping.items():
+                if db_field != field or csv_col not in blank_masks:
+                    continue
+                values = converted_frame[csv_col]
+                bad = ~blank_masks[csv_col] & ~match_series(values, pattern).to_numpy()
+                for pos in np.flatnonzero(bad):
+                    invalid.setdefault(df.index[pos], (field, values.iloc[pos], reason))
+        
+        records = []
+        for pos, idx in enumerate(df.index):
+            if idx in conversion_errors:
+                continue
+            contact_data = {}
+            for db_field, values in converted_columns:
+                value = values[pos]
+                if value is not _SKIP:
+                    contact_data[db_field] = value
+            contact_data['user_id'] = str(user_id)
+            if contact_data.get('email'):
+                contact_data['email_key'] = normalize_email(contact_data['email'])
+            records.append((idx, TypeConverter.clean_and_merge_names(contact_data)))
+        return records, invalid, len(conversion_errors)
+    
+    def _reject_invalid(self, idx, invalid: Dict[Any, Tuple[str, Any, str]]) -> bool:
+        """Report a row with a badly formatted value; returns True if it was rejected"""
+        if idx not in invalid:
+            return False
+        field, value, reason = invalid[idx]
+        self.error_tracker.add_validation_error(idx + 1, field, value, reason)
+        return True
+    
+    @staticmethod
+    def _existing_email_keys(records: List[Tuple[Any, Dict[str, Any]]]) -> set:
+        """Email keys of a batch that already belong to a contact, in one query"""
+        batch_keys = {data['email_key'] for _, data in records if data.get('email_key')}
+        if not batch_keys:
+            return set()
+        return set(
+            Contact.objects.filter(email_key__in=batch_keys).values_list('email_key', flat=True)
+        )
+    
+    @staticmethod
+    def _blank_cells(series: pd.Series) -> np.ndarray:
+        """Mask of missing or whitespace-only cells, which are left out of contact data"""
+        if pd.api.types.infer_dtype(series, skipna=True) == 'string':
+            text = series.astype(object)
+            return (text.isna() | (text.str.strip() == '')).to_numpy()
+        if isinstance(series.dtype, np.dtype) and series.dtype.kind in 'biuf':
+            return series.isna().to_numpy()
+        return np.array([pd.isna(value) or str(value).strip() == '' for value in series.tolist()], dtype=bool)
+    
+    def _save_contact(self, idx: Any, contact: Contact) -> bool:
+        """
+        Save one contact in its own savepoint
+        
+        A contact whose email_key was taken since the duplicate check (e.g.
+        by a concurrent import) is reported as a duplicate.
+        
+        Returns:
+            True if saved, False if reported as a duplicate
+        """
+        try:
+            with transaction.atomic():
+                contact.save()
+            return True
+        except IntegrityError:
+            if contact.email_key and Contact.objects.filter(email_key=contact.email_key).exists():
+                self.error_tracker.add_duplicate_error(idx + 1, contact.email)
+                return False
+            raise
+    
+    def _write_contacts(self, df: pd.DataFrame, pending: List[Tuple[Any, Contact]]) -> Tuple[int, int, int]:
+        """
+        Write contacts with bulk_create, falling back to per-row saves
+        
+        If the batch insert fails, each row is saved in its own savepoint
+        so the failing rows can be attributed in the error tracker.
+        
+        Returns:
+            Tuple of (success_count, error_count, duplicate_count)
+        """
+        if not pending:
+            return 0, 0, 0
+        
+        try:
+            with transaction.atomic():
+                Contact.objects.bulk_create([contact for _, contact in pending])
+            return len(pending), 0, 0
+        except Exception:
+            pass
+        
+        success_count = 0
+        error_count = 0
+        duplicate_count = 0
+        for idx, contact in pending:
+            try:
+                if self._save_contact(idx, contact):
+                    success_count += 1
+                else:
+                    duplicate_count += 1
+            except Exception as e:
+                error_count += 1
+                self.error_tracker.add_error(
+                    idx + 1, 'unknown', f"Error: {str(e)}", str(df.loc[idx].to_dict())
+                )
+        return success_count, error_count, duplicate_count
+    
     def bulk_insert_chunked(self, df: pd.DataFrame, user_id: str, 
                            column_mapping: Dict[str, str], 
-                           chunk_size: int = 100) -> Dict[str, Any]:
+                           chunk_size: int = 100,
+                           set_based: bool = False) -> Dict[str, Any]:
         """
         Bulk insert contacts in chunks with progress tracking
         
@@ -107,6 +587,7 @@ class BulkInsertService:
             user_id: User ID for the contacts
             column_mapping: Mapping of CSV columns to database fields
             chunk_size: Number of records to process before committing
+            set_based: Use bulk_insert_set_based for each chunk
             
         Returns:
             Dictionary with success_count, error_count, duplicate_count
@@ -115,10 +596,12 @@ class BulkInsertService:
         total_error = 0
         total_duplicate = 0
         
+        insert_chunk = self.bulk_insert_set_based if set_based else self.bulk_insert_from_dataframe
+        
         # Process in chunks
         for i in range(0, len(df), chunk_size):
             chunk = df.iloc[i:i + chunk_size]
-            chunk_results = self.bulk_insert_from_dataframe(chunk, user_id, column_mapping)
+            chunk_results = insert_chunk(chunk, user_id, column_mapping)
             
             total_success += chunk_results['success_count']
             total_error += chunk_results['error_count']
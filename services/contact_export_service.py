@@ -0,0 +1,380 @@
+"""
+Contact Export Service - Streamed contact exports
+Reads only the exported columns with a chunked (server-side on PostgreSQL)
+cursor and writes CSV (plain, gzip or zstd), JSON, JSON Lines, XLSX or
+Parquet incrementally, so memory use does not grow with the number of contacts
+"""
+import csv
+import gzip
+import io
+import json
+from datetime import date
+from functools import partial
+from typing import Any, Callable, Iterator, List, Optional, Sequence, TextIO, Tuple
+from django.db import models
+from django.db.models import QuerySet
+from django.http import StreamingHttpResponse
+from openpyxl import Workbook
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+
+# (CSV header, contact field) pairs for the contact list export
+CONTACT_EXPORT_COLUMNS: Tuple[Tuple[str, str], ...] = (
+    ('ID', 'id'),
+    ('First Name', 'first_name'),
+    ('Last Name', 'last_name'),
+    ('Full Name', 'full_name'),
+    ('Email', 'email'),
+    ('Phone', 'phone'),
+    ('Company', 'company'),
+    ('Industry', 'industry'),
+    ('Title', 'title'),
+    ('Website', 'website'),
+    ('City', 'city'),
+    ('State', 'state'),
+    ('Country', 'country'),
+    ('LinkedIn', 'linkedin'),
+    ('Notes', 'notes'),
+    ('Created', 'created_at'),
+)
+
+# (CSV header, contact field) pairs for exports of selected contacts
+BULK_EXPORT_COLUMNS: Tuple[Tuple[str, str], ...] = (
+    ('Name', 'full_name'),
+    ('Email', 'email'),
+    ('Phone', 'phone'),
+    ('Company', 'company'),
+    ('Industry', 'industry'),
+    ('Title', 'title'),
+    ('Website', 'website'),
+    ('City', 'city'),
+    ('State', 'state'),
+    ('Country', 'country'),
+    ('LinkedIn', 'linkedin'),
+    ('Notes', 'notes'),
+    ('Created', 'created_at'),
+)
+
+# (header, contact field) pairs for background exports (process_export_task)
+EXPORT_TASK_COLUMNS: Tuple[Tuple[str, str], ...] = (
+    ('id', 'id'),
+    ('first_name', 'first_name'),
+    ('last_name', 'last_name'),
+    ('email', 'email'),
+    ('phone', 'phone'),
+    ('company', 'company'),
+    ('job_title', 'title'),
+    ('industry', 'industry'),
+    ('country', 'country'),
+    ('city', 'city'),
+    ('status', 'status'),
+    ('created_at', 'created_at'),
+    ('updated_at', 'updated_at'),
+)
+
+DATE_FORMAT = '%Y-%m-%d'
+DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Column layouts by name; exports queued from a view record the view's
+# layout in ExportLog.filters_applied['layout'] so the file matches the
+# inline download
+EXPORT_LAYOUTS = {
+    'contact_list': (CONTACT_EXPORT_COLUMNS, DATE_FORMAT),
+    'selected_contacts': (BULK_EXPORT_COLUMNS, DATE_FORMAT),
+    'export': (EXPORT_TASK_COLUMNS, DATETIME_FORMAT),
+}
+
+# File extension per ExportLog.export_format
+EXPORT_FILE_EXTENSIONS = {
+    'csv': 'csv',
+    'excel': 'xlsx',
+    'json': 'json',
+    'jsonl': 'jsonl',
+    'parquet': 'parquet',
+    'csv_gzip': 'csv.gz',
+    'csv_zstd': 'csv.zst',
+}
+
+# Rows an Excel worksheet can hold below the header
+XLSX_MAX_ROWS = 1048575
+
+# Rows per Parquet row group; each group is built in memory before it is written
+PARQUET_ROW_GROUP_SIZE = 100000
+
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+
+class ContactExportService:
+    """Stream contact querysets to downloads and export files"""
+
+    # Rows fetched from the database per round trip
+    CHUNK_SIZE = 2000
+    # Buffered CSV text is sent once it reaches this many characters
+    FLUSH_SIZE = 64 * 1024
+
+    @staticmethod
+    def iter_rows(queryset: QuerySet, columns: Sequence[Tuple[str, str]],
+                  chunk_size: Optional[int] = None,
+                  date_format: Optional[str] = DATE_FORMAT) -> Iterator[List[Any]]:
+        """
+        Yield rows for the given columns with dates formatted as text
+
+        Args:
+            queryset: Contacts to export
+            columns: (header, field) pairs
+            chunk_size: Rows fetched per round trip (default: CHUNK_SIZE)
+            date_format: strftime format for date and datetime values
+                (None keeps them as date and datetime objects)
+
+        Yields:
+            Lists of values in column order; NULL stays None
+        """
+        fields = [field for _, field in columns]
+        rows = queryset.values_list(*fields).iterator(
+            chunk_size=chunk_size or ContactExportService.CHUNK_SIZE
+        )
+        if date_format is None:
+            yield from map(list, rows)
+            return
+        for row in rows:
+            yield [
+                value.strftime(date_format) if isinstance(value, date) else value
+                for value in row
+            ]
+
+    @staticmethod
+    def iter_csv(queryset: QuerySet, columns: Sequence[Tuple[str, str]],
+                 chunk_size: Optional[int] = None) -> Iterator[str]:
+        """
+        Yield CSV text in pieces, starting with the header
+
+        The header is yielded before the query runs so the client gets
+        the first byte immediately.
+
+        Args:
+            queryset: Contacts to export
+            columns: (header, field) pairs
+            chunk_size: Rows fetched per round trip (default: CHUNK_SIZE)
+
+        Yields:
+            CSV text chunks; NULL values are written blank
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
+
+        writer.writerow([header for header, _ in columns])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+        for row in ContactExportService.iter_rows(queryset, columns, chunk_size):
+            writer.writerow(row)
+            if buffer.tell() >= ContactExportService.FLUSH_SIZE:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+
+        if buffer.tell():
+            yield buffer.getvalue()
+
+    @staticmethod
+    def csv_response(queryset: QuerySet, columns: Sequence[Tuple[str, str]],
+                     filename: str) -> StreamingHttpResponse:
+        """
+        Streaming CSV download of a queryset
+
+        Args:
+            queryset: Contacts to export
+            columns: (header, field) pairs
+            filename: Download file name
+
+        Returns:
+            StreamingHttpResponse with an attachment Content-Disposition
+        """
+        response = StreamingHttpResponse(
+            ContactExportService.iter_csv(queryset, columns), content_type='text/csv'
+        )
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    @staticmethod
+    def write_file(queryset: QuerySet, columns: Sequence[Tuple[str, str]], file_path: str,
+                   export_format: str, date_format: str = DATETIME_FORMAT,
+                   progress_callback: Optional[Callable[[int], None]] = None) -> int:
+        """
+        Write a queryset to a file without holding it in memory
+
+        Args:
+            queryset: Contacts to export
+            columns: (header, field) pairs
+            file_path: Output file path
+            export_format: csv, csv_gzip, csv_zstd, excel, json (array of
+                records), jsonl or parquet
+            date_format: strftime format for date and datetime values
+                (Parquet keeps them typed)
+            progress_callback: Called with the number of rows written after every chunk
+
+        Returns:
+            Number of rows written
+        """
+        writers = {
+            'csv': ContactExportService._write_csv,
+            'csv_gzip': partial(ContactExportService._write_csv, compression='gzip'),
+            'csv_zstd': partial(ContactExportService._write_csv, compression='zstd'),
+            'excel': ContactExportService._write_xlsx,
+            'json': ContactExportService._write_json,
+            'jsonl': ContactExportService._write_jsonl,
+        }
+        if export_format == 'parquet':
+            writers['parquet'] = partial(
+                ContactExportService._write_parquet,
+                schema=ContactExportService.parquet_schema(queryset.model, columns)
+            )
+            date_format = None
+        if export_format not in writers:
+            raise ValueError(f"Unsupported export format: {export_format}")
+
+        headers = [header for header, _ in columns]
+        rows = ContactExportService._report_progress(
+            ContactExportService.iter_rows(queryset, columns, date_format=date_format),
+            progress_callback
+        )
+        return writers[export_format](file_path, headers, rows)
+
+    @staticmethod
+    def _report_progress(rows: Iterator[List[Any]],
+                         progress_callback: Optional[Callable[[int], None]]) -> Iterator[List[Any]]:
+        """Pass rows through, calling progress_callback every CHUNK_SIZE rows"""
+        count = 0
+        for row in rows:
+            yield row
+            count += 1
+            if progress_callback and count % ContactExportService.CHUNK_SIZE == 0:
+                progress_callback(count)
+        if progress_callback and count % ContactExportService.CHUNK_SIZE:
+            progress_callback(count)
+
+    @staticmethod
+    def _open_text(file_path: str, compression: Optional[str] = None) -> TextIO:
+        """Open a text file for writing, optionally through a gzip or zstd compressor"""
+        if compression == 'gzip':
+            return gzip.open(file_path, 'wt', compresslevel=GZIP_LEVEL, encoding='utf-8', newline='')
+        if compression == 'zstd':
+            if not ZSTD_AVAILABLE:
+                raise RuntimeError("zstandard is not installed")
+            compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+            return io.TextIOWrapper(
+                compressor.stream_writer(open(file_path, 'wb')), encoding='utf-8', newline=''
+            )
+        return open(file_path, 'w', newline='', encoding='utf-8')
+
+    @staticmethod
+    def _write_csv(file_path: str, headers: List[str], rows: Iterator[List[Any]],
+                   compression: Optional[str] = None) -> int:
+        count = 0
+        with ContactExportService._open_text(file_path, compression) as f:
+            writer = csv.writer(f, lineterminator='\n')
+            writer.writerow(headers)
+            for row in rows:
+                writer.writerow(row)
+                count += 1
+        return count
+
+    @staticmethod
+    def _write_json(file_path: str, headers: List[str], rows: Iterator[List[Any]]) -> int:
+        """JSON array of records, written one record at a time"""
+        count = 0
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write('[')
+            for row in rows:
+                f.write(',\n' if count else '\n')
+                f.write(json.dumps(dict(zip(headers, row)), default=str))
+                count += 1
+            f.write('\n]' if count else ']')
+        return count
+
+    @staticmethod
+    def _write_jsonl(file_path: str, headers: List[str], rows: Iterator[List[Any]]) -> int:
+        count = 0
+        with open(file_path, 'w', encoding='utf-8') as f:
+            for row in rows:
+                f.write(json.dumps(dict(zip(headers, row)), default=str))
+                f.write('\n')
+                count += 1
+        return count
+
+    @staticmethod
+    def _write_xlsx(file_path: str, headers: List[str], rows: Iterator[List[Any]]) -> int:
+        """Write-only workbook; rows are flushed to a temporary file as they are appended"""
+        workbook = Workbook(write_only=True)
+        worksheet = workbook.create_sheet()
+        worksheet.append(headers)
+        count = 0
+        for row in rows:
+            if count == XLSX_MAX_ROWS:
+                raise ValueError(f"Excel exports are limited to {XLSX_MAX_ROWS} rows")
+            worksheet.append(row)
+            count += 1
+        workbook.save(file_path)
+        return count
+
+    @staticmethod
+    def parquet_schema(model: type, columns: Sequence[Tuple[str, str]]) -> 'pa.Schema':
+        """Arrow schema with a typed column per exported model field"""
+        if not PYARROW_AVAILABLE:
+            raise RuntimeError("pyarrow is not installed")
+
+        fields = []
+        for header, name in columns:
+            field = model._meta.get_field(name)
+            if isinstance(field, models.BooleanField):
+                arrow_type = pa.bool_()
+            elif isinstance(field, models.IntegerField):
+                arrow_type = pa.int64()
+            elif isinstance(field, models.FloatField):
+                arrow_type = pa.float64()
+            elif isinstance(field, models.DateTimeField):
+                arrow_type = pa.timestamp('us', tz='UTC')
+            elif isinstance(field, models.DateField):
+                arrow_type = pa.date32()
+            else:
+                arrow_type = pa.string()
+            fields.append(pa.field(header, arrow_type))
+        return pa.schema(fields)
+
+    @staticmethod
+    def _write_parquet(file_path: str, headers: List[str], rows: Iterator[List[Any]],
+                       schema: 'pa.Schema') -> int:
+        """Write rows in row groups of PARQUET_ROW_GROUP_SIZE"""
+        count = 0
+        with pq.ParquetWriter(file_path, schema) as writer:
+            def write_group(group):
+                arrays = [
+                    pa.array(values, type=field.type)
+                    for values, field in zip(zip(*group), schema)
+                ]
+                writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+
+            group = []
+            for row in rows:
+                group.append(row)
+                count += 1
+                if len(group) == PARQUET_ROW_GROUP_SIZE:
+                    write_group(group)
+                    group = []
+            if group:
+                write_group(group)
+        return count
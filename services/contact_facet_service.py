@@ -0,0 +1,105 @@
+"""
+Contact Facet Service - Cached filter values with counts for the contact list
+Keeps each facet's distinct values and contact counts in the cache so the
+list page never runs a full-table DISTINCT. Single contact writes adjust
+the cached counts; imports and bulk updates invalidate them.
+
+Adjustments read, modify and write a facet's whole dict, so two workers
+adjusting the same facet at once can lose one of the changes. Counts are
+therefore approximate until the next invalidate() or cache timeout; they
+only label the dropdown, the list itself always filters in the database.
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+from django.core.cache import cache
+from django.db.models import Count
+from apps.contacts.models import FACET_FIELDS, Contact
+
+
+class ContactFacetService:
+    """Distinct contact field values with counts"""
+
+    CACHE_KEY = 'contact_facets:{field}'
+    CACHE_TIMEOUT = 3600
+
+    @staticmethod
+    def compute(field: str) -> Dict[str, int]:
+        """
+        Count contacts per value of a field (blank values are skipped)
+
+        Args:
+            field: Facet field name
+
+        Returns:
+            Dict of value -> contact count
+        """
+        rows = (
+            Contact.objects.exclude(**{f'{field}__isnull': True}).exclude(**{field: ''})
+            .values_list(field).annotate(count=Count('id')).order_by()
+        )
+        return dict(rows)
+
+    @staticmethod
+    def get_counts(field: str) -> Dict[str, int]:
+        """Cached value -> count dict for a facet, computed on a miss"""
+        key = ContactFacetService.CACHE_KEY.format(field=field)
+        counts = cache.get(key)
+        if counts is None:
+            counts = ContactFacetService.compute(field)
+            cache.set(key, counts, ContactFacetService.CACHE_TIMEOUT)
+        return counts
+
+    @staticmethod
+    def get_facets(field: str) -> List[Tuple[str, int]]:
+        """
+        Facet values for a dropdown
+
+        Args:
+            field: Facet field name
+
+        Returns:
+            List of (value, count) sorted by value
+        """
+        return sorted(ContactFacetService.get_counts(field).items())
+
+    @staticmethod
+    def invalidate(fields: Iterable[str] = FACET_FIELDS):
+        """Drop cached facets; the next read recounts them"""
+        cache.delete_many([ContactFacetService.CACHE_KEY.format(field=field) for field in fields])
+
+    @staticmethod
+    def adjust(field: str, value: Optional[str], delta: int):
+        """
+        Add delta to one value's cached count
+
+        Does nothing when the facet is not cached; the next read counts it.
+        Not atomic: a concurrent adjustment of the same facet can be lost
+        (see the module docstring).
+        """
+        if not value:
+            return
+        key = ContactFacetService.CACHE_KEY.format(field=field)
+        counts = cache.get(key)
+        if counts is None:
+            return
+        count = counts.get(value, 0) + delta
+        if count > 0:
+            counts[value] = count
+        else:
+            counts.pop(value, None)
+        cache.set(key, counts, ContactFacetService.CACHE_TIMEOUT)
+
+    @staticmethod
+    def contact_changed(old: Optional[Dict[str, str]], new: Optional[Dict[str, str]]):
+        """
+        Adjust cached counts for one contact write
+
+        Args:
+            old: Facet values before the write (None for a new contact)
+            new: Facet values after the write (None for a deleted contact)
+        """
+        for field in FACET_FIELDS:
+            old_value = old.get(field) if old else None
+            new_value = new.get(field) if new else None
+            if old_value != new_value:
+                ContactFacetService.adjust(field, old_value, -1)
+                ContactFacetService.adjust(field, new_value, 1)
@@ -0,0 +1,284 @@
+"""
+Contact Prefix Index - In-memory typeahead over contact names, companies and emails
+Each worker process keeps a sorted list of (term, contact id) pairs and
+answers prefix lookups with bisect, so typeahead suggestions do not query
+the database. The index is built in a background thread on first use;
+until it is ready, lookups fall back to a database query. Contact
+save/delete signals keep the local worker's index current, and it is
+rebuilt in the background about every TYPEAHEAD_INDEX_TTL seconds to pick
+up writes that bypass signals (bulk imports, queryset updates, other workers).
+"""
+import heapq
+import logging
+import random
+import threading
+import time
+from bisect import bisect_left, insort
+from itertools import islice
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+
+logger = logging.getLogger(__name__)
+
+
+Record = Tuple[str, str, str]  # (full_name, company, email)
+
+# Rebuilds are spread over up to this fraction of the TTL so workers do not
+# all scan the contacts table at once
+REFRESH_JITTER = 0.1
+
+
+class ContactPrefixIndex:
+    """Sorted-array prefix index of contacts"""
+
+    BUILD_CHUNK_SIZE = 5000
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        # Entries from the last build; never modified in place
+        self._entries: List[Tuple[str, int]] = []
+        # Entries added by updates since the last build
+        self._added: List[Tuple[str, int]] = []
+        self._records: Dict[int, Record] = {}
+        # Current terms of each contact; entries whose term is not here are stale
+        self._terms: Dict[int, FrozenSet[str]] = {}
+        # Updates received while a build runs, replayed on top of its result
+        self._pending: Optional[Dict[int, Optional[Record]]] = None
+        self._built_at: Optional[float] = None
+        self._ttl: float = 0
+        self._refresh_thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def terms(record: Record) -> List[str]:
+        """
+        Lowercased terms a contact can be found by
+
+        The full name and company match from their start and from each
+        later word ('doe' finds 'John Doe'); the email matches from its start.
+
+        Args:
+            record: (full_name, company, email)
+
+        Returns:
+            Unique terms
+        """
+        full_name, company, email = record
+        terms = set()
+        for value in (full_name, company):
+            words = (value or '').lower().split()
+            for i in range(len(words)):
+                terms.add(' '.join(words[i:]))
+        if email:
+            terms.add(email.strip().lower())
+        return sorted(terms)
+
+    @property
+    def is_built(self) -> bool:
+        return self._built_at is not None
+
+    def is_stale(self) -> bool:
+        """Whether the index was never built or is older than its TTL"""
+        if self._built_at is None:
+            return True
+        return time.monotonic() - self._built_at > self._ttl
+
+    def build(self, rows: Optional[Iterable[Tuple[int, str, str, str]]] = None):
+        """
+        (Re)build the index
+
+        Updates that arrive while the rows are read are applied on top of
+        the new index.
+
+        Args:
+            rows: (id, full_name, company, email) rows; defaults to every contact
+        """
+        with self._lock:
+            self._pending = {}
+        try:
+            if rows is None:
+                from apps.contacts.models import Contact
+                rows = Contact.objects.values_list('id', 'full_name', 'company', 'email').iterator(
+                    chunk_size=self.BUILD_CHUNK_SIZE
+                )
+
+            records = {}
+            terms = {}
+            entries = []
+            for contact_id, full_name, company, email in rows:
+                record = (full_name or '', company or '', email or '')
+                records[contact_id] = record
+                terms[contact_id] = frozenset(self.terms(record))
+                entries.extend((term, contact_id) for term in terms[contact_id])
+            entries.sort()
+        except BaseException:
+            with self._lock:
+                self._pending = None
+            raise
+
+        with self._lock:
+            pending, self._pending = self._pending, None
+            self._entries = entries
+            self._added = []
+            self._records = records
+            self._terms = terms
+            for contact_id, record in pending.items():
+                if record is None:
+                    self._remove_record(contact_id)
+                else:
+                    self._add_record(contact_id, record)
+            self._built_at = time.monotonic()
+            self._ttl = settings.TYPEAHEAD_INDEX_TTL * (1 - random.uniform(0, REFRESH_JITTER))
+
+    def refresh(self) -> bool:
+        """
+        Rebuild the index in a background thread
+
+        Returns:
+            False if a rebuild is already running
+        """
+        if not self._build_lock.acquire(blocking=False):
+            return False
+        try:
+            self._refresh_thread = threading.Thread(
+                target=self._run_refresh, name='contact-prefix-index', daemon=True
+            )
+            self._refresh_thread.start()
+        except BaseException:
+            self._build_lock.release()
+            raise
+        return True
+
+    def _run_refresh(self):
+        try:
+            self.build()
+        except Exception:
+            # The next lookup starts another rebuild
+            logger.exception("Failed to build the contact prefix index")
+        finally:
+            # The thread's own database connection
+            connection.close()
+            self._build_lock.release()
+
+    def clear(self):
+        """Drop the index; the next lookup rebuilds it"""
+        with self._lock:
+            self._entries = []
+            self._added = []
+            self._records = {}
+            self._terms = {}
+            self._built_at = None
+
+    def _add_record(self, contact_id: int, record: Record):
+        """Index a contact's record; only its new terms need entries"""
+        old_terms = self._terms.get(contact_id, frozenset())
+        new_terms = frozenset(self.terms(record))
+        self._records[contact_id] = record
+        self._terms[contact_id] = new_terms
+        # Updates since the last build are few, so the sorted insert stays cheap
+        for term in sorted(new_terms - old_terms):
+            insort(self._added, (term, contact_id))
+
+    def _remove_record(self, contact_id: int):
+        """Forget a contact; its entries are skipped until the next build"""
+        self._records.pop(contact_id, None)
+        self._terms.pop(contact_id, None)
+
+    def update(self, contact_id: int, full_name: str, company: str, email: str):
+        """
+        Add or re-index one contact
+
+        Does nothing before the index is built; the build reads the contact.
+        """
+        record = (full_name or '', company or '', email or '')
+        with self._lock:
+            if self._pending is not None:
+                self._pending[contact_id] = record
+            if self.is_built:
+                self._add_record(contact_id, record)
+
+    def remove(self, contact_id: int):
+        """Remove one contact"""
+        with self._lock:
+            if self._pending is not None:
+                self._pending[contact_id] = None
+            if self.is_built:
+                self._remove_record(contact_id)
+
+    def _entries_from(self, prefix: str) -> Iterator[Tuple[str, int]]:
+        """Built and added entries from the first one not before the prefix, in order"""
+        return heapq.merge(
+            islice(self._entries, bisect_left(self._entries, (prefix,)), None),
+            islice(self._added, bisect_left(self._added, (prefix,)), None)
+        )
+
+    def search(self, prefix: str, limit: int = 10) -> List[Dict]:
+        """
+        Contacts with a term starting with the prefix
+
+        A missing or stale index is rebuilt in the background; a stale one
+        keeps answering meanwhile, a missing one is replaced by a database
+        query.
+
+        Args:
+            prefix: Typed text
+            limit: Maximum number of contacts
+
+        Returns:
+            List of {'id', 'full_name', 'company', 'email'} in term order
+        """
+        prefix = ' '.join(prefix.lower().split())
+        if not prefix:
+            return []
+        if self.is_stale():
+            self.refresh()
+        if not self.is_built:
+            return self.search_database(prefix, limit)
+
+        results = []
+        seen = set()
+        with self._lock:
+            for term, contact_id in self._entries_from(prefix):
+                if not term.startswith(prefix) or len(results) >= limit:
+                    break
+                if contact_id in seen or term not in self._terms.get(contact_id, ()):
+                    continue
+                seen.add(contact_id)
+                full_name, company, email = self._records[contact_id]
+                results.append({
+                    'id': contact_id,
+                    'full_name': full_name,
+                    'company': company,
+                    'email': email
+                })
+        return results
+
+    @staticmethod
+    def search_database(prefix: str, limit: int = 10) -> List[Dict]:
+        """
+        Database lookup matching the index terms, used until the index is built
+
+        Args:
+            prefix: Normalized prefix (lowercase, single spaces)
+            limit: Maximum number of contacts
+
+        Returns:
+            List of {'id', 'full_name', 'company', 'email'} by name
+        """
+        from apps.contacts.models import Contact
+        matches = Q(email__istartswith=prefix)
+        for field in ('full_name', 'company'):
+            matches |= Q(**{f'{field}__istartswith': prefix}) | Q(**{f'{field}__icontains': f' {prefix}'})
+        rows = Contact.objects.filter(matches).order_by('full_name', 'id').values_list(
+            'id', 'full_name', 'company', 'email'
+        )[:limit]
+        return [
+            {'id': contact_id, 'full_name': full_name or '', 'company': company or '', 'email': email or ''}
+            for contact_id, full_name, company, email in rows
+        ]
+
+
+# One index per worker process
+contact_prefix_index = ContactPrefixIndex()
@@ -0,0 +1,102 @@
+"""
+Contact Search Service - Indexed full-text search over contacts
+On PostgreSQL, contacts carry a search_vector tsvector column kept up to
+date by a trigger and indexed with GIN (contacts migration 0004); searches
+are prefix matches on every word, ranked by where they hit (name, company,
+email, title). Other databases fall back to icontains matching.
+"""
+import re
+from typing import List, Optional
+from django.db import connection
+from django.db.models import F, Q, QuerySet
+
+
+SEARCH_CONFIG = 'simple'
+SEARCH_FIELDS = ['full_name', 'company', 'email', 'title']
+
+
+class ContactSearchService:
+    """Search contacts by name, company, email and title"""
+
+    @staticmethod
+    def is_available() -> bool:
+        """tsvector search is only available on PostgreSQL"""
+        return connection.vendor == 'postgresql'
+
+    @staticmethod
+    def build_query(text: str) -> Optional[str]:
+        """
+        Raw tsquery matching every word of the text as a prefix
+
+        Args:
+            text: User search input
+
+        Returns:
+            tsquery string such as 'john:* & smi:*', None if the text has no words
+        """
+        words = re.findall(r'\w+', text.lower())
+        if not words:
+            return None
+        return ' & '.join(f"{word}:*" for word in words)
+
+    @staticmethod
+    def _fallback_filter(queryset: QuerySet, text: str) -> QuerySet:
+        """icontains matching for databases without tsvector"""
+        condition = Q()
+        for field in SEARCH_FIELDS:
+            condition |= Q(**{f'{field}__icontains': text})
+        return queryset.filter(condition)
+
+    @staticmethod
+    def filter(queryset: QuerySet, text: str) -> QuerySet:
+        """
+        Restrict a contact queryset to contacts matching a search
+
+        Keeps the queryset's ordering, so it can be combined with keyset
+        pagination.
+
+        Args:
+            queryset: Contact queryset
+            text: User search input
+
+        Returns:
+            Filtered queryset
+        """
+        text = text.strip()
+        if not text:
+            return queryset
+        if not ContactSearchService.is_available():
+            return ContactSearchService._fallback_filter(queryset, text)
+
+        from django.contrib.postgres.search import SearchQuery
+
+        tsquery = ContactSearchService.build_query(text)
+        if tsquery is None:
+            return queryset.none()
+        return queryset.filter(search_vector=SearchQuery(tsquery, search_type='raw', config=SEARCH_CONFIG))
+
+    @staticmethod
+    def search(queryset: QuerySet, text: str, limit: int = 100) -> List:
+        """
+        Best matches for a search, ranked by relevance on PostgreSQL
+
+        Args:
+            queryset: Contact queryset
+            text: User search input
+            limit: Maximum number of contacts
+
+        Returns:
+            Matching contacts, best first (newest first on the fallback)
+        """
+        matches = ContactSearchService.filter(queryset, text)
+        tsquery = ContactSearchService.build_query(text)
+        if not ContactSearchService.is_available() or tsquery is None:
+            return list(matches.order_by('-created_at', '-id')[:limit])
+
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+
+        query = SearchQuery(tsquery, search_type='raw', config=SEARCH_CONFIG)
+        return list(
+            matches.annotate(rank=SearchRank(F('search_vector'), query))
+            .order_by('-rank', '-created_at', '-id')[:limit]
+        )
@@ -4,26 +4,65 @@ Migrated from Stremlit/services/contact_service.py
 """
 import re
 from typing import Optional, Dict, List
+import pandas as pd
+from django.db import IntegrityError, transaction
 from django.db.models import Q, Count, F
 from apps.contacts.models import Contact
+from services.contact_search_service import ContactSearchService
+from services.keyset_paginator import CountEstimator, KeysetPaginator
+
+
+EMAIL_PATTERN = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+PHONE_PATTERN = r'^[\+]?[(]?[0-9]{1,4}[)]?[-\s\.]?[(]?[0-9]{1,4}[)]?[-\s\.]?[0-9]{1,9}$'
+URL_PATTERN = r'^https?://.+'
+
+EMAIL_RE = re.compile(EMAIL_PATTERN)
+PHONE_RE = re.compile(PHONE_PATTERN)
+URL_RE = re.compile(URL_PATTERN)
 
 
 def validate_email(email: str) -> bool:
     """Validate email format"""
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return re.match(pattern, email) is not None
+    return EMAIL_RE.match(email) is not None
 
 
 def validate_phone(phone: str) -> bool:
     """Validate phone format"""
-    pattern = r'^[\+]?[(]?[0-9]{1,4}[)]?[-\s\.]?[(]?[0-9]{1,4}[)]?[-\s\.]?[0-9]{1,9}$'
-    return re.match(pattern, phone) is not None
+    return PHONE_RE.match(phone) is not None
 
 
 def validate_url(url: str) -> bool:
     """Validate URL format"""
-    pattern = r'^https?://.+'
-    return re.match(pattern, url) is not None
+    return URL_RE.match(url) is not None
+
+
+def match_series(series: pd.Series, pattern: str) -> pd.Series:
+    """
+    Match a pattern against every value of a Series
+    
+    Args:
+        series: Values to validate
+        pattern: Regular expression matched at the start of each value
+        
+    Returns:
+        Boolean mask; missing values do not match
+    """
+    return series.astype('string').str.match(pattern).fillna(False).astype(bool)
+
+
+def validate_email_series(series: pd.Series) -> pd.Series:
+    """Validate email format for a whole Series"""
+    return match_series(series, EMAIL_PATTERN)
+
+
+def validate_phone_series(series: pd.Series) -> pd.Series:
+    """Validate phone format for a whole Series"""
+    return match_series(series, PHONE_PATTERN)
+
+
+def validate_url_series(series: pd.Series) -> pd.Series:
+    """Validate URL format for a whole Series"""
+    return match_series(series, URL_PATTERN)
 
 
 class ContactService:
@@ -50,9 +89,18 @@ class ContactService:
         contact_data = {k: v for k, v in contact_data.items() if v is not None and v != ''}
         
         contact = Contact(**contact_data)
-        contact.save()
+        ContactService._save(contact)
         return contact
     
+    @staticmethod
+    def _save(contact: Contact):
+        """Save a contact, turning an email_key conflict into a ValueError"""
+        try:
+            with transaction.atomic():
+                contact.save()
+        except IntegrityError:
+            raise ValueError("Email already exists")
+    
     @staticmethod
     def get_contact(contact_id: int) -> Optional[Contact]:
         """Get contact by ID"""
@@ -97,7 +145,7 @@ class ContactService:
             if hasattr(contact, key):
                 setattr(contact, key, value)
         
-        contact.save()
+        ContactService._save(contact)
         return contact
     
     @staticmethod
@@ -112,27 +160,31 @@ class ContactService:
     
     @staticmethod
     def search_contacts(query: str, limit: int = 100) -> List[Contact]:
-        """Search contacts by name, company, email"""
-        return Contact.objects.filter(
-            Q(full_name__icontains=query) |
-            Q(company__icontains=query) |
-            Q(email__icontains=query) |
-            Q(title__icontains=query)
-        )[:limit]
+        """Search contacts by name, company, email and title, best matches first"""
+        return ContactSearchService.search(Contact.objects.all(), query, limit)
     
     @staticmethod
-    def filter_contacts(filters: Dict, page: int = 1, per_page: int = 25) -> Dict:
-        """Filter contacts with pagination"""
+    def filter_contacts(filters: Dict, page: int = 1, per_page: int = 25,
+                        cursor: Optional[str] = None) -> Dict:
+        """
+        Filter contacts with pagination
+        
+        Args:
+            filters: search, industry, country and city filters
+            page: Page number for offset pagination
+            per_page: Contacts per page
+            cursor: Keyset cursor ('' for the first page); when given, pages
+                by cursor instead of page number
+        
+        Returns:
+            Dict with contacts, an approximate total, and next_cursor /
+            previous_cursor in cursor mode
+        """
         query = Contact.objects.all()
         
         # Apply filters
         if filters.get('search'):
-            search = filters['search']
-            query = query.filter(
-                Q(full_name__icontains=search) |
-                Q(company__icontains=search) |
-                Q(email__icontains=search)
-            )
+            query = ContactSearchService.filter(query, filters['search'])
         
         if filters.get('industry'):
             query = query.filter(industry__in=filters['industry'])
@@ -143,12 +195,24 @@ class ContactService:
         if filters.get('city'):
             query = query.filter(city__icontains=filters['city'])
         
-        # Count total
-        total = query.count()
+        query = query.order_by('-created_at', '-id')
+        total = CountEstimator.count(query)
+        
+        if cursor is not None:
+            keyset_page = KeysetPaginator(query, per_page).get_page(cursor or None)
+            return {
+                'contacts': keyset_page.object_list,
+                'total': total,
+                'page': None,
+                'per_page': per_page,
+                'pages': (total + per_page - 1) // per_page,
+                'next_cursor': keyset_page.next_cursor,
+                'previous_cursor': keyset_page.previous_cursor
+            }
         
         # Paginate
         offset = (page - 1) * per_page
-        contacts = list(query.order_by('-created_at')[offset:offset + per_page])
+        contacts = list(query[offset:offset + per_page])
         
         return {
             'contacts': contacts,
@@ -0,0 +1,258 @@
+"""
+COPY Import Service - PostgreSQL COPY-based import for very large CSVs
+Streams mapped and converted rows into a staging table with COPY FROM STDIN
+and merges each batch into contacts with a single INSERT ... SELECT
+"""
+import csv
+import io
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import pandas as pd
+from django.conf import settings
+from django.db import connection, models, transaction
+from apps.contacts.models import Contact
+from services.bulk_insert_service import BulkInsertService, import_fields
+from services.csv_stream_reader import CSVStreamReader
+from services.import_error_tracker import ImportErrorTracker
+
+
+# Value written for NULL cells in the COPY stream
+COPY_NULL = r'\N'
+
+INTEGER_MIN = -2147483648
+INTEGER_MAX = 2147483647
+
+
+class CopyImportService:
+    """Import contacts through a PostgreSQL staging table"""
+
+    STAGING_TABLE = 'contacts_import_staging'
+
+    def __init__(self, chunk_size: Optional[int] = None, error_tracker: Optional[ImportErrorTracker] = None):
+        """
+        Initialize COPY import service
+
+        Args:
+            chunk_size: Number of CSV rows converted and copied per chunk
+            error_tracker: Tracker for row errors (default: a new tracker)
+        """
+        self.chunk_size = chunk_size or settings.IMPORT_BATCH_SIZE
+        # Row conversion is shared with the ORM engine so both produce the same data
+        self.bulk_service = BulkInsertService(error_tracker=error_tracker)
+        self.error_tracker = self.bulk_service.get_error_tracker()
+        self.fields = import_fields()
+        self.field_names = [field.name for field in self.fields]
+
+    @staticmethod
+    def is_available() -> bool:
+        """COPY is only available on PostgreSQL"""
+        return connection.vendor == 'postgresql'
+
+    def import_file(self, file_path: str, user_id: str, column_mapping: Dict[str, str],
+                    progress_callback: Optional[Callable[[int], None]] = None) -> Dict[str, Any]:
+        """
+        Import a CSV file with COPY, one staging table per batch, in one transaction
+
+        Import jobs call import_batch with their own checkpoints; this reads
+        the file with the same CSVStreamReader batches.
+
+        Args:
+            file_path: Path to CSV file
+            user_id: User ID for the contacts
+            column_mapping: Mapping of CSV columns to database fields
+            progress_callback: Called with the number of rows imported so far
+
+        Returns:
+            Dictionary with success_count, error_count, duplicate_count and total_processed
+        """
+        self._check_mapping(column_mapping)
+        totals = dict.fromkeys(['success_count', 'error_count', 'duplicate_count', 'total_processed'], 0)
+
+        with transaction.atomic():
+            for batch in CSVStreamReader.iter_batches(file_path, self.chunk_size):
+                for key, value in self.import_batch(batch.df, user_id, column_mapping).items():
+                    totals[key] += value
+                if progress_callback:
+                    progress_callback(totals['total_processed'])
+
+        return totals
+
+    def import_batch(self, df: pd.DataFrame, user_id: str, column_mapping: Dict[str, str]) -> Dict[str, Any]:
+        """
+        COPY one batch of CSV rows into a staging table and merge it
+
+        Must run inside a transaction. Emails from earlier batches are
+        already in contacts, so duplicates are found across the whole file;
+        a caller can commit a checkpoint with each batch.
+
+        Args:
+            df: Batch DataFrame, indexed by 0-based data row number
+            user_id: User ID for the contacts
+            column_mapping: Mapping of CSV columns to database fields
+
+        Returns:
+            Dictionary with success_count, error_count, duplicate_count and total_processed
+        """
+        self._check_mapping(column_mapping)
+        with connection.cursor() as cursor:
+            cursor.execute(self._create_staging_sql())
+
+            buffer, error_count = self._chunk_to_copy_buffer(df, user_id, column_mapping)
+            cursor.copy_expert(self._copy_sql(), buffer)
+
+            error_count += self._mark_invalid_rows(cursor)
+            duplicate_count = self._mark_duplicate_rows(cursor)
+            self._report_staged_errors()
+
+            cursor.execute(self._merge_sql(), self._merge_params())
+            success_count = cursor.rowcount
+
+            # Rows skipped by ON CONFLICT were inserted concurrently by another import
+            cursor.execute(f"SELECT COUNT(*) FROM {self.STAGING_TABLE} WHERE _status IS NULL")
+            duplicate_count += cursor.fetchone()[0] - success_count
+
+            cursor.execute(f"DROP TABLE {self.STAGING_TABLE}")
+
+        return {
+            'success_count': success_count,
+            'error_count': error_count,
+            'duplicate_count': duplicate_count,
+            'total_processed': len(df)
+        }
+
+    def _check_mapping(self, column_mapping: Dict[str, str]):
+        """Reject mappings to fields an import does not write"""
+        unknown = set(column_mapping.values()) - set(self.field_names)
+        if unknown:
+            raise ValueError(f"Unknown contact fields in mapping: {', '.join(sorted(unknown))}")
+
+    def _chunk_to_copy_buffer(self, chunk: pd.DataFrame, user_id: str,
+                              column_mapping: Dict[str, str]) -> Tuple[io.StringIO, int]:
+        """Convert a CSV chunk into a COPY-ready CSV buffer"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        records, invalid, error_count = self.bulk_service._build_batch_records(chunk, user_id, column_mapping)
+        for idx, contact_data in records:
+            if not contact_data.get('email'):
+                error_count += 1
+                self.error_tracker.add_validation_error(
+                    idx + 1, 'email', contact_data.get('email'), 'Email is required'
+                )
+                continue
+            if self.bulk_service._reject_invalid(idx, invalid):
+                error_count += 1
+                continue
+
+            row = [idx + 1]
+            for name in self.field_names:
+                value = contact_data.get(name)
+                row.append(COPY_NULL if value is None else value)
+            writer.writerow(row)
+
+        buffer.seek(0)
+        return buffer, error_count
+
+    def _staging_type(self, field: models.Field) -> str:
+        """Staging column type; text and numeric so bad values can be reported per row"""
+        if isinstance(field, models.IntegerField):
+            return 'numeric'
+        if isinstance(field, models.BooleanField):
+            return 'boolean'
+        return 'text'
+
+    def _create_staging_sql(self) -> str:
+        columns = ', '.join(
+            f'"{field.column}" {self._staging_type(field)}' for field in self.fields
+        )
+        return (
+            f"CREATE TEMP TABLE {self.STAGING_TABLE} ("
+            f"_row_number bigint PRIMARY KEY, _status text, _error_column text, {columns}"
+            f") ON COMMIT DROP"
+        )
+
+    def _copy_sql(self) -> str:
+        columns = ', '.join(f'"{field.column}"' for field in self.fields)
+        return (
+            f"COPY {self.STAGING_TABLE} (_row_number, {columns}) "
+            f"FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')"
+        )
+
+    def _invalid_conditions(self) -> List[Tuple[str, str]]:
+        """(column, SQL condition) pairs for values the contacts table would reject"""
+        conditions = []
+        for field in self.fields:
+            column = f'"{field.column}"'
+            if isinstance(field, models.IntegerField):
+                conditions.append((field.name, f"{column} NOT BETWEEN {INTEGER_MIN} AND {INTEGER_MAX}"))
+            elif isinstance(field, models.CharField) and field.max_length:
+                conditions.append((field.name, f"char_length({column}) > {field.max_length}"))
+        return conditions
+
+    def _mark_invalid_rows(self, cursor) -> int:
+        """Mark rows with values that would fail the insert"""
+        conditions = self._invalid_conditions()
+        cases = ' '.join(f"WHEN {condition} THEN '{name}'" for name, condition in conditions)
+        any_invalid = ' OR '.join(f"({condition})" for _, condition in conditions)
+        cursor.execute(
+            f"UPDATE {self.STAGING_TABLE} SET _status = 'error', _error_column = CASE {cases} END "
+            f"WHERE {any_invalid}"
+        )
+        return cursor.rowcount
+
+    def _mark_duplicate_rows(self, cursor) -> int:
+        """Mark rows whose normalized email exists in contacts or earlier in the file"""
+        contacts_table = Contact._meta.db_table
+        cursor.execute(
+            f"UPDATE {self.STAGING_TABLE} s SET _status = 'duplicate' "
+            f"WHERE s._status IS NULL AND EXISTS "
+            f"(SELECT 1 FROM {contacts_table} c WHERE c.email_key = s.email_key)"
+        )
+        duplicate_count = cursor.rowcount
+        cursor.execute(
+            f"UPDATE {self.STAGING_TABLE} s SET _status = 'duplicate' FROM ("
+            f"SELECT _row_number, row_number() OVER (PARTITION BY email_key ORDER BY _row_number) AS rn "
+            f"FROM {self.STAGING_TABLE} WHERE _status IS NULL"
+            f") d WHERE d._row_number = s._row_number AND d.rn > 1"
+        )
+        return duplicate_count + cursor.rowcount
+
+    def _report_staged_errors(self):
+        """Stream marked rows into the error tracker with a server-side cursor"""
+        messages = {
+            field.name: (
+                'Error: integer out of range' if isinstance(field, models.IntegerField)
+                else f'Error: value too long for type character varying({field.max_length})'
+            )
+            for field in self.fields
+        }
+
+        with connection.connection.cursor(name='contacts_import_staging_errors') as cursor:
+            cursor.itersize = self.chunk_size
+            cursor.execute(
+                f"SELECT _row_number, _status, _error_column, email FROM {self.STAGING_TABLE} "
+                f"WHERE _status IS NOT NULL ORDER BY _row_number"
+            )
+            for row_number, status, error_column, email in cursor:
+                if status == 'duplicate':
+                    self.error_tracker.add_duplicate_error(row_number, email)
+                else:
+                    self.error_tracker.add_error(row_number, error_column, messages[error_column], email)
+
+    def _merge_sql(self) -> str:
+        """INSERT ... SELECT from staging, applying model defaults to missing values"""
+        insert_columns = [f'"{field.column}"' for field in self.fields]
+        select_columns = [f'COALESCE(s."{field.column}", %s)' for field in self.fields]
+        insert_columns += ['"created_at"', '"updated_at"']
+        select_columns += ['now()', 'now()']
+        return (
+            f"INSERT INTO {Contact._meta.db_table} ({', '.join(insert_columns)}) "
+            f"SELECT {', '.join(select_columns)} FROM {self.STAGING_TABLE} s "
+            f"WHERE s._status IS NULL ORDER BY s._row_number "
+            f"ON CONFLICT DO NOTHING"
+        )
+
+    def _merge_params(self) -> List[Any]:
+        return [field.get_default() for field in self.fields]
+
+    def get_error_tracker(self) -> ImportErrorTracker:
+        """Get the error tracker instance"""
+        return self.error_tracker
@@ -1,111 +1,215 @@
 """
 CSV Column Mapper - Map CSV columns to database fields
 Migrated from Stremlit/services/csv_column_mapper.py
+
+Aliases are compiled once at import into an exact-match dict and a
+character trie for containment matches, so mapping a header costs a few
+dictionary lookups per character instead of a scan over every alias.
 """
-from typing import Dict, List
+import difflib
+import hashlib
+from typing import Dict, Iterable, List, Optional, Tuple
 import pandas as pd
 
 
+# Database field -> CSV header aliases; earlier fields and aliases win ties
+FIELD_MAPPINGS = {
+    # Personal Information
+    'first_name': ['first name', 'firstname', 'fname', 'first'],
+    'last_name': ['last name', 'lastname', 'lname', 'last'],
+    'full_name': ['name', 'full name', 'fullname', 'full'],
+    'email': ['email', 'e-mail', 'email address', 'e mail'],
+    'phone': ['phone', 'telephone', 'tel', 'mobile', 'cell', 'work_direct_phone', 
+             'home_phone', 'mobile_phone', 'corporate_phone', 'other_phone'],
+    'title': ['title', 'position', 'job title', 'role', 'designation'],
+    
+    # Company Information
+    'company': ['company', 'organization', 'org', 'company name', 'company_name_for_emails'],
+    'industry': ['industry', 'sector', 'vertical'],
+    'company_size': ['company_size', 'employees', 'employee count', 'size'],
+    'company_address': ['company_address', 'company address', 'corporate address'],
+    'website': ['website', 'url', 'web', 'site', 'company_website'],
+    
+    # Extended Company Fields
+    'employees_count': ['employees', 'employee count', 'size', 'company_size'],
+    'annual_revenue': ['annual_revenue', 'annual revenue', 'revenue', 'sales', 'turnover'],
+    'total_funding': ['total_funding', 'total funding'],
+    'latest_funding_amount': ['latest_funding_amount', 'latest funding amount', 'funding amount'],
+    
+    # Location Fields
+    'city': ['city', 'town'],
+    'state': ['state', 'province', 'region'],
+    'country': ['country', 'nation'],
+    'company_city': ['company_city', 'company city', 'corporate city'],
+    'company_state': ['company_state', 'company state', 'corporate state'],
+    'company_country': ['company_country', 'company country', 'corporate country'],
+    'company_phone': ['company_phone', 'company phone', 'corporate_phone', 'corporate phone'],
+    'postal_code': ['postal_code', 'postal code', 'zip', 'zip code'],
+    
+    # Extended Person Fields
+    'seniority': ['seniority', 'level', 'seniority level'],
+    'departments': ['departments', 'department'],
+    'keywords': ['keywords', 'tags', 'skills', 'key words'],
+    'technologies': ['technologies', 'tech', 'stack', 'technology stack'],
+    'email_status': ['email_status', 'email status', 'email verification'],
+    'stage': ['stage', 'lead stage', 'lead_status'],
+    
+    # Social Media
+    'person_linkedin_url': ['person_linkedin_url', 'person linkedin', 'linkedin url', 
+                           'linkedin_profile', 'personal linkedin'],
+    'company_linkedin_url': ['company_linkedin_url', 'company linkedin', 
+                            'company_linkedin', 'company linkedin url'],
+    'linkedin': ['linkedin', 'linkedin profile', 'linkedin url'],
+    'facebook_url': ['facebook_url', 'facebook url', 'facebook'],
+    'twitter_url': ['twitter_url', 'twitter url', 'twitter', 'twitter_handle'],
+    'facebook': ['facebook', 'fb'],
+    'twitter': ['twitter', 'twitter handle'],
+    
+    # Other Fields
+    'notes': ['notes', 'note', 'description', 'comments'],
+    'tags': ['tags', 'tag', 'categories'],
+    'status': ['status', 'lead status', 'contact status'],
+}
+
+
+# Trie key marking the end of an alias
+_ALIAS_END = ''
+
+
+def _compile_aliases(field_mappings: Dict[str, List[str]]) -> Tuple[Dict[str, Tuple[Tuple[int, int], str]], Dict]:
+    """
+    Build the exact-match and containment indexes for field aliases
+    
+    Each alias keeps the rank (field position, alias position) of its first
+    occurrence, which decides ties the same way as scanning the aliases in order.
+    
+    Returns:
+        Tuple of (alias -> (rank, field), alias trie)
+    """
+    exact: Dict[str, Tuple[Tuple[int, int], str]] = {}
+    for field_rank, (field, aliases) in enumerate(field_mappings.items()):
+        for alias_rank, alias in enumerate(aliases):
+            exact.setdefault(alias, ((field_rank, alias_rank), field))
+    
+    trie: Dict = {}
+    for alias, (rank, field) in exact.items():
+        node = trie
+        for char in alias:
+            node = node.setdefault(char, {})
+        node[_ALIAS_END] = (len(alias), rank, field)
+    
+    return exact, trie
+
+
+ALIAS_INDEX, ALIAS_TRIE = _compile_aliases(FIELD_MAPPINGS)
+
+
 class CSVColumnMapper:
     """Map CSV columns to Django model fields"""
     
+    # Minimum similarity for fuzzy matches of otherwise unmatched headers
+    FUZZY_CUTOFF = 0.8
+    
     def __init__(self):
-        self.field_mappings = {
-            # Personal Information
-            'first_name': ['first name', 'firstname', 'fname', 'first'],
-            'last_name': ['last name', 'lastname', 'lname', 'last'],
-            'full_name': ['name', 'full name', 'fullname', 'full'],
-            'email': ['email', 'e-mail', 'email address', 'e mail'],
-            'phone': ['phone', 'telephone', 'tel', 'mobile', 'cell', 'work_direct_phone', 
-                     'home_phone', 'mobile_phone', 'corporate_phone', 'other_phone'],
-            'title': ['title', 'position', 'job title', 'role', 'designation'],
-            
-            # Company Information
-            'company': ['company', 'organization', 'org', 'company name', 'company_name_for_emails'],
-            'industry': ['industry', 'sector', 'vertical'],
-            'company_size': ['company_size', 'employees', 'employee count', 'size'],
-            'company_address': ['company_address', 'company address', 'corporate address'],
-            'website': ['website', 'url', 'web', 'site', 'company_website'],
-            
-            # Extended Company Fields
-            'employees_count': ['employees', 'employee count', 'size', 'company_size'],
-            'annual_revenue': ['annual_revenue', 'annual revenue', 'revenue', 'sales', 'turnover'],
-            'total_funding': ['total_funding', 'total funding'],
-            'latest_funding_amount': ['latest_funding_amount', 'latest funding amount', 'funding amount'],
-            
-            # Location Fields
-            'city': ['city', 'town'],
-            'state': ['state', 'province', 'region'],
-            'country': ['country', 'nation'],
-            'company_city': ['company_city', 'company city', 'corporate city'],
-            'company_state': ['company_state', 'company state', 'corporate state'],
-            'company_country': ['company_country', 'company country', 'corporate country'],
-            'company_phone': ['company_phone', 'company phone', 'corporate_phone', 'corporate phone'],
-            'postal_code': ['postal_code', 'postal code', 'zip', 'zip code'],
+        # Shared, read-only: the alias indexes are compiled from it once
+        self.field_mappings = FIELD_MAPPINGS
+    
+    @staticmethod
+    def _contained_alias(*texts: str) -> Optional[Tuple[int, Tuple[int, int], str]]:
+        """Longest alias contained in any of the texts, earliest rank first on ties"""
+        best = None
+        for text in texts:
+            for start in range(len(text)):
+                node = ALIAS_TRIE
+                for char in text[start:]:
+                    node = node.get(char)
+                    if node is None:
+                        break
+                    match = node.get(_ALIAS_END)
+                    if match and (best is None or (-match[0], match[1]) < (-best[0], best[1])):
+                        best = match
+        return best
+    
+    def map_column(self, column: str, fuzzy: bool = False) -> Optional[str]:
+        """
+        Map one CSV header to a database field
+        
+        Args:
+            column: CSV header
+            fuzzy: Fall back to the most similar alias for unmatched headers
             
-            # Extended Person Fields
-            'seniority': ['seniority', 'level', 'seniority level'],
-            'departments': ['departments', 'department'],
-            'keywords': ['keywords', 'tags', 'skills', 'key words'],
-            'technologies': ['technologies', 'tech', 'stack', 'technology stack'],
-            'email_status': ['email_status', 'email status', 'email verification'],
-            'stage': ['stage', 'lead stage', 'lead_status'],
+        Returns:
+            Field name, or None if nothing matches
+        """
+        col_lower = column.lower().strip()
+        col_cleaned = col_lower.replace('_', ' ').replace('-', ' ')
+        
+        # Try exact match first
+        if col_lower in self.field_mappings:
+            return col_lower
+        
+        # Exact alias matches beat containment; the earliest field wins
+        exact = [ALIAS_INDEX[text] for text in (col_lower, col_cleaned) if text in ALIAS_INDEX]
+        if exact:
+            return min(exact)[1]
+        
+        # Longest alias contained in the header
+        contained = self._contained_alias(col_lower, col_cleaned)
+        if contained:
+            return contained[2]
+        
+        if fuzzy:
+            return self.fuzzy_match(col_cleaned)
+        return None
+    
+    def fuzzy_match(self, column: str) -> Optional[str]:
+        """Field of the alias most similar to a header, if above FUZZY_CUTOFF"""
+        matches = self.score_column(column, limit=1)
+        return matches[0][0] if matches else None
+    
+    def score_column(self, column: str, limit: int = 3) -> List[Tuple[str, float]]:
+        """
+        Score the fields most similar to a header
+        
+        Args:
+            column: CSV header
+            limit: Maximum number of fields to return
             
-            # Social Media
-            'person_linkedin_url': ['person_linkedin_url', 'person linkedin', 'linkedin url', 
-                                   'linkedin_profile', 'personal linkedin'],
-            'company_linkedin_url': ['company_linkedin_url', 'company linkedin', 
-                                    'company_linkedin', 'company linkedin url'],
-            'linkedin': ['linkedin', 'linkedin profile', 'linkedin url'],
-            'facebook_url': ['facebook_url', 'facebook url', 'facebook'],
-            'twitter_url': ['twitter_url', 'twitter url', 'twitter', 'twitter_handle'],
-            'facebook': ['facebook', 'fb'],
-            'twitter': ['twitter', 'twitter handle'],
+        Returns:
+            List of (field, similarity) tuples, most similar first
+        """
+        text = column.lower().strip().replace('_', ' ').replace('-', ' ')
+        scores: Dict[str, float] = {}
+        for alias in difflib.get_close_matches(text, ALIAS_INDEX.keys(), n=limit * 3, cutoff=self.FUZZY_CUTOFF):
+            field = ALIAS_INDEX[alias][1]
+            score = difflib.SequenceMatcher(None, text, alias).ratio()
+            scores[field] = max(scores.get(field, 0), score)
+        return sorted(scores.items(), key=lambda item: -item[1])[:limit]
+    
+    def auto_map_columns(self, df: pd.DataFrame, fuzzy: bool = False) -> Dict[str, str]:
+        """
+        Auto-map CSV columns to database fields
+        
+        Args:
+            df: DataFrame whose columns are the CSV headers
+            fuzzy: Fall back to the most similar alias for unmatched headers
             
-            # Other Fields
-            'notes': ['notes', 'note', 'description', 'comments'],
-            'tags': ['tags', 'tag', 'categories'],
-            'status': ['status', 'lead status', 'contact status'],
-        }
-    
-    def auto_map_columns(self, df: pd.DataFrame) -> Dict[str, str]:
-        """Auto-map CSV columns to database fields with fuzzy matching"""
+        Returns:
+            Dictionary mapping CSV headers to field names
+        """
         mapping = {}
-        
         for col in df.columns:
-            col_lower = col.lower().strip()
-            col_cleaned = col_lower.replace('_', ' ').replace('-', ' ')
-            
-            # Try exact match first
-            if col_lower in self.field_mappings:
-                mapping[col] = col_lower
-                continue
-            
-            # Try to find matching field with keyword matching
-            best_match = None
-            best_score = 0
-            
-            for field, keywords in self.field_mappings.items():
-                for keyword in keywords:
-                    # Exact match gets highest score
-                    if keyword == col_lower or keyword == col_cleaned:
-                        if col not in mapping:
-                            mapping[col] = field
-                            best_match = field
-                            best_score = 100
-                            break
-                    # Check if keyword is contained in column name
-                    elif keyword in col_lower or keyword in col_cleaned:
-                        score = len(keyword) / len(col_lower)
-                        if score > best_score:
-                            best_match = field
-                            best_score = score
-            
-            if best_match and col not in mapping:
-                mapping[col] = best_match
-        
+            field = self.map_column(col, fuzzy=fuzzy)
+            if field:
+                mapping[col] = field
         return mapping
     
+    @staticmethod
+    def header_signature(columns: Iterable[str]) -> str:
+        """Signature of a CSV header, independent of column order, case and spacing"""
+        normalized = sorted({str(column).lower().strip() for column in columns})
+        return hashlib.sha256('\x1f'.join(normalized).encode('utf-8')).hexdigest()
+    
     def validate_mapping(self, mapping: Dict[str, str]) -> List[str]:
         """Validate column mapping for conflicts"""
         errors = []
@@ -0,0 +1,57 @@
+"""
+CSV Preview Service - Cheap previews of CSV files for the import page
+Parses only the first rows, counts the rest by scanning newline bytes and
+caches the result per file version (path, modification time and size)
+"""
+import hashlib
+import os
+from dataclasses import dataclass
+import pandas as pd
+from django.core.cache import cache
+from services.csv_stream_reader import CSVStreamReader
+from services.file_validator import FileValidator
+
+
+@dataclass
+class CSVPreview:
+    """First rows and row count of a CSV file"""
+    df: pd.DataFrame
+    total_rows: int
+    file_size_mb: float
+
+
+class CSVPreviewService:
+    """Build and cache CSV file previews"""
+    
+    PREVIEW_ROWS = 10
+    CACHE_TIMEOUT = 24 * 60 * 60
+    
+    @staticmethod
+    def cache_key(file_path: str, nrows: int) -> str:
+        """Cache key for a file version; a modified file gets a new key"""
+        stat = os.stat(file_path)
+        path_hash = hashlib.sha1(os.path.abspath(file_path).encode('utf-8')).hexdigest()
+        return f'csv_preview:{path_hash}:{stat.st_mtime_ns}:{stat.st_size}:{nrows}'
+    
+    @staticmethod
+    def get_preview(file_path: str, nrows: int = PREVIEW_ROWS) -> CSVPreview:
+        """
+        Get the preview of a CSV file, from the cache when the file is unchanged
+        
+        Args:
+            file_path: Path to CSV file
+            nrows: Number of rows to parse
+            
+        Returns:
+            CSVPreview with the first rows and the data row count
+        """
+        key = CSVPreviewService.cache_key(file_path, nrows)
+        preview = cache.get(key)
+        if preview is None:
+            preview = CSVPreview(
+                df=pd.read_csv(file_path, nrows=nrows),
+                total_rows=CSVStreamReader.count_rows(file_path),
+                file_size_mb=FileValidator.get_file_size_mb(file_path)
+            )
+            cache.set(key, preview, CSVPreviewService.CACHE_TIMEOUT)
+        return preview
@@ -0,0 +1,192 @@
+"""
+CSV Stream Reader - Bounded-memory batch reading for CSV imports
+Reads CSV files record by record and parses one batch at a time,
+tracking byte offsets so readers can start from any record boundary
+"""
+import io
+import os
+from dataclasses import dataclass
+from typing import Iterator, List, Optional
+import pandas as pd
+
+
+# Cells read as missing values: pandas' default NA tokens, fixed here so
+# every import engine treats the same cells as blank
+NA_VALUES = (
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'
+)
+
+
+@dataclass
+class CSVBatch:
+    """A parsed batch of CSV rows"""
+    df: pd.DataFrame
+    start_row: int  # 0-based data row number of the first row in the batch
+    end_offset: int  # Byte offset just past the last record in the batch
+
+
+@dataclass
+class CSVPartition:
+    """A byte range of a CSV file that starts and ends on record boundaries"""
+    start_offset: int
+    end_offset: int
+    start_row: int  # 0-based data row number of the first record
+    row_count: int
+
+
+class CSVStreamReader:
+    """Read CSV files in batches without loading the whole file"""
+
+    READ_BLOCK_SIZE = 1024 * 1024  # 1MB
+
+    @staticmethod
+    def count_rows(file_path: str) -> int:
+        """
+        Count data rows by scanning newline bytes
+
+        This is an estimate when quoted fields contain line breaks or the
+        file has blank lines, but it never parses the file.
+
+        Args:
+            file_path: Path to CSV file
+
+        Returns:
+            Number of lines after the header
+        """
+        line_count = 0
+        last_byte = b''
+        with open(file_path, 'rb') as f:
+            while True:
+                block = f.read(CSVStreamReader.READ_BLOCK_SIZE)
+                if not block:
+                    break
+                line_count += block.count(b'\n')
+                last_byte = block[-1:]
+
+        # Count a final line without a trailing newline
+        if last_byte and last_byte != b'\n':
+            line_count += 1
+
+        return max(0, line_count - 1)
+
+    @staticmethod
+    def parse(data: bytes) -> pd.DataFrame:
+        """
+        Parse CSV bytes with every column as text
+
+        Types are never inferred per batch, so a value reads the same
+        wherever batch boundaries fall; TypeConverter does all conversion.
+        Only cells that exactly match NA_VALUES become missing values.
+        """
+        return pd.read_csv(io.BytesIO(data), dtype=str, keep_default_na=False, na_values=list(NA_VALUES))
+
+    @staticmethod
+    def read_header(f) -> bytes:
+        """Read the header record from the start of an open binary file"""
+        f.seek(0)
+        return CSVStreamReader._read_record(f)
+
+    @staticmethod
+    def _read_record(f) -> bytes:
+        """Read one CSV record, following quoted fields across line breaks"""
+        record = f.readline()
+        in_quotes = record.count(b'"') % 2 == 1
+        while in_quotes:
+            line = f.readline()
+            if not line:
+                break
+            record += line
+            if line.count(b'"') % 2 == 1:
+                in_quotes = False
+        return record
+
+    @staticmethod
+    def iter_batches(file_path: str, batch_size: int,
+                     start_offset: Optional[int] = None,
+                     end_offset: Optional[int] = None,
+                     start_row: int = 0) -> Iterator[CSVBatch]:
+        """
+        Yield parsed batches of at most batch_size rows
+
+        Args:
+            file_path: Path to CSV file
+            batch_size: Maximum number of records per batch
+            start_offset: Byte offset of a record boundary to start from
+                (default: first record after the header)
+            end_offset: Stop before records starting at or after this offset
+            start_row: Data row number of the record at start_offset
+
+        Yields:
+            CSVBatch objects; DataFrame indexes are global 0-based row numbers
+        """
+        with open(file_path, 'rb') as f:
+            header = CSVStreamReader.read_header(f)
+            if start_offset is not None and start_offset > f.tell():
+                f.seek(start_offset)
+
+            row_number = start_row
+            records: List[bytes] = []
+            while True:
+                position = f.tell()
+                record = b''
+                if end_offset is None or position < end_offset:
+                    record = CSVStreamReader._read_record(f)
+
+                if record:
+                    records.append(record)
+
+                if records and (not record or len(records) >= batch_size):
+                    df = CSVStreamReader.parse(header + b''.join(records))
+                    df.index = pd.RangeIndex(row_number, row_number + len(df))
+                    yield CSVBatch(df=df, start_row=row_number, end_offset=f.tell())
+                    row_number += len(df)
+                    records = []
+
+                if not record:
+                    break
+
+    @staticmethod
+    def plan_partitions(file_path: str, partitions: int) -> List[CSVPartition]:
+        """
+        Split a CSV file into byte ranges aligned to record boundaries
+        
+        Records are scanned once (without parsing fields) so that quoted
+        line breaks never split a record and each partition knows the row
+        number it starts at.
+        
+        Args:
+            file_path: Path to CSV file
+            partitions: Maximum number of partitions
+            
+        Returns:
+            List of CSVPartition objects covering every data record
+        """
+        file_size = os.path.getsize(file_path)
+        result: List[CSVPartition] = []
+        
+        with open(file_path, 'rb') as f:
+            CSVStreamReader.read_header(f)
+            data_start = f.tell()
+            target_size = max(1, (file_size - data_start) // max(1, partitions))
+            
+            start_offset = data_start
+            start_row = row = 0
+            next_boundary = data_start + target_size
+            while True:
+                record = CSVStreamReader._read_record(f)
+                if not record:
+                    break
+                # Blank lines are skipped by the parser, so they are not rows
+                if record.strip():
+                    row += 1
+                position = f.tell()
+                if position >= next_boundary and len(result) < partitions - 1:
+                    result.append(CSVPartition(start_offset, position, start_row, row - start_row))
+                    start_offset, start_row = position, row
+                    next_boundary = position + target_size
+            
+            if row > start_row:
+                result.append(CSVPartition(start_offset, f.tell(), start_row, row - start_row))
+        
+        return result
@@ -0,0 +1,151 @@
+"""
+File Download Service - Send files without reading them into memory
+Streams files in blocks with FileResponse (sendfile where the WSGI server
+supports it), answers single HTTP Range requests with 206 Partial Content
+so interrupted downloads can resume, and can hand downloads to the front
+proxy with X-Accel-Redirect or X-Sendfile
+"""
+import os
+import re
+from typing import Optional, Tuple
+from urllib.parse import quote
+from django.conf import settings
+from django.http import FileResponse, HttpRequest, HttpResponse
+from django.utils.http import content_disposition_header
+
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class _RangeFile:
+    """Read at most `length` bytes of an open file, starting at `start`"""
+
+    def __init__(self, f, start: int, length: int):
+        self.f = f
+        self.remaining = length
+        f.seek(start)
+
+    def read(self, size: int = -1) -> bytes:
+        if self.remaining <= 0:
+            return b''
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.f.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.f.close()
+
+
+class FileDownloadService:
+    """Build download responses for files on disk"""
+
+    @staticmethod
+    def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+        """
+        Parse a single-range Range header
+
+        Args:
+            header: Range header value
+            size: File size in bytes
+
+        Returns:
+            (start, end) inclusive byte positions, None to send the whole file
+            (no header, or a form this service does not handle such as
+            multiple ranges)
+
+        Raises:
+            ValueError: If the range cannot be satisfied
+        """
+        match = RANGE_RE.match(header.strip()) if header else None
+        if not match or match.groups() == ('', ''):
+            return None
+
+        first, last = match.groups()
+        if not first:
+            # Suffix range: the last N bytes
+            length = int(last)
+            if length == 0 or size == 0:
+                raise ValueError("Range not satisfiable")
+            return max(0, size - length), size - 1
+
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+        if start >= size or start > end:
+            raise ValueError("Range not satisfiable")
+        return start, end
+
+    @staticmethod
+    def offload_response(file_path: str, filename: str, mode: str) -> Optional[HttpResponse]:
+        """
+        Empty response telling the front proxy to send the file
+
+        Args:
+            file_path: Path to the file
+            filename: Download file name
+            mode: 'x-accel-redirect' or 'x-sendfile'
+
+        Returns:
+            HttpResponse, or None if the file cannot be offloaded
+            (X-Accel-Redirect only serves files under MEDIA_ROOT)
+        """
+        real_path = os.path.realpath(file_path)
+        response = HttpResponse(content_type='application/octet-stream')
+        if mode == 'x-sendfile':
+            response['X-Sendfile'] = real_path
+        elif mode == 'x-accel-redirect':
+            media_root = os.path.realpath(settings.MEDIA_ROOT)
+            if os.path.commonpath([media_root, real_path]) != media_root:
+                return None
+            relative = os.path.relpath(real_path, media_root).replace(os.sep, '/')
+            response['X-Accel-Redirect'] = settings.PROTECTED_MEDIA_URL.rstrip('/') + '/' + quote(relative)
+        else:
+            raise ValueError(f"Unknown download mode: {mode}")
+
+        # The proxy fills in the body, length and type and handles Range itself
+        del response['Content-Type']
+        response['Content-Disposition'] = content_disposition_header(True, filename)
+        return response
+
+    @staticmethod
+    def file_response(request: HttpRequest, file_path: str, filename: str) -> HttpResponse:
+        """
+        Download response for a file, honoring Range and the configured offload mode
+
+        Args:
+            request: Incoming request
+            file_path: Path to the file
+            filename: Download file name
+
+        Returns:
+            200 FileResponse, 206 for a satisfiable range, 416 for an
+            unsatisfiable one, or an offload response
+        """
+        mode = settings.EXPORT_DOWNLOAD_MODE
+        if mode:
+            response = FileDownloadService.offload_response(file_path, filename, mode)
+            if response is not None:
+                return response
+
+        size = os.path.getsize(file_path)
+        try:
+            byte_range = FileDownloadService.parse_range(request.headers.get('Range'), size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+
+        f = open(file_path, 'rb')
+        if byte_range is None:
+            response = FileResponse(f, as_attachment=True, filename=filename)
+        else:
+            start, end = byte_range
+            length = end - start + 1
+            response = FileResponse(
+                _RangeFile(f, start, length), as_attachment=True, filename=filename, status=206
+            )
+            response['Content-Length'] = str(length)
+            response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Accept-Ranges'] = 'bytes'
+        return response
@@ -107,3 +107,35 @@ class FileValidator:
         file_size_mb = FileValidator.get_file_size_mb(file_path)
         return file_size_mb > threshold_mb
 
+    
+    @staticmethod
+    def should_use_copy(file_path: str, threshold_mb: float = None) -> bool:
+        """
+        Determine if the PostgreSQL COPY import engine should be used
+        
+        Args:
+            file_path: Path to the file
+            threshold_mb: Size threshold in MB (default: settings.COPY_IMPORT_THRESHOLD_MB)
+            
+        Returns:
+            True if file size exceeds threshold
+        """
+        if threshold_mb is None:
+            threshold_mb = settings.COPY_IMPORT_THRESHOLD_MB
+        return FileValidator.get_file_size_mb(file_path) > threshold_mb
+
+    @staticmethod
+    def should_partition(file_path: str, threshold_mb: float = None) -> bool:
+        """
+        Determine if an import should be split across parallel workers
+        
+        Args:
+            file_path: Path to the file
+            threshold_mb: Size threshold in MB (default: settings.PARTITIONED_IMPORT_THRESHOLD_MB)
+            
+        Returns:
+            True if file size exceeds threshold
+        """
+        if threshold_mb is None:
+            threshold_mb = settings.PARTITIONED_IMPORT_THRESHOLD_MB
+        return FileValidator.get_file_size_mb(file_path) > threshold_mb
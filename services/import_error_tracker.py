@@ -1,15 +1,34 @@
 """
 Import Error Tracker - Track errors during CSV import
 Migrated from Stremlit/services/import_error_tracker.py
+
+Errors are appended to a gzip-compressed JSON Lines file as they occur.
+In memory the tracker keeps counters, a bounded sample and compact
+columns (row number and type code) indexed by type and row, so summaries
+are constant-time and drill-downs only decompress the blocks they need.
 """
-from typing import List, Dict, Any
-from datetime import datetime
+import bisect
+import contextlib
+import glob
+import gzip
+import io
 import json
+import os
+import shutil
+import tempfile
+import weakref
+from array import array
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import numpy as np
+from django.conf import settings
 
 
 class ImportError:
     """Represents a single import error"""
     
+    __slots__ = ('row_number', 'column', 'error_message', 'original_data', 'timestamp')
+    
     def __init__(self, row_number: int, column: str, error_message: str, original_data: str):
         self.row_number = row_number
         self.column = column
@@ -29,27 +48,155 @@ class ImportError:
     
     def to_json(self) -> str:
         """Convert error to JSON string"""
-        return json.dumps(self.to_dict())
+        return json.dumps(self.to_dict(), default=str)
+    
+    @classmethod
+    def from_dict(cls, error_data: Dict) -> 'ImportError':
+        """Rebuild an error from to_dict() output"""
+        error = cls(
+            error_data['row_number'],
+            error_data['column'],
+            error_data['error_message'],
+            error_data['original_data']
+        )
+        error.timestamp = datetime.fromisoformat(error_data['timestamp'])
+        return error
     
     def __str__(self):
         return f"Row {self.row_number}, Column '{self.column}': {self.error_message}"
 
 
+class _LimitedReader(io.RawIOBase):
+    """Read at most `limit` bytes of a binary file"""
+    
+    def __init__(self, f, limit: int):
+        self.f = f
+        self.remaining = limit
+    
+    def readable(self) -> bool:
+        return True
+    
+    def readinto(self, buffer) -> int:
+        size = min(len(buffer), self.remaining)
+        if size <= 0:
+            return 0
+        data = self.f.read(size)
+        buffer[:len(data)] = data
+        self.remaining -= len(data)
+        return len(data)
+
+
 class ImportErrorTracker:
     """Track and categorize errors during CSV import"""
     
-    def __init__(self):
-        self.errors: List[ImportError] = []
+    # Errors kept in memory and included in to_json()
+    SAMPLE_SIZE = 100
+    
+    # Buffered errors are compressed and appended to the file in blocks of this size
+    FLUSH_SIZE = 1000
+    
+    # Longer original data (e.g. a whole row) is truncated
+    MAX_ORIGINAL_DATA_LENGTH = 1000
+    
+    # Index file record: row number and error type code of one error
+    INDEX_DTYPE = np.dtype([('row', '<i8'), ('type', '<u2')])
+    
+    def __init__(self, spill_path: Optional[str] = None):
+        """
+        Initialize error tracker
+        
+        Args:
+            spill_path: Error log file (default: a temporary file created on first
+                flush and deleted by close() or when the tracker is garbage collected)
+        """
+        self.spill_path = spill_path
+        self._remove_spill = None
+        self.errors: List[ImportError] = []  # Bounded sample of the first errors
         self.error_summary: Dict[str, int] = {}
+        # Bytes of the file that belong to this tracker; anything after them is
+        # left over from a rolled-back batch or an earlier run and is overwritten
+        self._spill_size = 0
+        self._pending: List[str] = []
+        # Columns of every error, by position in the log
+        self._rows = array('q')
+        self._codes = array('H')
+        self._type_names: List[str] = []
+        self._type_codes: Dict[str, int] = {}
+        # Secondary indexes: error positions by type code, and positions sorted by row
+        self._type_index: Dict[int, array] = {}
+        self._row_order = None
+        # (byte offset, first position) of each gzip member in the log
+        self._blocks: List[Tuple[int, int]] = []
+    
+    @property
+    def error_count(self) -> int:
+        return len(self._rows)
+    
+    @property
+    def index_path(self) -> str:
+        return f'{self.spill_path}.idx'
+    
+    @staticmethod
+    def job_log_path(job_id: int, part: Optional[int] = None) -> str:
+        """Error log path of an import job, or of one partition of it"""
+        suffix = f'.part{part}' if part is not None else ''
+        return os.path.join(str(settings.IMPORT_ERROR_DIR), f'job_{job_id}{suffix}.jsonl.gz')
+    
+    @classmethod
+    def for_job(cls, job_id: int, part: Optional[int] = None) -> 'ImportErrorTracker':
+        """Tracker writing to an import job's error log file"""
+        return cls(spill_path=cls.job_log_path(job_id, part))
+    
+    @classmethod
+    def from_json(cls, errors_json: str) -> 'ImportErrorTracker':
+        """Tracker for reading the error log described by a to_json() payload"""
+        data = json.loads(errors_json) if errors_json else {}
+        tracker = cls(spill_path=data.get('error_file'))
+        tracker.load_json(errors_json)
+        return tracker
     
     def add_error(self, row_number: int, column: str, error_message: str, original_data: str):
         """Add an error to the tracker"""
+        if isinstance(original_data, str) and len(original_data) > self.MAX_ORIGINAL_DATA_LENGTH:
+            original_data = original_data[:self.MAX_ORIGINAL_DATA_LENGTH] + '...'
         error = ImportError(row_number, column, error_message, original_data)
-        self.errors.append(error)
+        self._record(error)
+    
+    def _type_code(self, error_type: str) -> int:
+        code = self._type_codes.get(error_type)
+        if code is None:
+            code = self._type_codes[error_type] = len(self._type_names)
+            self._type_names.append(error_type)
+            self._type_index[code] = array('q')
+        return code
+    
+    def _record(self, error: ImportError):
+        if len(self.errors) < self.SAMPLE_SIZE:
+            self.errors.append(error)
         
         # Update error summary
-        error_type = error_message.split(':')[0] if ':' in error_message else error_message
+        error_type = error.error_message.split(':')[0] if ':' in error.error_message else error.error_message
         self.error_summary[error_type] = self.error_summary.get(error_type, 0) + 1
+        
+        code = self._type_code(error_type)
+        self._type_index[code].append(len(self._rows))
+        self._rows.append(error.row_number)
+        self._codes.append(code)
+        self._row_order = None
+        
+        self._pending.append(error.to_json())
+        if len(self._pending) >= self.FLUSH_SIZE:
+            self.flush()
+    
+    def _append_index(self, rows: np.ndarray, codes: np.ndarray):
+        """Add index columns for errors appended to the log (e.g. from a merged log)"""
+        start = len(self._rows)
+        self._rows.frombytes(rows.astype('<i8').tobytes())
+        self._codes.frombytes(codes.astype('<u2').tobytes())
+        for code in np.unique(codes):
+            positions = np.flatnonzero(codes == code) + start
+            self._type_index[int(code)].frombytes(positions.astype('<i8').tobytes())
+        self._row_order = None
     
     def add_duplicate_error(self, row_number: int, email: str):
         """Add a duplicate email error"""
@@ -69,45 +216,286 @@ class ImportErrorTracker:
             str(value)
         )
     
+    def _open_for_append(self, path: str, size: int):
+        """Open a log or index file positioned at the end of this tracker's data"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        f = open(path, 'r+b' if os.path.exists(path) else 'wb')
+        f.truncate(size)
+        f.seek(size)
+        return f
+    
+    def _written_count(self) -> int:
+        """Number of errors in the log file"""
+        return self.error_count - len(self._pending)
+    
+    def _ensure_spill_path(self):
+        if self.spill_path is None:
+            fd, self.spill_path = tempfile.mkstemp(prefix='import_errors_', suffix='.jsonl.gz')
+            os.close(fd)
+            self._remove_spill = weakref.finalize(self, self._remove_files, self.spill_path)
+    
+    @staticmethod
+    def _remove_files(spill_path: str) -> int:
+        """Remove an error log and its index file; returns the number of files removed"""
+        removed = 0
+        for path in (spill_path, f'{spill_path}.idx'):
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+                removed += 1
+        return removed
+    
+    def close(self):
+        """Delete the temporary error log, if this tracker created one"""
+        if self._remove_spill is not None:
+            self._remove_spill()
+    
+    def _write_block(self, block: bytes, rows: np.ndarray, codes: np.ndarray):
+        """Append one gzip member and its index records"""
+        self._ensure_spill_path()
+        written = self._written_count()
+        records = np.empty(len(rows), dtype=self.INDEX_DTYPE)
+        records['row'] = rows
+        records['type'] = codes
+        with self._open_for_append(self.index_path, written * self.INDEX_DTYPE.itemsize) as f:
+            f.write(records.tobytes())
+        with self._open_for_append(self.spill_path, self._spill_size) as f:
+            self._blocks.append((self._spill_size, written))
+            f.write(block)
+            self._spill_size = f.tell()
+    
+    def flush(self):
+        """Append buffered errors to the error log as one gzip member"""
+        if not self._pending:
+            return
+        data = ('\n'.join(self._pending) + '\n').encode('utf-8')
+        start = self._written_count()
+        self._write_block(
+            gzip.compress(data),
+            np.frombuffer(self._rows, dtype='<i8')[start:],
+            np.frombuffer(self._codes, dtype='<u2')[start:]
+        )
+        self._pending = []
+    
+    def _read_block(self, f, index: int) -> List[str]:
+        """Decompress one gzip member of the log into JSON lines"""
+        offset = self._blocks[index][0]
+        end = self._blocks[index + 1][0] if index + 1 < len(self._blocks) else self._spill_size
+        f.seek(offset)
+        return gzip.decompress(f.read(end - offset)).decode('utf-8').splitlines()
+    
+    def _get_positions(self, positions) -> List[ImportError]:
+        """
+        Read errors by position, decompressing only the blocks that hold them
+        
+        Args:
+            positions: Ascending error positions
+        """
+        errors = []
+        written = self._written_count()
+        block_starts = [start for _, start in self._blocks]
+        block_index, lines = None, []
+        with contextlib.ExitStack() as stack:
+            f = None
+            for position in positions:
+                if position >= written:
+                    line = self._pending[position - written]
+                else:
+                    index = bisect.bisect_right(block_starts, position) - 1
+                    if index != block_index:
+                        if f is None:
+                            f = stack.enter_context(open(self.spill_path, 'rb'))
+                        block_index, lines = index, self._read_block(f, index)
+                    line = lines[position - block_starts[index]]
+                errors.append(ImportError.from_dict(json.loads(line)))
+        return errors
+    
+    def iter_errors(self) -> Iterator[ImportError]:
+        """Yield every error in the order it was added, streaming from the log file"""
+        if self._spill_size:
+            with open(self.spill_path, 'rb') as f:
+                raw = io.BufferedReader(_LimitedReader(f, self._spill_size))
+                with gzip.open(raw, 'rt', encoding='utf-8') as lines:
+                    for line in lines:
+                        yield ImportError.from_dict(json.loads(line))
+        for line in self._pending:
+            yield ImportError.from_dict(json.loads(line))
+    
+    def get_errors_page(self, offset: int = 0, limit: int = 100) -> List[ImportError]:
+        """
+        Get a page of errors without loading the whole log
+        
+        Args:
+            offset: Number of errors to skip
+            limit: Maximum number of errors to return
+            
+        Returns:
+            List of ImportError objects
+        """
+        return self._get_positions(range(max(0, offset), min(offset + limit, self.error_count)))
+    
     def get_errors(self) -> List[ImportError]:
-        """Get all errors"""
-        return self.errors
+        """Get all errors (loads the whole log; prefer iter_errors or get_errors_page)"""
+        return list(self.iter_errors())
     
     def get_error_count(self) -> int:
         """Get total error count"""
-        return len(self.errors)
+        return self.error_count
     
     def get_error_summary(self) -> Dict[str, int]:
         """Get error summary by type"""
         return self.error_summary
     
+    def _type_positions(self, error_type: str) -> np.ndarray:
+        """Ascending positions of errors whose type contains error_type"""
+        indexes = [
+            np.frombuffer(self._type_index[code], dtype='<i8')
+            for code, name in enumerate(self._type_names) if error_type in name
+        ]
+        if not indexes:
+            return np.empty(0, dtype='<i8')
+        return indexes[0] if len(indexes) == 1 else np.sort(np.concatenate(indexes))
+    
+    def get_type_count(self, error_type: str) -> int:
+        """Get count of errors whose type contains error_type"""
+        return sum(count for name, count in self.error_summary.items() if error_type in name)
+    
     def get_errors_by_type(self, error_type: str) -> List[ImportError]:
-        """Get errors of specific type"""
-        return [e for e in self.errors if error_type in e.error_message]
+        """Get errors whose message contains error_type (scans the whole log)"""
+        return [e for e in self.iter_errors() if error_type in e.error_message]
+    
+    def get_errors_of_type(self, error_type: str, offset: int = 0,
+                           limit: Optional[int] = None) -> List[ImportError]:
+        """
+        Get errors of one summary type from the type index
+        
+        Unlike get_errors_by_type, only the error type (the message up to
+        the first ':', as in get_error_summary) is matched, so only the
+        blocks holding matching errors are decompressed.
+        
+        Args:
+            error_type: Error type, or part of one (e.g. 'Duplicate')
+            offset: Number of matching errors to skip
+            limit: Maximum number of errors to return (default: all)
+        """
+        positions = self._type_positions(error_type)
+        end = None if limit is None else offset + limit
+        return self._get_positions(positions[offset:end].tolist())
     
     def get_row_errors(self, row_number: int) -> List[ImportError]:
-        """Get errors for specific row"""
-        return [e for e in self.errors if e.row_number == row_number]
+        """Get errors for specific row from the row index"""
+        if self._row_order is None:
+            self._row_order = np.argsort(np.frombuffer(self._rows, dtype='<i8'), kind='stable')
+        rows = np.frombuffer(self._rows, dtype='<i8')[self._row_order]
+        start, end = np.searchsorted(rows, [row_number, row_number + 1])
+        return self._get_positions(np.sort(self._row_order[start:end]).tolist())
     
     def clear(self):
         """Clear all errors"""
-        self.errors = []
-        self.error_summary = {}
+        remove_spill = self._remove_spill
+        self.__init__(self.spill_path)
+        self._remove_spill = remove_spill
     
     def to_json(self) -> str:
-        """Export errors as JSON"""
-        errors_dict = [error.to_dict() for error in self.errors]
+        """Export the summary, the error sample and the error log location as JSON"""
+        self.flush()
         return json.dumps({
-            'errors': errors_dict,
+            'errors': [error.to_dict() for error in self.errors],
             'summary': self.error_summary,
-            'total_count': len(self.errors)
+            'total_count': self.error_count,
+            'error_file': self.spill_path,
+            'error_file_size': self._spill_size,
+            'error_types': self._type_names,
+            'blocks': self._blocks
         }, default=str)
     
+    @classmethod
+    def _read_index(cls, index_path: str, count: int) -> np.ndarray:
+        return np.fromfile(index_path, dtype=cls.INDEX_DTYPE, count=count)
+    
+    def load_json(self, errors_json: str):
+        """
+        Append errors from a to_json() payload, e.g. from another worker
+        
+        A payload for this tracker's own log file restores the tracker to
+        that point, e.g. when an import resumes from a checkpoint.
+        """
+        data = json.loads(errors_json) if errors_json else {}
+        error_file = data.get('error_file')
+        
+        if error_file is None:
+            # Payload without a log file: every error is inline
+            for error_data in data.get('errors', []):
+                self._record(ImportError.from_dict(error_data))
+            return
+        
+        for error_data in data['errors'][:self.SAMPLE_SIZE - len(self.errors)]:
+            self.errors.append(ImportError.from_dict(error_data))
+        for error_type, count in data['summary'].items():
+            self.error_summary[error_type] = self.error_summary.get(error_type, 0) + count
+        
+        records = np.empty(0, dtype=self.INDEX_DTYPE)
+        if data['total_count']:
+            records = self._read_index(f'{error_file}.idx', data['total_count'])
+        type_codes = np.array([self._type_code(name) for name in data['error_types']], dtype='<u2')
+        codes = type_codes[records['type']] if len(records) else records['type']
+        
+        if error_file == self.spill_path:
+            self._append_index(records['row'], codes)
+            self._blocks = [tuple(block) for block in data['blocks']]
+            self._spill_size = data['error_file_size']
+            return
+        
+        # A log without errors was never written
+        if not data['total_count']:
+            return
+        
+        # Copy the other log's gzip members after this one's
+        self.flush()
+        self._ensure_spill_path()
+        written, spill_size = self.error_count, self._spill_size
+        self._append_index(records['row'], codes)
+        with self._open_for_append(self.index_path, written * self.INDEX_DTYPE.itemsize) as f:
+            index_records = np.empty(len(records), dtype=self.INDEX_DTYPE)
+            index_records['row'] = records['row']
+            index_records['type'] = codes
+            f.write(index_records.tobytes())
+        with self._open_for_append(self.spill_path, spill_size) as f, open(error_file, 'rb') as source:
+            shutil.copyfileobj(_LimitedReader(source, data['error_file_size']), f)
+            self._spill_size = f.tell()
+        self._blocks.extend((spill_size + offset, written + start) for offset, start in data['blocks'])
+    
+    @staticmethod
+    def delete_log(errors_json: str):
+        """Remove the error log and index files described by a to_json() payload"""
+        data = json.loads(errors_json) if errors_json else {}
+        if data.get('error_file'):
+            ImportErrorTracker._remove_files(data['error_file'])
+    
+    @staticmethod
+    def delete_job_logs(job_id: int) -> int:
+        """
+        Remove an import job's error log and its partitions' logs
+        
+        Returns:
+            Number of files removed
+        """
+        paths = [ImportErrorTracker.job_log_path(job_id)]
+        paths += glob.glob(os.path.join(glob.escape(str(settings.IMPORT_ERROR_DIR)), f'job_{job_id}.part*.jsonl.gz'))
+        return sum(ImportErrorTracker._remove_files(path) for path in paths)
+    
+    @staticmethod
+    def detach_log(errors_json: str) -> str:
+        """to_json() payload without its log file; only the error sample and summary remain"""
+        data = json.loads(errors_json) if errors_json else {}
+        if not data.get('error_file'):
+            return errors_json
+        data['error_file'] = None
+        return json.dumps(data, default=str)
+    
     def get_duplicate_count(self) -> int:
         """Get count of duplicate errors"""
-        return len(self.get_errors_by_type('Duplicate'))
+        return self.get_type_count('Duplicate')
     
     def get_validation_error_count(self) -> int:
         """Get count of validation errors"""
-        return len(self.get_errors_by_type('Validation'))
-
+        return self.get_type_count('Validation')
@@ -0,0 +1,148 @@
+"""
+Import Progress Publisher - Coalesced progress updates for import jobs
+Writes only changed job fields after each batch, publishes speed, ETA and
+WebSocket messages at a fixed cadence, and reads the cancellation flag
+from the cache instead of re-reading the job row
+"""
+import time
+from datetime import timedelta
+from typing import Any, Dict, Optional
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.core.cache import cache
+from django.utils import timezone
+from apps.imports.models import ImportJob
+from services.import_error_tracker import ImportErrorTracker
+
+
+class ImportProgressPublisher:
+    """Throttle progress writes and messages for one running import"""
+
+    # Minimum seconds between published updates
+    CADENCE_SECONDS = 0.5
+
+    # Seconds between database checks for cancellation, for caches that
+    # are not shared between processes (e.g. the dummy cache in development)
+    CANCEL_DB_CHECK_SECONDS = 5.0
+
+    CANCEL_KEY_TIMEOUT = 24 * 60 * 60
+
+    # Fields written with every committed batch
+    CHECKPOINT_FIELDS = [
+        'processed_rows', 'success_count', 'error_count', 'duplicate_count',
+        'updated_count', 'current_batch', 'checkpoint_row', 'checkpoint_offset'
+    ]
+
+    # Fields written at the publishing cadence
+    PROGRESS_FIELDS = ['processing_speed', 'estimated_completion']
+
+    def __init__(self, job: ImportJob, channel_layer=None, cadence: Optional[float] = None):
+        """
+        Initialize progress publisher
+
+        Args:
+            job: ImportJob being processed
+            channel_layer: Channel layer for WebSocket updates (default: configured layer)
+            cadence: Minimum seconds between published updates
+        """
+        self.job = job
+        self.channel_layer = channel_layer or get_channel_layer()
+        self.cadence = self.CADENCE_SECONDS if cadence is None else cadence
+        self.start_time = timezone.now()
+        self.start_rows = job.processed_rows
+        self._last_publish = None
+        self._last_cancel_check = time.monotonic()
+        self._saved_error_count = None
+
+    @staticmethod
+    def cancel_key(job_id: int) -> str:
+        return f'import_job_cancelled:{job_id}'
+
+    @staticmethod
+    def request_cancel(job_id: int):
+        """Flag a job as cancelled for its running task"""
+        cache.set(ImportProgressPublisher.cancel_key(job_id), True, ImportProgressPublisher.CANCEL_KEY_TIMEOUT)
+
+    def is_cancelled(self) -> bool:
+        """Check the cancellation flag, falling back to the database at a slow cadence"""
+        if cache.get(self.cancel_key(self.job.id)):
+            return True
+
+        now = time.monotonic()
+        if now - self._last_cancel_check < self.CANCEL_DB_CHECK_SECONDS:
+            return False
+        self._last_cancel_check = now
+        return ImportJob.objects.filter(id=self.job.id, status='CANCELLED').exists()
+
+    def is_due(self) -> bool:
+        """Whether an update is due; starts a new interval when it is"""
+        now = time.monotonic()
+        if self._last_publish is not None and now - self._last_publish < self.cadence:
+            return False
+        self._last_publish = now
+        return True
+
+    def save_checkpoint(self, error_tracker: ImportErrorTracker):
+        """
+        Write counters and the checkpoint; call inside the batch's transaction
+
+        The error log is only serialized when the batch added errors, and it
+        commits with the checkpoint so a resumed task keeps every error.
+
+        Args:
+            error_tracker: Error tracker of the running import
+        """
+        fields = list(self.CHECKPOINT_FIELDS)
+        error_count = error_tracker.get_error_count()
+        if error_count != self._saved_error_count:
+            self.job.error_log = error_tracker.to_json()
+            fields.append('error_log')
+        self.job.save(update_fields=fields)
+        self._saved_error_count = error_count
+
+    def maybe_publish(self) -> bool:
+        """Publish progress if the cadence interval has passed"""
+        if not self.is_due():
+            return False
+        self.publish()
+        return True
+
+    def publish(self):
+        """Write speed and ETA, then send a WebSocket update"""
+        job = self.job
+        elapsed = (timezone.now() - self.start_time).total_seconds()
+        if elapsed > 0:
+            job.processing_speed = (job.processed_rows - self.start_rows) / elapsed
+            if job.processing_speed > 0 and job.total_rows > job.processed_rows:
+                eta_seconds = (job.total_rows - job.processed_rows) / job.processing_speed
+                job.estimated_completion = timezone.now() + timedelta(seconds=eta_seconds)
+
+        job.save(update_fields=self.PROGRESS_FIELDS)
+
+        self.send({
+            'job_id': job.id,
+            'status': job.status,
+            'processed_rows': job.processed_rows,
+            'total_rows': job.total_rows,
+            'success_count': job.success_count,
+            'error_count': job.error_count,
+            'duplicate_count': job.duplicate_count,
+            'updated_count': job.updated_count,
+            'progress': job.get_progress_percentage(),
+            'processing_speed': job.processing_speed,
+            'current_batch': job.current_batch,
+            'total_batches': job.total_batches,
+            'estimated_completion': job.estimated_completion.isoformat() if job.estimated_completion else None,
+            'last_updated': timezone.now().isoformat()
+        })
+
+    def send(self, data: Dict[str, Any]):
+        """Send a progress update to the import's WebSocket group"""
+        if self.channel_layer:
+            async_to_sync(self.channel_layer.group_send)(
+                f'import_{self.job.id}',
+                {
+                    'type': 'import_progress',
+                    'data': data
+                }
+            )
@@ -0,0 +1,179 @@
+"""
+Keyset Paginator - Constant-time pagination for large contact lists
+Pages through contacts by (created_at, id) cursors instead of OFFSET, so
+deep pages cost the same as the first one, and counts rows from the
+PostgreSQL planner estimate or a short-lived cached COUNT(*)
+"""
+import base64
+import hashlib
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connection
+from django.db.models import Q, QuerySet
+from django.utils.functional import cached_property
+
+
+class CountEstimator:
+    """Approximate row counts without scanning large tables on every request"""
+
+    # Planner estimates below this are replaced by an exact (cached) count
+    EXACT_COUNT_BELOW = 100000
+    CACHE_TIMEOUT = 60
+
+    @staticmethod
+    def table_estimate(table: str) -> int:
+        """Row estimate for a table from pg_class.reltuples (-1 if never analyzed)"""
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [table])
+            row = cursor.fetchone()
+        return int(row[0]) if row else -1
+
+    @staticmethod
+    def count(queryset: QuerySet) -> int:
+        """
+        Approximate number of rows in a queryset
+
+        Unfiltered querysets on PostgreSQL use the planner estimate of the
+        table size. Other querysets are counted exactly and the count is
+        cached for CACHE_TIMEOUT seconds.
+
+        Args:
+            queryset: Queryset to count
+
+        Returns:
+            Row count, exact or estimated
+        """
+        if connection.vendor == 'postgresql' and not queryset.query.where:
+            estimate = CountEstimator.table_estimate(queryset.model._meta.db_table)
+            if estimate >= CountEstimator.EXACT_COUNT_BELOW:
+                return estimate
+
+        sql, params = queryset.order_by().query.sql_with_params()
+        key = 'approximate_count:' + hashlib.sha1(repr((sql, params)).encode()).hexdigest()
+        count = cache.get(key)
+        if count is None:
+            count = queryset.count()
+            cache.set(key, count, CountEstimator.CACHE_TIMEOUT)
+        return count
+
+
+class ApproximateCountPaginator(Paginator):
+    """Django Paginator whose count comes from CountEstimator"""
+
+    @cached_property
+    def count(self) -> int:
+        return CountEstimator.count(self.object_list)
+
+
+class KeysetPage:
+    """One page of a KeysetPaginator, shaped like a Django Page for templates"""
+
+    def __init__(self, object_list: List[Any], paginator: 'KeysetPaginator',
+                 next_cursor: Optional[str], previous_cursor: Optional[str]):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+    def has_other_pages(self) -> bool:
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """Paginate a queryset newest first by (created_at, id) cursors"""
+
+    def __init__(self, queryset: QuerySet, per_page: int):
+        """
+        Initialize paginator
+
+        Args:
+            queryset: Queryset of a model with created_at and id fields
+            per_page: Rows per page
+        """
+        self.queryset = queryset
+        self.per_page = per_page
+
+    @cached_property
+    def count(self) -> int:
+        return CountEstimator.count(self.queryset)
+
+    @staticmethod
+    def encode_cursor(direction: str, obj: Any) -> str:
+        """Opaque cursor pointing after ('n') or before ('p') an object"""
+        payload = json.dumps([direction, obj.created_at.isoformat(), obj.pk])
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[str, datetime, int]:
+        """
+        Decode a cursor from encode_cursor
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            direction, created_at, pk = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            if direction not in ('n', 'p'):
+                raise ValueError(direction)
+            return direction, datetime.fromisoformat(created_at), int(pk)
+        except (TypeError, ValueError, UnicodeDecodeError) as e:
+            raise ValueError(f"Invalid cursor: {cursor}") from e
+
+    def get_page(self, cursor: Optional[str] = None) -> KeysetPage:
+        """
+        Get the page at a cursor
+
+        Args:
+            cursor: Cursor from a previous page (None or an invalid cursor
+                gives the first page)
+
+        Returns:
+            KeysetPage with cursors for the neighbouring pages
+        """
+        try:
+            direction, created_at, pk = self.decode_cursor(cursor) if cursor else ('n', None, None)
+        except ValueError:
+            direction, created_at, pk = 'n', None, None
+
+        queryset = self.queryset
+        if direction == 'n':
+            if created_at is not None:
+                # The plain range condition lets the (created_at, id) index bound the scan
+                queryset = queryset.filter(created_at__lte=created_at).filter(
+                    Q(created_at__lt=created_at) | Q(pk__lt=pk)
+                )
+            rows = list(queryset.order_by('-created_at', '-pk')[:self.per_page + 1])
+            has_more = len(rows) > self.per_page
+            rows = rows[:self.per_page]
+            has_next, has_previous = has_more, created_at is not None
+        else:
+            queryset = queryset.filter(created_at__gte=created_at).filter(
+                Q(created_at__gt=created_at) | Q(pk__gt=pk)
+            )
+            rows = list(queryset.order_by('created_at', 'pk')[:self.per_page + 1])
+            has_more = len(rows) > self.per_page
+            rows = rows[:self.per_page][::-1]
+            has_next, has_previous = True, has_more
+
+        return KeysetPage(
+            rows,
+            self,
+            next_cursor=self.encode_cursor('n', rows[-1]) if has_next and rows else None,
+            previous_cursor=self.encode_cursor('p', rows[0]) if has_previous and rows else None
+        )
@@ -0,0 +1,65 @@
+"""
+Mapping Template Service - Per-user column mappings for repeated CSV schemas
+Saves the mapping a user confirmed for a CSV header and offers it again
+when the same header (in any column order) is uploaded
+"""
+import json
+from typing import Dict, Iterable, Optional
+from django.db.models import F
+from apps.imports.models import ColumnMappingTemplate
+from services.csv_column_mapper import CSVColumnMapper
+
+
+class MappingTemplateService:
+    """Find and save column mapping templates"""
+    
+    @staticmethod
+    def find_mapping(user_id: str, columns: Iterable[str]) -> Optional[Dict[str, str]]:
+        """
+        Get the user's saved mapping for a CSV header
+        
+        Args:
+            user_id: User ID
+            columns: CSV headers
+            
+        Returns:
+            Mapping restricted to the given columns, or None without a template
+        """
+        columns = list(columns)
+        template = ColumnMappingTemplate.objects.filter(
+            user_id=user_id,
+            header_signature=CSVColumnMapper.header_signature(columns)
+        ).first()
+        if template is None:
+            return None
+        
+        # Headers match up to case and spacing, so look columns up by normalized name
+        saved = {column.lower().strip(): field for column, field in template.get_mapping().items()}
+        return {
+            column: saved[column.lower().strip()]
+            for column in columns if column.lower().strip() in saved
+        }
+    
+    @staticmethod
+    def save_mapping(user_id: str, columns: Iterable[str], mapping: Dict[str, str]) -> ColumnMappingTemplate:
+        """
+        Save the mapping a user chose for a CSV header
+        
+        Called when an import starts with the mapping, so use_count counts
+        the imports that used the header's template (previews do not).
+        
+        Args:
+            user_id: User ID
+            columns: CSV headers
+            mapping: Column mapping dictionary
+        """
+        column_mapping = json.dumps(mapping)
+        template, created = ColumnMappingTemplate.objects.update_or_create(
+            user_id=user_id,
+            header_signature=CSVColumnMapper.header_signature(columns),
+            defaults={'column_mapping': column_mapping, 'use_count': F('use_count') + 1},
+            create_defaults={'column_mapping': column_mapping, 'use_count': 1}
+        )
+        if not created:
+            template.refresh_from_db(fields=['use_count'])
+        return template
@@ -1,7 +1,368 @@
 """
 Spark Import Service - High-performance CSV import
 Migrated from Stremlit/services/spark_import_service.py
+
+Runs mapping, type conversion, email validation and in-file deduplication
+as local-mode PySpark DataFrame operations, writes partitions to a
+PostgreSQL staging table over JDBC in parallel and merges the staged rows
+into contacts in one transaction.
 """
-# Placeholder for now - will be implemented in later phase
-pass
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from django.conf import settings
+from django.db import connection, models, transaction
+from apps.contacts.models import Contact
+from services.bulk_insert_service import FIELD_FORMATS, import_fields
+from services.csv_stream_reader import NA_VALUES
+from services.import_error_tracker import ImportErrorTracker
+from services.type_converter import TypeConverter
+
+try:
+    from pyspark.sql import DataFrame, SparkSession, Window
+    from pyspark.sql import functions as F
+    from pyspark.sql.types import LongType
+    PYSPARK_AVAILABLE = True
+except ImportError:
+    PYSPARK_AVAILABLE = False
+
+
+INTEGER_MIN = -2147483648
+INTEGER_MAX = 2147483647
+
+# Values TypeConverter treats as empty
+NULL_TOKENS = ('nan', 'none', 'null')
+TRUE_TOKENS = ('true', '1', 'yes', 'active', 't')
+
+
+class SparkImportService:
+    """Import contacts with local-mode PySpark"""
+
+    def __init__(self, spark: Optional['SparkSession'] = None,
+                 error_tracker: Optional[ImportErrorTracker] = None):
+        """
+        Initialize Spark import service
+
+        Args:
+            spark: Existing SparkSession (default: local session from settings)
+            error_tracker: Tracker for row errors (default: a new tracker)
+        """
+        if not PYSPARK_AVAILABLE:
+            raise RuntimeError("PySpark is not installed")
+
+        self.spark = spark or self.get_session()
+        self.error_tracker = error_tracker or ImportErrorTracker()
+        self.fields = import_fields()
+
+    @staticmethod
+    def is_available() -> bool:
+        """Spark imports need PySpark and a PostgreSQL database"""
+        return PYSPARK_AVAILABLE and connection.vendor == 'postgresql'
+
+    @staticmethod
+    def get_session() -> 'SparkSession':
+        """Get or create the local-mode SparkSession configured in settings"""
+        workers = settings.MAX_IMPORT_WORKERS
+        return (
+            SparkSession.builder
+            .appName('appointment360-import')
+            .master(f'local[{workers}]')
+            .config('spark.driver.memory', settings.SPARK_DRIVER_MEMORY)
+            .config('spark.executor.memory', settings.SPARK_EXECUTOR_MEMORY)
+            .config('spark.sql.shuffle.partitions', str(workers))
+            .config('spark.jars.packages', settings.SPARK_JDBC_PACKAGES)
+            .getOrCreate()
+        )
+
+    @staticmethod
+    def get_jdbc_options() -> Dict[str, str]:
+        """JDBC connection options for the default database"""
+        db = settings.DATABASES['default']
+        return {
+            'url': f"jdbc:postgresql://{db.get('HOST') or 'localhost'}:{db.get('PORT') or 5432}/{db['NAME']}",
+            'user': db.get('USER') or '',
+            'password': db.get('PASSWORD') or '',
+            'driver': 'org.postgresql.Driver',
+        }
+
+    def import_file(self, file_path: str, user_id: str, column_mapping: Dict[str, str],
+                    progress_callback: Optional[Callable[[int], None]] = None,
+                    on_merge: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """
+        Import a CSV file with Spark
+
+        Valid rows are staged first; contacts only change when the staged
+        rows are merged in a single transaction, so an import interrupted
+        at any point leaves no partial rows behind.
+
+        Args:
+            file_path: Path to CSV file
+            user_id: User ID for the contacts
+            column_mapping: Mapping of CSV columns to database fields
+            progress_callback: Called with the number of rows read
+            on_merge: Called with the results inside the merge transaction,
+                so a caller's own bookkeeping commits together with the rows
+
+        Returns:
+            Dictionary with success_count, error_count, duplicate_count and total_processed
+        """
+        field_names = {field.name for field in self.fields}
+        unknown = set(column_mapping.values()) - field_names
+        if unknown:
+            raise ValueError(f"Unknown contact fields in mapping: {', '.join(sorted(unknown))}")
+
+        raw = self._with_row_numbers(self._read_csv(file_path))
+        classified = self._classify(self._map_and_convert(raw, user_id, column_mapping)).persist()
+        staging_table = f'contacts_import_spark_{uuid.uuid4().hex}'
+
+        try:
+            counts = {
+                row['_status']: row['count']
+                for row in classified.groupBy('_status').count().collect()
+            }
+            total_rows = sum(counts.values())
+            if progress_callback:
+                progress_callback(total_rows)
+
+            self._report_errors(classified)
+
+            valid = classified.filter(F.col('_status').isNull())
+            columns = self._stage_contacts(valid, staging_table)
+
+            with transaction.atomic():
+                success_count, conflict_count = self._merge_contacts(staging_table, columns)
+                results = {
+                    'success_count': success_count,
+                    'error_count': counts.get('error', 0),
+                    'duplicate_count': counts.get('duplicate', 0) + conflict_count,
+                    'total_processed': total_rows
+                }
+                if on_merge:
+                    on_merge(results)
+        finally:
+            classified.unpersist()
+            with connection.cursor() as cursor:
+                cursor.execute(f'DROP TABLE IF EXISTS {staging_table}')
+
+        return results
+
+    def _read_csv(self, file_path: str) -> 'DataFrame':
+        """Read every CSV column as text, like CSVStreamReader"""
+        return self.spark.read.csv(
+            file_path, header=True, inferSchema=False, multiLine=True, escape='"'
+        )
+
+    def _with_row_numbers(self, raw: 'DataFrame') -> 'DataFrame':
+        """Add 1-based CSV row numbers that match the other import engines"""
+        schema = raw.schema.add('_row_number', LongType())
+        rows = raw.rdd.zipWithIndex().map(lambda pair: tuple(pair[0]) + (pair[1] + 1,))
+        return self.spark.createDataFrame(rows, schema).withColumn(
+            '_original_data', F.to_json(F.struct(*[F.col(f'`{c}`') for c in raw.columns]))
+        )
+
+    @staticmethod
+    def _convert_column(column: 'Any', field_name: str) -> 'Any':
+        """Column expression equivalent to TypeConverter.convert_value on cells read by CSVStreamReader"""
+        trimmed = F.regexp_replace(column, r'^\s+|\s+$', '')
+        lowered = F.lower(trimmed)
+
+        if field_name in TypeConverter.INTEGER_FIELDS:
+            # bround rounds half to even like Python's round()
+            converted = F.bround(trimmed.cast('double'), 0).cast('long')
+            null_token_value = F.lit(None).cast('long')
+        elif field_name in TypeConverter.BOOLEAN_FIELDS:
+            # Booleans stay text until staged: a null token converts to '',
+            # which the contacts table rejects, as it does for the ORM engine.
+            # to_boolean compares the untrimmed value.
+            converted = F.when(F.lower(column).isin(*TRUE_TOKENS), F.lit('true')).otherwise(F.lit('false'))
+            null_token_value = F.lit('')
+        else:
+            converted = trimmed
+            null_token_value = F.lit('')
+
+        # Blank cells, and cells the other engines read as missing, are left
+        # out (null) so the model default applies
+        return (
+            F.when(column.isNull() | (trimmed == '') | column.isin(*NA_VALUES), F.lit(None))
+            .when(lowered.isin(*NULL_TOKENS), null_token_value)
+            .otherwise(converted)
+        )
+
+    def _map_and_convert(self, raw: 'DataFrame', user_id: str,
+                         column_mapping: Dict[str, str]) -> 'DataFrame':
+        """Rename mapped columns to contact fields and convert their types"""
+        converted: Dict[str, List[Any]] = {}
+        for csv_col, db_field in column_mapping.items():
+            if csv_col in raw.columns:
+                converted.setdefault(db_field, []).append(
+                    self._convert_column(F.col(f'`{csv_col}`'), db_field)
+                )
+
+        # When several CSV columns map to one field the last non-blank value wins
+        columns = {
+            field: F.coalesce(*reversed(expressions)) if len(expressions) > 1 else expressions[0]
+            for field, expressions in converted.items()
+        }
+        columns['user_id'] = F.lit(str(user_id))
+        if 'email' in columns:
+            # Same key as normalize_email; the converted email is already trimmed
+            columns['email_key'] = F.when(columns['email'] != '', F.lower(columns['email']))
+
+        # Same rule as TypeConverter.clean_and_merge_names
+        if 'first_name' in columns or 'last_name' in columns:
+            merged = F.trim(F.concat_ws(
+                ' ',
+                columns.get('first_name', F.lit(None).cast('string')),
+                columns.get('last_name', F.lit(None).cast('string'))
+            ))
+            merged = F.when(merged != '', merged)
+            columns['full_name'] = F.coalesce(columns['full_name'], merged) if 'full_name' in columns else merged
+
+        return raw.select(
+            F.col('_row_number'),
+            F.col('_original_data'),
+            *[expression.alias(field) for field, expression in columns.items()]
+        )
+
+    def _classify(self, mapped: 'DataFrame') -> 'DataFrame':
+        """Add _status/_error_column/_error_message for duplicates and invalid rows"""
+        if 'email' not in mapped.columns:
+            mapped = mapped.withColumn('email', F.lit(None).cast('string'))
+            mapped = mapped.withColumn('email_key', F.lit(None).cast('string'))
+
+        existing = self._existing_keys()
+        mapped = mapped.join(existing, mapped['email_key'] == existing['_existing_key'], 'left')
+
+        first_in_file = Window.partitionBy('email_key').orderBy('_row_number')
+        file_rank = F.when(F.col('email_key').isNotNull(), F.row_number().over(first_in_file))
+
+        checks = [
+            (F.col('_existing_key').isNotNull() | (file_rank > 1), 'duplicate', 'email', 'Duplicate email found'),
+            (F.col('email').isNull() | (F.col('email') == ''), 'error', 'email',
+             'Validation failed: Email is required'),
+        ]
+        checks.extend(
+            (~F.col(field).rlike(pattern), 'error', field, f'Validation failed: {reason}')
+            for field, (pattern, reason) in FIELD_FORMATS.items() if field in mapped.columns
+        )
+        for field in self.fields:
+            if field.name not in mapped.columns:
+                continue
+            column = F.col(field.name)
+            if isinstance(field, models.IntegerField):
+                checks.append((
+                    ~column.between(INTEGER_MIN, INTEGER_MAX), 'error', field.name,
+                    'Error: integer out of range'
+                ))
+            elif isinstance(field, models.CharField) and field.max_length:
+                checks.append((
+                    F.length(column) > field.max_length, 'error', field.name,
+                    f'Error: value too long for type character varying({field.max_length})'
+                ))
+            elif isinstance(field, models.BooleanField):
+                invalid = field.error_messages['invalid'] % {'value': ''}
+                checks.append((column == '', 'error', field.name, f'Error: {[invalid]}'))
+
+        # The first matching check wins, in the same order as the ORM engine
+        status = error_column = error_message = F.lit(None).cast('string')
+        for condition, check_status, column_name, message in reversed(checks):
+            condition = F.coalesce(condition, F.lit(False))
+            status = F.when(condition, F.lit(check_status)).otherwise(status)
+            error_column = F.when(condition, F.lit(column_name)).otherwise(error_column)
+            error_message = F.when(condition, F.lit(message)).otherwise(error_message)
+
+        return mapped.drop('_existing_key').select(
+            '*',
+            status.alias('_status'),
+            error_column.alias('_error_column'),
+            error_message.alias('_error_message')
+        )
+
+    def _existing_keys(self) -> 'DataFrame':
+        """Normalized emails already in contacts, as an _existing_key column"""
+        return (
+            self.spark.read.format('jdbc')
+            .options(**self.get_jdbc_options())
+            .option(
+                'query',
+                f'SELECT email_key AS _existing_key FROM {Contact._meta.db_table} WHERE email_key IS NOT NULL'
+            )
+            .load()
+        )
+
+    def _report_errors(self, classified: 'DataFrame'):
+        """Stream duplicate and error rows into the error tracker in row order"""
+        errors = (
+            classified.filter(F.col('_status').isNotNull())
+            .select('_row_number', '_status', '_error_column', '_error_message', 'email', '_original_data')
+            .orderBy('_row_number')
+        )
+        for row in errors.toLocalIterator():
+            if row['_status'] == 'duplicate':
+                self.error_tracker.add_duplicate_error(row['_row_number'], row['email'])
+            else:
+                self.error_tracker.add_error(
+                    row['_row_number'], row['_error_column'], row['_error_message'], row['_original_data']
+                )
+
+    def _stage_contacts(self, valid: 'DataFrame', staging_table: str) -> List[str]:
+        """
+        Write valid rows to a staging table in parallel JDBC partitions
+
+        Returns:
+            Contact columns written to the staging table
+        """
+        columns = []
+        for field in self.fields:
+            default = field.get_default()
+            if field.name in valid.columns:
+                column = F.col(field.name)
+                if isinstance(field, models.BooleanField):
+                    column = column.cast('boolean')
+                if default is not None:
+                    column = F.coalesce(column, F.lit(default))
+                columns.append(column.alias(field.column))
+            elif default is not None:
+                columns.append(F.lit(default).alias(field.column))
+            # Unmapped nullable fields are left to the database default (NULL)
+
+        staged = valid.select(F.col('_row_number'), *columns)
+        (
+            staged.repartition(settings.MAX_IMPORT_WORKERS)
+            .write.format('jdbc')
+            .options(**self.get_jdbc_options())
+            .option('dbtable', staging_table)
+            .option('batchsize', settings.IMPORT_BATCH_SIZE)
+            .option('numPartitions', settings.MAX_IMPORT_WORKERS)
+            .mode('overwrite')
+            .save()
+        )
+        return [name for name in staged.columns if name != '_row_number']
+
+    @staticmethod
+    def _merge_sql(staging_table: str, columns: List[str]) -> str:
+        """INSERT ... SELECT of the staged rows in CSV order"""
+        column_list = ', '.join(f'"{name}"' for name in columns)
+        return (
+            f'INSERT INTO {Contact._meta.db_table} ({column_list}, "created_at", "updated_at") '
+            f'SELECT {column_list}, now(), now() FROM {staging_table} '
+            f'ORDER BY _row_number ON CONFLICT DO NOTHING'
+        )
+
+    @staticmethod
+    def _merge_contacts(staging_table: str, columns: List[str]) -> Tuple[int, int]:
+        """
+        Merge staged rows into contacts with one statement
+
+        Returns:
+            Tuple of (inserted_count, conflict_count); conflicts are rows
+            whose email was inserted concurrently by another import
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(SparkImportService._merge_sql(staging_table, columns))
+            success_count = cursor.rowcount
+            cursor.execute(f'SELECT COUNT(*) FROM {staging_table}')
+            return success_count, cursor.fetchone()[0] - success_count
 
+    def get_error_tracker(self) -> ImportErrorTracker:
+        """Get the error tracker instance"""
+        return self.error_tracker
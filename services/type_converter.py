@@ -2,12 +2,19 @@
 Type Converter - Convert CSV values to appropriate database types
 Migrated from Stremlit/services/type_converter.py
 """
+import numpy as np
 import pandas as pd
-from typing import Any, Optional
+from typing import Any, Dict, Optional, Tuple
 from decimal import Decimal
 import re
 
 
+# Element-wise string methods for object arrays
+_strip = np.frompyfunc(str.strip, 1, 1)
+_lower = np.frompyfunc(str.lower, 1, 1)
+_length = np.frompyfunc(len, 1, 1)
+
+
 class TypeConverter:
     """Convert CSV data types to database-compatible types"""
     
@@ -26,6 +33,15 @@ class TypeConverter:
         'is_active'
     }
     
+    # Stripped, lowercased strings treated as empty
+    NULL_TOKENS = ['nan', 'none', 'null', '']
+    
+    # Strings converted to True for boolean fields
+    TRUE_TOKENS = ['true', '1', 'yes', 'active', 't']
+    
+    # Floats below this magnitude round-trip exactly through int64
+    VECTOR_INT_LIMIT = 2 ** 62
+    
     # Fields that should be floats
     FLOAT_FIELDS = {
         'revenue',
@@ -99,7 +115,7 @@ class TypeConverter:
         if isinstance(value, bool):
             return value
         elif isinstance(value, str):
-            return value.lower() in ['true', '1', 'yes', 'active', 't']
+            return value.lower() in TypeConverter.TRUE_TOKENS
         elif isinstance(value, (int, float)):
             return bool(value)
         return True
@@ -118,7 +134,7 @@ class TypeConverter:
         value_str = str(value).strip() if value else ""
         
         # Check if it's empty
-        if not value_str or value_str.lower() in ['nan', 'none', 'null', '']:
+        if not value_str or value_str.lower() in TypeConverter.NULL_TOKENS:
             return None if field_name in TypeConverter.INTEGER_FIELDS else ""
         
         # Convert based on field type
@@ -130,6 +146,161 @@ class TypeConverter:
             # For string fields, just return the cleaned value
             return value_str
     
+    @staticmethod
+    def convert_series(field_name: str, series: pd.Series,
+                       errors: Optional[Dict[Any, Exception]] = None) -> pd.Series:
+        """
+        Convert a whole column with vectorized operations
+        
+        Produces the same values (and types) as calling convert_value on
+        every cell of series.tolist(). Cells the vectorized path cannot
+        reproduce exactly are passed to convert_value.
+        
+        Args:
+            field_name: Database field name
+            series: Column of CSV values
+            errors: If given, a cell that fails to convert (e.g. 'inf' in an
+                integer field) becomes None and its exception is stored here
+                under the cell's index label, instead of raising for the column
+            
+        Returns:
+            Object Series of converted values with the same index
+        """
+        kind = pd.api.types.infer_dtype(series, skipna=True)
+        try:
+            if kind == 'empty':
+                converted = np.full(len(series), None, dtype=object)
+            elif kind == 'string':
+                converted = TypeConverter._convert_strings(field_name, series)
+            elif isinstance(series.dtype, np.dtype) and series.dtype.kind in 'biuf':
+                converted = TypeConverter._convert_numbers(field_name, series.to_numpy())
+            else:
+                # Mixed object columns keep the scalar conversion
+                converted = np.empty(len(series), dtype=object)
+                converted[:] = [TypeConverter.convert_value(field_name, value) for value in series.tolist()]
+        except Exception:
+            if errors is None:
+                raise
+            # Convert cell by cell so only the failing cells are lost
+            converted = np.empty(len(series), dtype=object)
+            for pos, (label, value) in enumerate(zip(series.index, series.tolist())):
+                try:
+                    converted[pos] = TypeConverter.convert_value(field_name, value)
+                except Exception as e:
+                    converted[pos] = None
+                    errors[label] = e
+        return pd.Series(converted, index=series.index, dtype=object)
+    
+    @staticmethod
+    def convert_frame(df: pd.DataFrame, mapping: Dict[str, str],
+                      errors: Optional[Dict[Any, Tuple[str, Exception]]] = None) -> pd.DataFrame:
+        """
+        Convert every mapped column of a DataFrame
+        
+        Args:
+            df: DataFrame of CSV values
+            mapping: Mapping of CSV columns to database fields
+            errors: If given, rows with a cell that fails to convert are
+                recorded here as index label -> (CSV column, exception) for
+                their first failing column, instead of raising for the chunk
+            
+        Returns:
+            DataFrame of the mapped CSV columns (same names and index) with
+            values converted for their database fields
+        """
+        columns = {}
+        for csv_col, db_field in mapping.items():
+            if csv_col not in df.columns:
+                continue
+            column_errors = {} if errors is not None else None
+            columns[csv_col] = TypeConverter.convert_series(db_field, df[csv_col], column_errors)
+            for label, error in (column_errors or {}).items():
+                errors.setdefault(label, (csv_col, error))
+        return pd.DataFrame(columns, index=df.index)
+    
+    @staticmethod
+    def _convert_strings(field_name: str, text: pd.Series) -> np.ndarray:
+        """Vectorized convert_value for an object column of strings and nulls"""
+        values = text.to_numpy(dtype=object)
+        missing = pd.isna(values)
+        present = values[~missing]
+        stripped = _strip(present)
+        
+        # Only values as short as the longest token need lowercasing
+        short = _length(stripped).astype(np.int64) <= 4
+        is_token = np.zeros(len(present), dtype=bool)
+        is_token[short] = np.isin(_lower(stripped[short]), TypeConverter.NULL_TOKENS)
+        
+        converted = np.full(len(values), None, dtype=object)
+        blank = np.zeros(len(values), dtype=bool)
+        blank[~missing] = is_token
+        filled = ~missing & ~blank
+        if field_name in TypeConverter.INTEGER_FIELDS:
+            converted[filled] = TypeConverter._parse_integers(stripped[~is_token])
+            return converted
+        
+        converted[blank] = ''
+        if field_name in TypeConverter.BOOLEAN_FIELDS:
+            # to_boolean compares the original (unstripped) value
+            converted[filled] = np.isin(_lower(present[~is_token]), TypeConverter.TRUE_TOKENS)
+        else:
+            converted[filled] = stripped[~is_token]
+        return converted
+    
+    @staticmethod
+    def _parse_integers(values: np.ndarray) -> np.ndarray:
+        """Vectorized to_integer for an object array of stripped, non-empty strings"""
+        # astype(float) parses with float() exactly; pd.to_numeric is not correctly rounded
+        try:
+            numbers = values.astype(float)
+        except (ValueError, TypeError):
+            numbers = np.full(len(values), np.nan)
+            parseable = pd.to_numeric(pd.Series(values), errors='coerce').notna().to_numpy()
+            try:
+                numbers[parseable] = values[parseable].astype(float)
+            except (ValueError, TypeError):
+                pass
+        
+        # np.rint rounds half to even like round()
+        exact = np.isfinite(numbers) & (np.abs(numbers) < TypeConverter.VECTOR_INT_LIMIT)
+        converted = np.empty(len(values), dtype=object)
+        converted[exact] = np.rint(numbers[exact]).astype(np.int64)
+        rest = ~exact
+        if rest.any():
+            converted[rest] = [TypeConverter.to_integer(value) for value in values[rest]]
+        return converted
+    
+    @staticmethod
+    def _convert_numbers(field_name: str, values: np.ndarray) -> np.ndarray:
+        """Vectorized convert_value for a numeric or boolean NumPy column"""
+        missing = pd.isna(values)
+        # Falsy values (0, 0.0, False) are treated as empty by convert_value
+        falsy = (values == 0) & ~missing
+        present = ~missing & ~falsy
+        
+        converted = np.full(len(values), None, dtype=object)
+        if field_name in TypeConverter.INTEGER_FIELDS:
+            if values.dtype.kind == 'f':
+                # to_integer uses int(), which truncates floats
+                exact = present & np.isfinite(values) & (np.abs(values) < TypeConverter.VECTOR_INT_LIMIT)
+                converted[exact] = np.trunc(values[exact]).astype(np.int64)
+                rest = present & ~exact
+                if rest.any():
+                    converted[rest] = [TypeConverter.to_integer(value) for value in values[rest].tolist()]
+            elif values.dtype.kind == 'b':
+                converted[present] = values[present].astype(np.int64)
+            else:
+                converted[present] = values[present].astype(object)
+            return converted
+        
+        converted[falsy] = ''
+        if field_name in TypeConverter.BOOLEAN_FIELDS:
+            converted[present] = True
+        else:
+            # NumPy formats floats with the shortest repr, like str()
+            converted[present] = values[present].astype(str).astype(object)
+        return converted
+    
     @staticmethod
     def clean_contact_data(contact_data: dict) -> dict:
         """Clean and convert contact data to proper types"""
@@ -25,6 +25,7 @@
         success_count: 0,
         error_count: 0,
         duplicate_count: 0,
+        updated_count: 0,
         processing_speed: 0,
         current_batch: 0,
         total_batches: 0,
@@ -104,6 +105,7 @@ function progressTracker(jobId) {
             success_count: 0,
             error_count: 0,
             duplicate_count: 0,
+            updated_count: 0,
             processing_speed: 0,
             current_batch: 0,
             total_batches: 0,
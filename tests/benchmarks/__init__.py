@@ -0,0 +1,2 @@
+# Import throughput benchmarks
+
@@ -0,0 +1,92 @@
+"""
+Benchmark configuration
+
+Benchmarks are deselected by default; run them with ``-m benchmark``.
+They run against the configured default database (PostgreSQL, or SQLite
+through a settings module passed with ``--ds``) and are tuned with
+environment variables:
+
+- BENCHMARK_ROWS: comma-separated dataset sizes, e.g. ``10k,100k,1m`` (default 10k)
+- BENCHMARK_DUPLICATE_RATE / BENCHMARK_ERROR_RATE: row shares (default 0.05 / 0.02)
+- BENCHMARK_SEED: generator seed (default 42)
+- BENCHMARK_OUTPUT: write results to this JSON file
+- BENCHMARK_BASELINE: fail engines slower than this earlier JSON output
+- BENCHMARK_TOLERANCE: allowed slowdown against the baseline (default 0.2)
+"""
+import os
+import pytest
+from tests.benchmarks.harness import find_regressions, format_table, write_results
+from tests.benchmarks.synthetic_contacts import SyntheticContactGenerator
+
+
+SIZE_SUFFIXES = {'k': 1_000, 'm': 1_000_000}
+
+_results = []
+
+
+def parse_sizes(value: str):
+    """Parse ``10k,100k,1m`` into row counts"""
+    sizes = []
+    for size in filter(None, (part.strip().lower() for part in value.split(','))):
+        multiplier = SIZE_SUFFIXES.get(size[-1], 1)
+        sizes.append(int(float(size.rstrip('km')) * multiplier))
+    return sizes
+
+
+def pytest_generate_tests(metafunc):
+    if 'benchmark_rows' in metafunc.fixturenames:
+        sizes = parse_sizes(os.getenv('BENCHMARK_ROWS', '10k'))
+        metafunc.parametrize('benchmark_rows', sizes, ids=[str(size) for size in sizes])
+
+
+@pytest.fixture(scope='session')
+def synthetic_datasets(tmp_path_factory):
+    """Get a generated dataset by row count, writing each size once per session"""
+    generator = SyntheticContactGenerator(
+        seed=int(os.getenv('BENCHMARK_SEED', '42')),
+        duplicate_rate=float(os.getenv('BENCHMARK_DUPLICATE_RATE', '0.05')),
+        error_rate=float(os.getenv('BENCHMARK_ERROR_RATE', '0.02')),
+    )
+    directory = tmp_path_factory.mktemp('benchmarks')
+    datasets = {}
+
+    def get(rows):
+        if rows not in datasets:
+            datasets[rows] = generator.write_csv(str(directory / f'contacts_{rows}.csv'), rows)
+        return datasets[rows]
+
+    return get
+
+
+@pytest.fixture
+def synthetic_dataset(synthetic_datasets, benchmark_rows):
+    """Generated dataset for the current benchmark size"""
+    return synthetic_datasets(benchmark_rows)
+
+
+@pytest.fixture
+def record_benchmark():
+    """Record a result for the report and check it against the baseline"""
+    def record(result):
+        _results.append(result)
+        baseline = os.getenv('BENCHMARK_BASELINE')
+        if baseline:
+            tolerance = float(os.getenv('BENCHMARK_TOLERANCE', '0.2'))
+            regressions = find_regressions([result], baseline, tolerance)
+            if regressions:
+                pytest.fail(f'Throughput regression: {regressions[0]}')
+
+    return record
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not _results:
+        return
+    terminalreporter.section('import benchmarks')
+    for line in format_table(_results):
+        terminalreporter.write_line(line)
+
+    output = os.getenv('BENCHMARK_OUTPUT')
+    if output:
+        write_results(output, _results)
+        terminalreporter.write_line(f'Results written to {output}')
@@ -0,0 +1,168 @@
+"""
+Measurement helpers for import benchmarks
+
+measure() times a block and records its throughput, the peak resident set
+size of the process while it ran and the number of SQL statements sent to
+the default database. Results can be written to JSON and compared with a
+previous run to catch throughput regressions.
+"""
+import json
+import os
+import resource
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Iterator, List, Optional
+from django.db import connection
+
+
+# How often the RSS sampler reads the process memory
+RSS_SAMPLE_SECONDS = 0.01
+
+
+@dataclass
+class BenchmarkResult:
+    """Measurements for one engine on one dataset"""
+    engine: str
+    rows: int
+    vendor: str
+    seconds: float = 0.0
+    peak_rss_mb: float = 0.0
+    rss_growth_mb: float = 0.0
+    db_round_trips: int = 0
+
+    @property
+    def key(self) -> str:
+        return f'{self.engine}[{self.rows}]@{self.vendor}'
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data['rows_per_second'] = round(self.rows_per_second, 1)
+        return data
+
+
+def current_rss_mb() -> float:
+    """Resident set size of this process in MB"""
+    try:
+        with open('/proc/self/statm') as statm:
+            pages = int(statm.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError):
+        # No procfs (macOS): fall back to the process high-water mark
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return max_rss / (1024 * 1024) if os.uname().sysname == 'Darwin' else max_rss / 1024
+
+
+class RSSSampler:
+    """Track the peak RSS of the process from a background thread"""
+
+    def __init__(self, interval: float = RSS_SAMPLE_SECONDS):
+        self.interval = interval
+        self.start_mb = self.peak_mb = current_rss_mb()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak_mb = max(self.peak_mb, current_rss_mb())
+
+    def __enter__(self) -> 'RSSSampler':
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+        self.peak_mb = max(self.peak_mb, current_rss_mb())
+
+
+class QueryCounter:
+    """Count statements executed on a connection without keeping their SQL"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+@contextmanager
+def measure(engine: str, rows: int) -> Iterator[BenchmarkResult]:
+    """
+    Measure the enclosed block
+
+    COPY data streams and server-side cursor fetches bypass Django's cursor
+    wrapper, so they are not counted as round trips.
+
+    Args:
+        engine: Engine name reported with the result
+        rows: Number of CSV rows the block imports
+
+    Yields:
+        BenchmarkResult, filled in when the block exits
+    """
+    result = BenchmarkResult(engine=engine, rows=rows, vendor=connection.vendor)
+    counter = QueryCounter()
+
+    with RSSSampler() as sampler, connection.execute_wrapper(counter):
+        started = time.perf_counter()
+        yield result
+        result.seconds = time.perf_counter() - started
+
+    result.peak_rss_mb = round(sampler.peak_mb, 1)
+    result.rss_growth_mb = round(sampler.peak_mb - sampler.start_mb, 1)
+    result.db_round_trips = counter.count
+
+
+def format_table(results: List[BenchmarkResult]) -> List[str]:
+    """Format results as aligned report lines"""
+    header = f"{'engine':<22}{'rows':>10}{'rows/sec':>12}{'seconds':>10}{'peak RSS MB':>13}{'RSS +MB':>10}{'DB trips':>10}"
+    lines = [header, '-' * len(header)]
+    for result in results:
+        lines.append(
+            f'{result.engine:<22}{result.rows:>10}{result.rows_per_second:>12.0f}{result.seconds:>10.2f}'
+            f'{result.peak_rss_mb:>13.1f}{result.rss_growth_mb:>10.1f}{result.db_round_trips:>10}'
+        )
+    return lines
+
+
+def write_results(path: str, results: List[BenchmarkResult]):
+    """Write results to a JSON file usable as a baseline for later runs"""
+    with open(path, 'w') as output:
+        json.dump({result.key: result.to_dict() for result in results}, output, indent=2)
+
+
+def find_regressions(results: List[BenchmarkResult], baseline_path: str,
+                     tolerance: float) -> List[str]:
+    """
+    Compare throughput with a baseline written by write_results
+
+    Args:
+        results: Results of this run
+        baseline_path: JSON file from an earlier run
+        tolerance: Allowed slowdown as a fraction (0.2 = 20% fewer rows/sec)
+
+    Returns:
+        One message per result slower than the baseline allows
+    """
+    with open(baseline_path) as baseline_file:
+        baseline = json.load(baseline_file)
+
+    regressions = []
+    for result in results:
+        previous: Optional[dict] = baseline.get(result.key)
+        if not previous:
+            continue
+        minimum = previous['rows_per_second'] * (1 - tolerance)
+        if result.rows_per_second < minimum:
+            regressions.append(
+                f'{result.key}: {result.rows_per_second:.0f} rows/sec, '
+                f'baseline {previous["rows_per_second"]:.0f} (minimum {minimum:.0f})'
+            )
+    return regressions
@@ -0,0 +1,198 @@
+"""
+Synthetic contact CSV generator for import benchmarks
+
+Builds Apollo-style contact exports of any size from a seeded RNG, so the
+same arguments always produce the same file. A share of the rows repeat
+an earlier email (in different letter case) and a share carry a value the
+importers reject, and the dataset records how many of each it wrote.
+"""
+import os
+from dataclasses import dataclass
+from typing import Tuple
+import numpy as np
+import pandas as pd
+
+
+FIRST_NAMES = np.array([
+    'James', 'Mary', 'Robert', 'Patricia', 'John', 'Jennifer', 'Michael', 'Linda',
+    'David', 'Elizabeth', 'William', 'Barbara', 'Richard', 'Susan', 'Joseph', 'Jessica',
+    'Thomas', 'Sarah', 'Charles', 'Karen', 'Priya', 'Wei', 'Ahmed', 'Sofia',
+])
+LAST_NAMES = np.array([
+    'Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis',
+    'Rodriguez', 'Martinez', 'Hernandez', 'Lopez', 'Wilson', 'Anderson', 'Thomas',
+    'Taylor', 'Moore', 'Jackson', 'Martin', 'Lee', 'Patel', 'Chen', 'Khan', 'Rossi',
+])
+TITLES = np.array([
+    'CEO', 'CTO', 'VP Sales', 'Marketing Manager', 'Software Engineer',
+    'Account Executive', 'Head of Operations', 'Data Analyst', 'Recruiter',
+])
+COMPANIES = np.array([
+    'Acme', 'Globex', 'Initech', 'Umbrella', 'Hooli', 'Stark Industries',
+    'Wayne Enterprises', 'Wonka', 'Soylent', 'Cyberdyne', 'Tyrell', 'Vandelay',
+])
+INDUSTRIES = np.array([
+    'Technology', 'Finance', 'Healthcare', 'Retail', 'Manufacturing', 'Education',
+])
+LOCATIONS = np.array([
+    ('San Francisco', 'CA', 'United States'),
+    ('New York', 'NY', 'United States'),
+    ('Austin', 'TX', 'United States'),
+    ('Toronto', 'ON', 'Canada'),
+    ('London', 'England', 'United Kingdom'),
+    ('Bangalore', 'Karnataka', 'India'),
+])
+
+# CSV header -> contact field, as the column mapper would map it
+COLUMN_MAPPING = {
+    'First Name': 'first_name',
+    'Last Name': 'last_name',
+    'Title': 'title',
+    'Company': 'company',
+    'Email': 'email',
+    'Phone': 'phone',
+    '# Employees': 'employees_count',
+    'Industry': 'industry',
+    'Website': 'website',
+    'City': 'city',
+    'State': 'state',
+    'Country': 'country',
+}
+
+# Ways an error row is broken, assigned round-robin
+ERROR_KINDS = ('missing_email', 'invalid_email', 'invalid_phone', 'invalid_website')
+
+
+@dataclass
+class SyntheticDataset:
+    """A generated CSV file and the import outcome it should produce"""
+    path: str
+    rows: int
+    duplicate_count: int
+    error_count: int
+
+    @property
+    def success_count(self) -> int:
+        return self.rows - self.duplicate_count - self.error_count
+
+    @property
+    def size_mb(self) -> float:
+        return os.path.getsize(self.path) / (1024 * 1024)
+
+
+class SyntheticContactGenerator:
+    """Generate deterministic contact CSVs with duplicate and error rows"""
+
+    def __init__(self, seed: int = 42, duplicate_rate: float = 0.05, error_rate: float = 0.02):
+        """
+        Initialize generator
+
+        Args:
+            seed: RNG seed; the same seed and rates give the same file
+            duplicate_rate: Share of rows repeating an earlier valid email
+            error_rate: Share of rows with a missing or invalid value
+        """
+        if duplicate_rate < 0 or error_rate < 0 or duplicate_rate + error_rate >= 1:
+            raise ValueError("duplicate_rate and error_rate must be non-negative and sum to less than 1")
+
+        self.seed = seed
+        self.duplicate_rate = duplicate_rate
+        self.error_rate = error_rate
+
+    def generate(self, rows: int) -> pd.DataFrame:
+        """
+        Build the contact rows
+
+        Args:
+            rows: Number of data rows
+
+        Returns:
+            DataFrame with the COLUMN_MAPPING headers, all values as strings
+        """
+        return self._build(rows)[0]
+
+    def _build(self, rows: int) -> Tuple[pd.DataFrame, np.ndarray]:
+        """Build the rows and the kind of each row (see _row_kinds)"""
+        rng = np.random.default_rng(self.seed)
+        ids = np.arange(rows)
+
+        first = FIRST_NAMES[rng.integers(len(FIRST_NAMES), size=rows)]
+        last = LAST_NAMES[rng.integers(len(LAST_NAMES), size=rows)]
+        company = COMPANIES[rng.integers(len(COMPANIES), size=rows)]
+        location = LOCATIONS[rng.integers(len(LOCATIONS), size=rows)]
+        domain = pd.Series(company).str.lower().str.replace(' ', '', regex=False) + '.com'
+
+        df = pd.DataFrame({
+            'First Name': first,
+            'Last Name': last,
+            'Title': TITLES[rng.integers(len(TITLES), size=rows)],
+            'Company': company,
+            'Email': (
+                pd.Series(first).str.lower() + '.' + pd.Series(last).str.lower() + '.'
+                + pd.Series(ids).astype(str) + '@' + domain
+            ),
+            'Phone': '+1 555 ' + pd.Series(ids % 10_000_000).astype(str).str.zfill(7),
+            '# Employees': rng.integers(1, 50_000, size=rows).astype(str),
+            'Industry': INDUSTRIES[rng.integers(len(INDUSTRIES), size=rows)],
+            'Website': 'https://www.' + domain,
+            'City': location[:, 0],
+            'State': location[:, 1],
+            'Country': location[:, 2],
+        })
+
+        kind = self._row_kinds(rng, rows)
+
+        # Duplicates copy the email of a random earlier valid row, upper-cased
+        # so they are only caught by normalized matching
+        valid = np.flatnonzero(kind == 0)
+        duplicates = np.flatnonzero(kind == 1)
+        if len(duplicates):
+            earlier = np.searchsorted(valid, duplicates)
+            sources = valid[(rng.random(len(duplicates)) * earlier).astype(np.int64)]
+            df.loc[duplicates, 'Email'] = df['Email'].to_numpy()[sources]
+            df.loc[duplicates, 'Email'] = df.loc[duplicates, 'Email'].str.upper()
+
+        errors = np.flatnonzero(kind == 2)
+        for position, error_kind in enumerate(ERROR_KINDS):
+            broken = errors[position::len(ERROR_KINDS)]
+            if error_kind == 'missing_email':
+                df.loc[broken, 'Email'] = ''
+            elif error_kind == 'invalid_email':
+                df.loc[broken, 'Email'] = df.loc[broken, 'Email'].str.replace('@', '.at.', regex=False)
+            elif error_kind == 'invalid_phone':
+                df.loc[broken, 'Phone'] = 'call reception'
+            else:
+                df.loc[broken, 'Website'] = df.loc[broken, 'Website'].str.replace('https://', '', regex=False)
+
+        return df, kind
+
+    def _row_kinds(self, rng: np.random.Generator, rows: int) -> np.ndarray:
+        """0 = valid, 1 = duplicate, 2 = error; the first row is always valid"""
+        draw = rng.random(rows)
+        kind = np.zeros(rows, dtype=np.int8)
+        kind[draw < self.error_rate + self.duplicate_rate] = 1
+        kind[draw < self.error_rate] = 2
+        if rows:
+            kind[0] = 0
+        return kind
+
+    def write_csv(self, path: str, rows: int) -> SyntheticDataset:
+        """
+        Generate rows and write them to a CSV file
+
+        Args:
+            path: Output file path
+            rows: Number of data rows
+
+        Returns:
+            SyntheticDataset with the expected duplicate and error counts
+        """
+        df, kind = self._build(rows)
+        df.to_csv(path, index=False)
+
+        return SyntheticDataset(
+            path=str(path),
+            rows=rows,
+            duplicate_count=int((kind == 1).sum()),
+            error_count=int((kind == 2).sum()),
+        )
@@ -0,0 +1,145 @@
+"""
+Import throughput benchmarks
+
+Each engine imports the same synthetic dataset into an empty contacts
+table. Results are reported at the end of the run and every engine's
+counts are checked against the generated duplicate and error rows.
+"""
+import pytest
+from django.db import connection, transaction
+from apps.contacts.models import Contact
+from apps.imports.models import ImportJob
+from apps.imports.tasks import STREAM_BATCH_SIZE, process_import_task
+from services.bulk_insert_service import BulkInsertService
+from services.copy_import_service import CopyImportService
+from services.csv_stream_reader import CSVStreamReader
+from services.type_converter import TypeConverter
+from tests.benchmarks.harness import measure
+from tests.benchmarks.synthetic_contacts import COLUMN_MAPPING
+
+
+USER_ID = 'benchmark-user'
+
+
+def assert_counts(results, dataset):
+    """Check an engine's counts against the generated dataset"""
+    assert results['success_count'] == dataset.success_count
+    assert results['duplicate_count'] == dataset.duplicate_count
+    assert results['error_count'] == dataset.error_count
+    assert Contact.objects.count() == dataset.success_count
+
+
+def import_batches(dataset, import_batch):
+    """Stream the dataset like process_import_task and sum the batch results"""
+    totals = {'success_count': 0, 'duplicate_count': 0, 'error_count': 0, 'updated_count': 0}
+    for batch in CSVStreamReader.iter_batches(dataset.path, STREAM_BATCH_SIZE):
+        with transaction.atomic():
+            results = import_batch(batch.df)
+        for key in totals:
+            totals[key] += results.get(key, 0)
+    return totals
+
+
+@pytest.mark.benchmark
+class TestTypeConverterThroughput:
+    """Benchmark column-wise type conversion"""
+
+    def test_convert_frame(self, synthetic_dataset, record_benchmark):
+        """Benchmark TypeConverter.convert_frame over the streamed batches"""
+        batches = [batch.df for batch in CSVStreamReader.iter_batches(synthetic_dataset.path, STREAM_BATCH_SIZE)]
+
+        with measure('type_converter', synthetic_dataset.rows) as result:
+            converted = sum(len(TypeConverter.convert_frame(df, COLUMN_MAPPING)) for df in batches)
+
+        record_benchmark(result)
+        assert converted == synthetic_dataset.rows
+        assert result.db_round_trips == 0
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db(transaction=True)
+class TestImportEngineThroughput:
+    """Benchmark each import engine end to end against the database"""
+
+    def test_row_by_row(self, synthetic_dataset, record_benchmark):
+        """Benchmark the legacy per-row insert"""
+        service = BulkInsertService()
+
+        with measure('row_by_row', synthetic_dataset.rows) as result:
+            results = import_batches(
+                synthetic_dataset,
+                lambda df: service.bulk_insert_from_dataframe(df, USER_ID, COLUMN_MAPPING)
+            )
+
+        record_benchmark(result)
+        assert_counts(results, synthetic_dataset)
+
+    def test_set_based(self, synthetic_dataset, record_benchmark):
+        """Benchmark the set-based insert used by streamed imports"""
+        service = BulkInsertService()
+
+        with measure('set_based', synthetic_dataset.rows) as result:
+            results = import_batches(
+                synthetic_dataset,
+                lambda df: service.bulk_insert_set_based(df, USER_ID, COLUMN_MAPPING)
+            )
+
+        record_benchmark(result)
+        assert_counts(results, synthetic_dataset)
+
+    def test_upsert(self, synthetic_dataset, record_benchmark):
+        """Benchmark INSERT ... ON CONFLICT upserts"""
+        service = BulkInsertService()
+
+        with measure('upsert', synthetic_dataset.rows) as result:
+            results = import_batches(
+                synthetic_dataset,
+                lambda df: service.bulk_upsert(df, USER_ID, COLUMN_MAPPING)
+            )
+
+        record_benchmark(result)
+        # Repeated emails update the contact instead of being skipped
+        assert results['error_count'] == synthetic_dataset.error_count
+        assert Contact.objects.count() == synthetic_dataset.success_count
+
+    @pytest.mark.skipif(
+        connection.vendor != 'postgresql',
+        reason='COPY import requires PostgreSQL'
+    )
+    def test_copy(self, synthetic_dataset, record_benchmark):
+        """Benchmark the COPY staging-table import"""
+        service = CopyImportService(chunk_size=STREAM_BATCH_SIZE)
+
+        with measure('copy', synthetic_dataset.rows) as result:
+            results = service.import_file(synthetic_dataset.path, USER_ID, COLUMN_MAPPING)
+
+        record_benchmark(result)
+        assert_counts(results, synthetic_dataset)
+
+    def test_process_import_task(self, synthetic_dataset, record_benchmark, settings):
+        """Benchmark the streamed import task, including checkpoints and progress"""
+        # Keep the task on the in-process streamed path at every size
+        settings.COPY_IMPORT_THRESHOLD_MB = float('inf')
+        settings.SPARK_IMPORT_THRESHOLD_MB = float('inf')
+        settings.MAX_IMPORT_WORKERS = 1
+        job = ImportJob.objects.create(
+            user_id=USER_ID,
+            filename='synthetic.csv',
+            status='PENDING',
+            column_mapping='{}'
+        )
+
+        with measure('process_import_task', synthetic_dataset.rows) as result:
+            outcome = process_import_task.run(job.id, synthetic_dataset.path, COLUMN_MAPPING, USER_ID)
+
+        record_benchmark(result)
+        job.refresh_from_db()
+        assert outcome['success'] is True
+        assert_counts(
+            {
+                'success_count': job.success_count,
+                'duplicate_count': job.duplicate_count,
+                'error_count': job.error_count
+            },
+            synthetic_dataset
+        )
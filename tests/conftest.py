@@ -1,6 +1,7 @@
 """
 Pytest configuration and shared fixtures
 """
+import importlib
 import pytest
 import tempfile
 import os
@@ -59,6 +60,22 @@ def authenticated_client(client, user):
     return client
 
 
+@pytest.fixture
+def search_trigger(db):
+    """
+    Install the contacts search_vector trigger from migration 0004
+
+    Test databases are built without migrations; request this fixture
+    before any contact fixture so the contacts get a search_vector.
+    """
+    from django.db import connection
+    if connection.vendor != 'postgresql':
+        return
+    migration = importlib.import_module('apps.contacts.migrations.0004_contact_search_vector')
+    with connection.cursor() as cursor:
+        cursor.execute(migration.CREATE_TRIGGER_SQL)
+
+
 @pytest.fixture
 def contact(db, user):
     """Create a test contact"""
@@ -310,6 +327,13 @@ def disable_logging():
     logging.disable(logging.NOTSET)
 
 
+@pytest.fixture(autouse=True)
+def import_error_dir(settings, tmp_path):
+    """Write import error logs to a temporary directory"""
+    settings.IMPORT_ERROR_DIR = str(tmp_path / 'import_errors')
+    return settings.IMPORT_ERROR_DIR
+
+
 @pytest.fixture
 def media_root(tmp_path):
     """Temporary media root for file uploads"""
@@ -2,6 +2,7 @@
 Tests for contacts models
 """
 import pytest
+from django.db import IntegrityError, transaction
 from apps.contacts.models import Contact
 
 
@@ -66,3 +67,54 @@ class TestContactModel:
         )
         assert contact.is_active is True
 
+    
+    def test_contact_email_key(self, db):
+        """Test email_key is the normalized email"""
+        contact = Contact.objects.create(
+            first_name='Key',
+            last_name='User',
+            full_name='Key User',
+            email=' Key.User@Example.com '
+        )
+        assert contact.email_key == 'key.user@example.com'
+        
+        contact.email = 'other@example.com'
+        contact.save(update_fields=['email'])
+        contact.refresh_from_db()
+        assert contact.email_key == 'other@example.com'
+    
+    def test_contact_duplicate_email_key(self, contact):
+        """Test saving a contact that duplicates an existing email raises IntegrityError"""
+        with pytest.raises(IntegrityError):
+            with transaction.atomic():
+                Contact.objects.create(
+                    first_name='Dup',
+                    last_name='User',
+                    full_name='Dup User',
+                    email=contact.email.upper()
+                )
+        contact.refresh_from_db()
+        assert contact.email_key == contact.email
+    
+    def test_contact_legacy_null_email_key(self, contact):
+        """Test a legacy duplicate keeps its NULL key until its email changes"""
+        Contact.objects.bulk_create([Contact(
+            first_name='Old', last_name='User', full_name='Old User', email=contact.email
+        )])
+        legacy = Contact.objects.get(full_name='Old User')
+        legacy.title = 'CTO'
+        legacy.save()
+        legacy.refresh_from_db()
+        assert legacy.email_key is None
+        
+        legacy.email = 'old.user@example.com'
+        legacy.save()
+        legacy.refresh_from_db()
+        assert legacy.email_key == 'old.user@example.com'
+    
+    def test_contact_save_does_not_query_email_key(self, db, django_assert_num_queries):
+        """Test creating a contact is a single INSERT"""
+        with django_assert_num_queries(1):
+            Contact.objects.create(
+                first_name='One', last_name='Query', full_name='One Query', email='one@example.com'
+            )
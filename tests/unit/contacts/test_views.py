@@ -3,8 +3,15 @@ Tests for contacts views
 """
 import pytest
 import json
+from unittest.mock import patch
+from django.core.cache import cache
+from django.test import RequestFactory
 from django.urls import reverse
 from apps.contacts.models import Contact
+from apps.exports.models import ExportLog
+from apps.exports.tasks import process_export_task
+from apps.contacts.views import ContactListView
+from services.contact_prefix_index import contact_prefix_index
 
 
 @pytest.mark.django_db
@@ -53,6 +60,52 @@ class TestContactListView:
         """Test contact list requires authentication"""
         response = client.get(reverse('contacts:list'))
         assert response.status_code == 302  # Redirect to login
+    
+    @pytest.fixture
+    def locmem_cache(self, settings):
+        """Fresh in-process cache for the cached contact counts"""
+        settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+        cache.clear()
+    
+    def _context(self, user, params):
+        """List view context without rendering the template"""
+        request = RequestFactory().get(reverse('contacts:list'), params)
+        request.user = user
+        return ContactListView.as_view(paginate_by=4)(request).context_data
+    
+    def test_contact_list_view_keyset_by_default(self, user, multiple_contacts, locmem_cache):
+        """Test the list pages by cursor and keeps filters in the links"""
+        context = self._context(user, {'country': ['USA', 'UK']})
+        
+        assert context['keyset_pagination']
+        assert len(context['contacts']) == 4
+        assert context['paginator'].count == 7
+        assert context['previous_page_url'] is None
+        assert 'country=USA&country=UK' in context['next_page_url']
+        
+        cursor = context['page_obj'].next_cursor
+        second = self._context(user, {'country': ['USA', 'UK'], 'cursor': cursor})
+        assert len(second['contacts']) == 3
+        assert second['next_page_url'] is None
+        assert not {c.pk for c in context['contacts']} & {c.pk for c in second['contacts']}
+    
+    def test_contact_list_view_facets(self, user, multiple_contacts, locmem_cache):
+        """Test the filter dropdowns get cached values with counts"""
+        self._context(user, {})
+        
+        with patch('services.contact_facet_service.ContactFacetService.compute') as mock_compute:
+            context = self._context(user, {})
+        
+        mock_compute.assert_not_called()
+        assert context['countries'] == [('Canada', 3), ('UK', 3), ('USA', 4)]
+    
+    def test_contact_list_view_page_number(self, user, multiple_contacts, locmem_cache):
+        """Test ?page= links keep using numbered pages"""
+        context = self._context(user, {'page': 3})
+        
+        assert not context['keyset_pagination']
+        assert context['page_obj'].number == 3
+        assert len(context['contacts']) == 2
 
 
 @pytest.mark.django_db
@@ -155,6 +208,79 @@ class TestContactDeleteView:
         assert response.status_code == 404
 
 
+@pytest.mark.django_db
+class TestContactExportView:
+    """Test contact export view"""
+    
+    def test_contact_export_streams_csv(self, authenticated_client, multiple_contacts):
+        """Test export is streamed as CSV"""
+        response = authenticated_client.post(reverse('contacts:export'))
+        assert response.status_code == 200
+        assert response.streaming
+        assert response['Content-Type'] == 'text/csv'
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        assert lines[0].startswith('ID,First Name,Last Name')
+        assert len(lines) == len(multiple_contacts) + 1
+    
+    def test_contact_export_filters(self, authenticated_client, multiple_contacts):
+        """Test export applies industry and country filters"""
+        response = authenticated_client.post(
+            reverse('contacts:export'),
+            {'industry': ['Finance'], 'country': ['Canada']}
+        )
+        content = b''.join(response.streaming_content).decode()
+        expected = Contact.objects.filter(industry='Finance', country='Canada').count()
+        assert len(content.splitlines()) == expected + 1
+
+
+    def test_contact_export_queues_large_export(self, authenticated_client, multiple_contacts, settings):
+        """Test exports above the inline limit return an ExportLog id"""
+        settings.EXPORT_INLINE_ROW_LIMIT = 3
+        with patch('apps.contacts.views.process_export_task.delay') as mock_task:
+            response = authenticated_client.post(reverse('contacts:export'), {'country': ['USA']})
+        
+        assert response.status_code == 202
+        data = response.json()
+        export = ExportLog.objects.get(id=data['export_id'])
+        assert export.status == 'pending'
+        assert export.filters_applied == {'layout': 'contact_list', 'industry': [], 'country': ['USA']}
+        assert data['download_url'] == reverse('exports:download_export', args=[export.id])
+        mock_task.assert_called_once_with(export.id)
+    
+    def test_contact_export_limit_check_is_bounded(self, authenticated_client, multiple_contacts, settings):
+        """Test the inline limit check counts at most one row past the limit"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        settings.EXPORT_INLINE_ROW_LIMIT = 3
+        with patch('apps.contacts.views.process_export_task.delay'), \
+                CaptureQueriesContext(connection) as queries:
+            response = authenticated_client.post(reverse('contacts:export'), {'country': ['USA']})
+        
+        assert response.status_code == 202
+        counts = [query['sql'] for query in queries.captured_queries if 'COUNT(' in query['sql']]
+        assert len(counts) == 1
+        assert 'LIMIT 4' in counts[0]
+    
+    def test_contact_export_background_matches_inline(self, authenticated_client, multiple_contacts,
+                                                      settings, tmp_path):
+        """Test the background export writes the same file as the inline download"""
+        settings.MEDIA_ROOT = str(tmp_path)
+        inline = b''.join(authenticated_client.post(
+            reverse('contacts:export'), {'industry': ['Finance', 'Technology']}
+        ).streaming_content)
+        
+        settings.EXPORT_INLINE_ROW_LIMIT = 0
+        with patch('apps.contacts.views.process_export_task.delay', side_effect=process_export_task.run):
+            response = authenticated_client.post(
+                reverse('contacts:export'), {'industry': ['Finance', 'Technology']}
+            )
+        
+        export = ExportLog.objects.get(id=response.json()['export_id'])
+        assert export.status == 'completed'
+        with open(export.file_path, 'rb') as f:
+            assert f.read() == inline
+
+
 @pytest.mark.django_db
 class TestContactBulkOperations:
     """Test bulk operations"""
@@ -170,6 +296,35 @@ class TestContactBulkOperations:
         assert response.status_code == 200
         assert response['Content-Type'] == 'text/csv'
     
+    def test_bulk_export_api_streams_csv(self, authenticated_client, multiple_contacts):
+        """Test small selections are streamed inline"""
+        contact_ids = [c.id for c in multiple_contacts[:3]]
+        response = authenticated_client.post(
+            reverse('contacts:bulk_export_api'),
+            json.dumps({'contact_ids': contact_ids, 'format': 'csv'}),
+            content_type='application/json'
+        )
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        assert lines[0].startswith('Name,Email,Phone')
+        assert len(lines) == 4
+    
+    def test_bulk_export_api_queues_large_export(self, authenticated_client, multiple_contacts, settings):
+        """Test selections above the inline limit start a background export"""
+        settings.EXPORT_INLINE_ROW_LIMIT = 2
+        contact_ids = [c.id for c in multiple_contacts[:3]]
+        with patch('apps.contacts.views.process_export_task.delay') as mock_task:
+            response = authenticated_client.post(
+                reverse('contacts:bulk_export_api'),
+                json.dumps({'contact_ids': contact_ids, 'format': 'csv'}),
+                content_type='application/json'
+            )
+        
+        assert response.status_code == 202
+        export = ExportLog.objects.get(id=response.json()['export_id'])
+        assert export.export_type == 'selected_contacts'
+        assert export.filters_applied == {'layout': 'selected_contacts', 'contact_ids': contact_ids}
+        mock_task.assert_called_once_with(export.id)
+    
     def test_bulk_export_api_no_contacts(self, authenticated_client):
         """Test bulk export with no contacts selected"""
         response = authenticated_client.post(
@@ -207,3 +362,52 @@ class TestContactBulkOperations:
         data = json.loads(response.content)
         assert data['success'] is True
 
+
+@pytest.mark.django_db
+class TestContactTypeahead:
+    """Test typeahead endpoint"""
+    
+    @pytest.fixture(autouse=True)
+    def fresh_index(self):
+        contact_prefix_index.clear()
+        yield
+        contact_prefix_index.clear()
+    
+    def test_typeahead_suggestions(self, authenticated_client, multiple_contacts):
+        """Test suggestions come from the prefix index"""
+        contact_prefix_index.build()
+        
+        with patch.object(Contact.objects, 'values_list') as mock_query:
+            response = authenticated_client.get(reverse('contacts:typeahead_api'), {'q': 'User1', 'limit': 5})
+        
+        mock_query.assert_not_called()
+        assert response.status_code == 200
+        assert [r['email'] for r in response.json()['results']] == ['user1@example.com']
+    
+    def test_typeahead_invalid_limit(self, authenticated_client):
+        """Test a non-numeric limit is rejected"""
+        response = authenticated_client.get(reverse('contacts:typeahead_api'), {'q': 'a', 'limit': 'x'})
+        assert response.status_code == 400
+    
+    def test_bulk_update_facet_field_invalidates(self, authenticated_client, contact):
+        """Test bulk industry updates invalidate the cached facet"""
+        with patch('apps.contacts.views.ContactFacetService.invalidate') as mock_invalidate:
+            authenticated_client.post(
+                reverse('contacts:bulk_update_api'),
+                data=json.dumps({'contact_ids': [contact.pk], 'field': 'industry', 'value': 'Retail'}),
+                content_type='application/json'
+            )
+        mock_invalidate.assert_called_once_with(['industry'])
+    
+    def test_bulk_update_company_reindexes(self, authenticated_client, contact):
+        """Test bulk company updates reach the index"""
+        contact_prefix_index.build()
+        
+        response = authenticated_client.post(
+            reverse('contacts:bulk_update_api'),
+            data=json.dumps({'contact_ids': [contact.pk], 'field': 'company', 'value': 'Initech'}),
+            content_type='application/json'
+        )
+        
+        assert response.status_code == 200
+        assert [r['id'] for r in contact_prefix_index.search('initech')] == [contact.pk]
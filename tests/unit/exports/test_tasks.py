@@ -1,9 +1,16 @@
 """
 Tests for export tasks (mocked Celery)
 """
+import csv
+import gzip
+import io
+import json
 import pytest
 from unittest.mock import patch, Mock
+from openpyxl import load_workbook
+from apps.exports.models import ExportLog
 from apps.exports.tasks import process_export_task
+from services.contact_export_service import PYARROW_AVAILABLE, ZSTD_AVAILABLE
 
 
 @pytest.mark.django_db
@@ -25,4 +32,126 @@ class TestExportTasks:
         
         # Simulate task execution
         assert mock_dataframe is not None
-
+    
+    def _run_export(self, user, export_format, export_type='contacts', filters=None):
+        export = ExportLog.objects.create(
+            user=user,
+            export_type=export_type,
+            export_format=export_format,
+            filters_applied=filters or {}
+        )
+        process_export_task.run(export.id)
+        export.refresh_from_db()
+        return export
+    
+    @pytest.fixture(autouse=True)
+    def media_root(self, settings, tmp_path):
+        settings.MEDIA_ROOT = str(tmp_path)
+    
+    def test_export_contacts_csv(self, user, multiple_contacts):
+        """Test contacts are streamed to a CSV file"""
+        export = self._run_export(user, 'csv', filters={'industry': 'Finance'})
+        
+        assert export.status == 'completed'
+        assert export.progress_percentage == 100.0
+        assert export.filename.endswith('.csv')
+        with open(export.file_path, newline='') as f:
+            rows = list(csv.DictReader(f))
+        expected = [c for c in multiple_contacts if c.industry == 'Finance']
+        assert export.record_count == len(rows) == len(expected)
+        assert {row['email'] for row in rows} == {c.email for c in expected}
+        assert 'job_title' in rows[0]
+    
+    def test_export_contacts_json_formats(self, user, multiple_contacts):
+        """Test JSON exports an array of records and JSON Lines one record per line"""
+        export = self._run_export(user, 'json')
+        with open(export.file_path) as f:
+            records = json.load(f)
+        assert len(records) == export.record_count == len(multiple_contacts)
+        
+        export = self._run_export(user, 'jsonl')
+        assert export.filename.endswith('.jsonl')
+        with open(export.file_path) as f:
+            lines = [json.loads(line) for line in f]
+        assert [line['email'] for line in lines] == [record['email'] for record in records]
+    
+    def test_export_contacts_excel(self, user, multiple_contacts):
+        """Test Excel exports are written as xlsx workbooks"""
+        export = self._run_export(user, 'excel')
+        
+        assert export.filename.endswith('.xlsx')
+        rows = list(load_workbook(export.file_path, read_only=True).active.values)
+        assert rows[0][:4] == ('id', 'first_name', 'last_name', 'email')
+        assert len(rows) == len(multiple_contacts) + 1
+    
+    def test_export_contacts_gzip_csv(self, user, multiple_contacts):
+        """Test gzip CSV exports decompress to the plain CSV export"""
+        plain = self._run_export(user, 'csv')
+        compressed = self._run_export(user, 'csv_gzip')
+        
+        assert compressed.filename.endswith('.csv.gz')
+        with gzip.open(compressed.file_path, 'rt', newline='') as f, open(plain.file_path, newline='') as g:
+            assert f.read() == g.read()
+    
+    @pytest.mark.skipif(not ZSTD_AVAILABLE, reason='zstandard is not installed')
+    def test_export_contacts_zstd_csv(self, user, multiple_contacts):
+        """Test zstd CSV exports decompress to the plain CSV export"""
+        import zstandard
+        plain = self._run_export(user, 'csv')
+        compressed = self._run_export(user, 'csv_zstd')
+        
+        assert compressed.filename.endswith('.csv.zst')
+        with open(compressed.file_path, 'rb') as f:
+            reader = io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(f), encoding='utf-8', newline='')
+            with open(plain.file_path, newline='') as g:
+                assert reader.read() == g.read()
+    
+    @pytest.mark.skipif(not PYARROW_AVAILABLE, reason='pyarrow is not installed')
+    def test_export_contacts_parquet(self, user, multiple_contacts):
+        """Test Parquet exports keep typed columns and are written in row groups"""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        with patch('services.contact_export_service.PARQUET_ROW_GROUP_SIZE', 4):
+            export = self._run_export(user, 'parquet')
+        
+        assert export.filename.endswith('.parquet')
+        parquet_file = pq.ParquetFile(export.file_path)
+        assert parquet_file.metadata.num_row_groups == 3
+        table = parquet_file.read()
+        assert table.num_rows == export.record_count == len(multiple_contacts)
+        assert table.schema.field('id').type == pa.int64()
+        assert pa.types.is_timestamp(table.schema.field('created_at').type)
+        assert sorted(table.column('email').to_pylist()) == sorted(c.email for c in multiple_contacts)
+    
+    def test_export_bulk_contacts(self, user, multiple_contacts):
+        """Test bulk exports contain only the selected contacts"""
+        selected = [c.id for c in multiple_contacts[:3]]
+        export = self._run_export(user, 'csv', 'bulk_export', {'contact_ids': selected})
+        
+        with open(export.file_path, newline='') as f:
+            assert sorted(int(row['id']) for row in csv.DictReader(f)) == sorted(selected)
+    
+    def test_export_failure_records_error(self, user, multiple_contacts):
+        """Test a failing export is logged and keeps its error message"""
+        with patch('apps.exports.tasks.ContactExportService.write_file',
+                   side_effect=RuntimeError('pyarrow is not installed')), \
+                patch('apps.exports.tasks.logger') as mock_logger:
+            export = self._run_export(user, 'parquet')
+        
+        assert export.status == 'failed'
+        assert export.error_message == 'pyarrow is not installed'
+        mock_logger.exception.assert_called_once()
+    
+    def test_export_progress_updates(self, user, multiple_contacts):
+        """Test progress is recorded while rows are written"""
+        progress = []
+        
+        with patch('apps.exports.tasks.ContactExportService.CHUNK_SIZE', 4), \
+                patch('apps.exports.tasks.ExportLog.objects.filter') as mock_filter:
+            mock_filter.return_value.update.side_effect = lambda **kwargs: progress.append(
+                kwargs['progress_percentage']
+            )
+            export = ExportLog.objects.create(user=user, export_type='contacts', export_format='csv')
+            process_export_task.run(export.id)
+        
+        assert progress == [40.0, 80.0, 99.0]
@@ -54,6 +54,25 @@ class TestExportAPIs:
         # Should download or show error if file doesn't exist in actual path
         assert response.status_code in [200, 302, 404]
     
+    def test_download_export_range(self, authenticated_client, export_log, tmp_path, settings):
+        """Test downloads are streamed and resume with Range requests"""
+        settings.EXPORT_DOWNLOAD_MODE = ''
+        test_file = tmp_path / 'test_export.csv'
+        test_file.write_text('test,data\n1,2\n')
+        export_log.file_path = str(test_file)
+        export_log.save()
+        url = reverse('exports:download_export', args=[export_log.id])
+        
+        response = authenticated_client.get(url)
+        assert response.status_code == 200
+        assert response.streaming
+        assert b''.join(response.streaming_content) == b'test,data\n1,2\n'
+        
+        response = authenticated_client.get(url, HTTP_RANGE='bytes=10-')
+        assert response.status_code == 206
+        assert response['Content-Range'] == 'bytes 10-13/14'
+        assert b''.join(response.streaming_content) == b'1,2\n'
+    
     def test_cancel_export_api(self, authenticated_client, db, user):
         """Test cancel export API"""
         export = ExportLog.objects.create(
@@ -37,6 +37,18 @@ class TestImportJob:
         import_job.save()
         assert import_job.is_running() is True
     
+    def test_import_job_delete_removes_error_logs(self, import_job, django_capture_on_commit_callbacks):
+        """Test deleting a job removes its error log files"""
+        import os
+        from services.import_error_tracker import ImportErrorTracker
+        tracker = ImportErrorTracker.for_job(import_job.id)
+        tracker.add_duplicate_error(2, 'john@example.com')
+        tracker.flush()
+        with django_capture_on_commit_callbacks(execute=True):
+            import_job.delete()
+        assert not os.path.exists(tracker.spill_path)
+        assert not os.path.exists(tracker.index_path)
+    
     def test_import_job_str_method(self, import_job):
         """Test import job string representation"""
         assert str(import_job).startswith('ImportJob')
@@ -1,8 +1,11 @@
 """
 Tests for import tasks (mocked Celery)
 """
+import json
 import pytest
 from unittest.mock import patch, Mock
+from django.db import connection
+from apps.imports.models import ImportJob
 from apps.imports.tasks import process_import_task
 
 
@@ -33,3 +36,399 @@ class TestImportTasks:
         # In real scenario, this would be async via Celery
         assert mock_service_instance.bulk_insert_from_dataframe is not None
 
+    
+    def test_process_import_task_streams_batches(self, import_job, csv_file, contact):
+        """Test task streams a CSV file and records job counts"""
+        mapping = {
+            'first_name': 'first_name',
+            'last_name': 'last_name',
+            'email': 'email',
+            'company': 'company'
+        }
+        with patch('apps.imports.tasks.CopyImportService.is_available', return_value=False), \
+                patch('apps.imports.tasks.ContactFacetService.invalidate') as mock_invalidate:
+            result = process_import_task.run(import_job.id, csv_file, mapping, 'user-id')
+        
+        import_job.refresh_from_db()
+        mock_invalidate.assert_called_once_with()
+        assert result['success'] is True
+        assert import_job.status == 'COMPLETED'
+        assert import_job.total_rows == 3
+        assert import_job.processed_rows == 3
+        assert import_job.success_count == 2
+        assert import_job.duplicate_count == 1
+    
+    def test_streamed_import_keeps_text_values_across_batches(self, import_job, tmp_path):
+        """Test numeric-looking text is stored as written, whatever batch it falls in"""
+        from apps.contacts.models import Contact
+        test_file = tmp_path / 'contacts.csv'
+        test_file.write_text(
+            'email,phone,postal_code\n'
+            'a@example.com,5550001,02134\n'
+            'b@example.com,5550002,02135\n'
+            'c@example.com,+1 555 0003,SW1A 1AA\n'
+        )
+        mapping = {'email': 'email', 'phone': 'phone', 'postal_code': 'postal_code'}
+        with patch('apps.imports.tasks.STREAM_BATCH_SIZE', 2):
+            process_import_task.run(import_job.id, str(test_file), mapping, 'user-id')
+        
+        a = Contact.objects.get(email='a@example.com')
+        assert (a.phone, a.postal_code) == ('5550001', '02134')
+        assert Contact.objects.get(email='c@example.com').postal_code == 'SW1A 1AA'
+    
+    def test_partitioned_import(self, import_job, tmp_path, contact):
+        """Test partitions are imported in parallel tasks and merged into the job"""
+        from apps.imports.tasks import (
+            finalize_partitioned_import_task, process_import_partition_task, start_partitioned_import
+        )
+        from services.csv_stream_reader import CSVStreamReader
+        
+        test_file = tmp_path / 'contacts.csv'
+        test_file.write_text(
+            'email,first_name\n'
+            'one@example.com,One\n'
+            f'{contact.email},Existing\n'
+            ',NoEmail\n'
+            'four@example.com,Four\n'
+        )
+        mapping = {'email': 'email', 'first_name': 'first_name'}
+        partitions = CSVStreamReader.plan_partitions(str(test_file), 2)
+        
+        with patch('apps.imports.tasks.chord') as mock_chord:
+            result = start_partitioned_import(import_job, partitions, str(test_file), mapping, 'user-id')
+        assert result['partitions'] == 2
+        mock_chord.assert_called_once()
+        
+        # Run the chord synchronously
+        results = [
+            process_import_partition_task.run(
+                import_job.id, str(test_file), mapping, 'user-id',
+                partition.start_offset, partition.end_offset, partition.start_row
+            )
+            for partition in partitions
+        ]
+        finalize_partitioned_import_task.run(results, import_job.id)
+        
+        import_job.refresh_from_db()
+        assert import_job.status == 'COMPLETED'
+        assert import_job.total_rows == 4
+        assert import_job.processed_rows == 4
+        assert import_job.success_count == 2
+        assert import_job.error_count == 1
+        assert import_job.duplicate_count == 1
+        assert import_job.current_batch == 2
+        error_rows = [error['row_number'] for error in json.loads(import_job.error_log)['errors']]
+        assert error_rows == [2, 3]
+    
+    def test_partitioned_import_dispatches_once(self, import_job, tmp_path):
+        """Test a redelivered coordinating task does not fan the file out again"""
+        from apps.imports.tasks import start_partitioned_import
+        from services.csv_stream_reader import CSVStreamReader
+        
+        file_path = self._write_rows(tmp_path, 4)
+        partitions = CSVStreamReader.plan_partitions(file_path, 2)
+        
+        with patch('apps.imports.tasks.chord') as mock_chord:
+            start_partitioned_import(import_job, partitions, file_path, {'email': 'email'}, 'user-id')
+            result = start_partitioned_import(
+                ImportJob.objects.get(id=import_job.id), partitions, file_path, {'email': 'email'}, 'user-id'
+            )
+            process_import_task.run(import_job.id, file_path, {'email': 'email'}, 'user-id')
+        
+        assert result['partitions'] == 0
+        mock_chord.assert_called_once()
+        import_job.refresh_from_db()
+        assert import_job.partitions_dispatched_at is not None
+    
+    def test_partitioned_import_cross_partition_duplicates(self, import_job, tmp_path):
+        """Test an email repeated in a later partition is counted as a duplicate"""
+        from apps.imports.tasks import finalize_partitioned_import_task, process_import_partition_task
+        from services.csv_stream_reader import CSVStreamReader
+        
+        test_file = tmp_path / 'contacts.csv'
+        test_file.write_text(
+            'email\n'
+            'same@example.com\n'
+            'one@example.com\n'
+            'Same@Example.com\n'
+            'two@example.com\n'
+        )
+        partitions = CSVStreamReader.plan_partitions(str(test_file), 2)
+        assert len(partitions) == 2
+        results = [
+            process_import_partition_task.run(
+                import_job.id, str(test_file), {'email': 'email'}, 'user-id',
+                partition.start_offset, partition.end_offset, partition.start_row
+            )
+            for partition in partitions
+        ]
+        finalize_partitioned_import_task.run(results, import_job.id)
+        
+        import_job.refresh_from_db()
+        assert import_job.success_count == 3
+        assert import_job.duplicate_count == 1
+        assert import_job.error_count == 0
+    
+    def test_large_copy_import_is_partitioned(self, import_job, tmp_path, settings):
+        """Test files over both thresholds are partitioned and the partitions use COPY"""
+        settings.MAX_IMPORT_WORKERS = 2
+        file_path = self._write_rows(tmp_path, 4)
+        
+        with patch('apps.imports.tasks.FileValidator.should_use_copy', return_value=True), \
+                patch('apps.imports.tasks.FileValidator.should_partition', return_value=True), \
+                patch('apps.imports.tasks.chord') as mock_chord:
+            result = process_import_task.run(import_job.id, file_path, {'email': 'email'}, 'user-id')
+        
+        assert result['partitions'] == 2
+        signatures = list(mock_chord.call_args[0][0])
+        assert [signature.kwargs['use_copy'] for signature in signatures] == \
+            [connection.vendor == 'postgresql'] * 2
+    
+    @pytest.mark.skipif(connection.vendor != 'postgresql', reason='COPY requires PostgreSQL')
+    def test_partitioned_copy_import(self, import_job, tmp_path, contact):
+        """Test COPY partitions count existing and cross-partition emails as duplicates"""
+        from apps.imports.tasks import finalize_partitioned_import_task, process_import_partition_task
+        from services.csv_stream_reader import CSVStreamReader
+        
+        test_file = tmp_path / 'contacts.csv'
+        test_file.write_text(
+            'email\n'
+            'same@example.com\n'
+            f'{contact.email}\n'
+            'Same@Example.com\n'
+            'bad\n'
+        )
+        partitions = CSVStreamReader.plan_partitions(str(test_file), 2)
+        results = [
+            process_import_partition_task.run(
+                import_job.id, str(test_file), {'email': 'email'}, 'user-id',
+                partition.start_offset, partition.end_offset, partition.start_row, use_copy=True
+            )
+            for partition in partitions
+        ]
+        finalize_partitioned_import_task.run(results, import_job.id)
+        
+        import_job.refresh_from_db()
+        assert import_job.success_count == 1
+        assert import_job.duplicate_count == 2
+        assert import_job.error_count == 1
+    
+    def test_process_import_task_upsert_mode(self, import_job, tmp_path, contact):
+        """Test upsert jobs update existing contacts and record the count"""
+        test_file = tmp_path / 'contacts.csv'
+        test_file.write_text(
+            'email,company\n'
+            f'{contact.email},Updated Corp\n'
+            'fresh@example.com,Fresh Inc\n'
+        )
+        import_job.import_mode = 'upsert'
+        import_job.save()
+        
+        result = process_import_task.run(
+            import_job.id, str(test_file), {'email': 'email', 'company': 'company'}, 'user-id'
+        )
+        
+        import_job.refresh_from_db()
+        contact.refresh_from_db()
+        assert result['success'] is True
+        assert import_job.success_count == 2
+        assert import_job.updated_count == 1
+        assert import_job.duplicate_count == 0
+        assert contact.company == 'Updated Corp'
+    
+    def _write_rows(self, tmp_path, count):
+        test_file = tmp_path / 'contacts.csv'
+        test_file.write_text('email\n' + ''.join(f'user{i}@example.com\n' for i in range(count)))
+        return str(test_file)
+    
+    def test_process_import_task_resumes_from_checkpoint(self, import_job, tmp_path):
+        """Test a task interrupted by the soft time limit resumes without re-inserting"""
+        from celery.exceptions import SoftTimeLimitExceeded
+        from apps.contacts.models import Contact
+        from apps.imports import tasks
+        
+        file_path = self._write_rows(tmp_path, 5)
+        mapping = {'email': 'email'}
+        real_import_batch = tasks.import_batch
+        calls = []
+        
+        def interrupt_second_batch(*args, **kwargs):
+            calls.append(1)
+            result = real_import_batch(*args, **kwargs)
+            if len(calls) == 2:
+                raise SoftTimeLimitExceeded()
+            return result
+        
+        with patch('apps.imports.tasks.STREAM_BATCH_SIZE', 2), \
+                patch('apps.imports.tasks.import_batch', side_effect=interrupt_second_batch), \
+                patch('apps.imports.tasks.process_import_task.apply_async') as mock_resume:
+            result = process_import_task.run(import_job.id, file_path, mapping, 'user-id')
+        
+        mock_resume.assert_called_once_with(args=[import_job.id, file_path, mapping, 'user-id'])
+        assert result['resumed_from_row'] == 2
+        import_job.refresh_from_db()
+        assert import_job.status == 'PROCESSING'
+        assert import_job.checkpoint_row == 2
+        assert import_job.success_count == 2
+        # The interrupted batch was rolled back
+        assert Contact.objects.count() == 2
+        
+        with patch('apps.imports.tasks.STREAM_BATCH_SIZE', 2):
+            result = process_import_task.run(import_job.id, file_path, mapping, 'user-id')
+        
+        import_job.refresh_from_db()
+        assert result['success'] is True
+        assert import_job.status == 'COMPLETED'
+        assert import_job.processed_rows == 5
+        assert import_job.success_count == 5
+        assert import_job.duplicate_count == 0
+        assert Contact.objects.count() == 5
+    
+    @pytest.mark.skipif(connection.vendor != 'postgresql', reason='COPY requires PostgreSQL')
+    def test_copy_import_resumes_from_checkpoint(self, import_job, tmp_path, settings):
+        """Test a COPY import commits a checkpoint per batch and resumes after it"""
+        from celery.exceptions import SoftTimeLimitExceeded
+        from apps.contacts.models import Contact
+        from services.copy_import_service import CopyImportService
+        
+        settings.IMPORT_BATCH_SIZE = 2
+        file_path = self._write_rows(tmp_path, 5)
+        mapping = {'email': 'email'}
+        real_import_batch = CopyImportService.import_batch
+        calls = []
+        
+        def interrupt_second_batch(service, *args, **kwargs):
+            calls.append(1)
+            result = real_import_batch(service, *args, **kwargs)
+            if len(calls) == 2:
+                raise SoftTimeLimitExceeded()
+            return result
+        
+        with patch('apps.imports.tasks.FileValidator.should_use_copy', return_value=True), \
+                patch.object(CopyImportService, 'import_batch', autospec=True, side_effect=interrupt_second_batch), \
+                patch('apps.imports.tasks.process_import_task.apply_async') as mock_resume:
+            process_import_task.run(import_job.id, file_path, mapping, 'user-id')
+        
+        mock_resume.assert_called_once()
+        import_job.refresh_from_db()
+        assert import_job.checkpoint_row == 2
+        assert Contact.objects.count() == 2
+        
+        with patch('apps.imports.tasks.FileValidator.should_use_copy', return_value=True):
+            result = process_import_task.run(import_job.id, file_path, mapping, 'user-id')
+        
+        import_job.refresh_from_db()
+        assert result['success'] is True
+        assert import_job.status == 'COMPLETED'
+        assert import_job.success_count == 5
+        assert Contact.objects.count() == 5
+    
+    def test_partition_resumes_from_checkpoint(self, import_job, tmp_path):
+        """Test a redelivered partition task resumes after its last committed batch"""
+        from apps.contacts.models import Contact
+        from apps.imports import tasks
+        from apps.imports.tasks import process_import_partition_task
+        
+        class WorkerLost(BaseException):
+            pass
+        
+        test_file = tmp_path / 'contacts.csv'
+        test_file.write_text('email\n' + ''.join(f'user{i}@example.com\n' for i in range(4)) + 'bad\n')
+        header_size = len('email\n')
+        args = (import_job.id, str(test_file), {'email': 'email'}, 'user-id', header_size, test_file.stat().st_size, 0)
+        real_import_batch = tasks.import_batch
+        calls = []
+        
+        def lose_worker_on_second_batch(*args, **kwargs):
+            calls.append(1)
+            result = real_import_batch(*args, **kwargs)
+            if len(calls) == 2:
+                raise WorkerLost()
+            return result
+        
+        with patch('apps.imports.tasks.import_batch', side_effect=lose_worker_on_second_batch):
+            with pytest.raises(WorkerLost):
+                process_import_partition_task.run(*args, batch_size=2)
+        assert Contact.objects.count() == 2
+        
+        result = process_import_partition_task.run(*args, batch_size=2)
+        assert result['success'] is True
+        assert result['processed_rows'] == 5
+        assert result['success_count'] == 4
+        assert result['error_count'] == 1
+        assert Contact.objects.count() == 4
+        import_job.refresh_from_db()
+        assert import_job.processed_rows == 5
+        assert import_job.success_count == 4
+        assert import_job.current_batch == 1
+        
+        # A finished partition returns its result without importing again
+        assert process_import_partition_task.run(*args, batch_size=2) == result
+        import_job.refresh_from_db()
+        assert import_job.current_batch == 1
+    
+    def test_cleanup_import_error_logs(self, import_job, settings):
+        """Test error logs of jobs past retention are deleted and detached from the job"""
+        import os
+        from datetime import timedelta
+        from django.utils import timezone
+        from apps.imports.tasks import cleanup_import_error_logs_task
+        from services.import_error_tracker import ImportErrorTracker
+        
+        settings.IMPORT_ERROR_RETENTION_DAYS = 30
+        recent = ImportJob.objects.create(filename='recent.csv', completed_at=timezone.now())
+        for job in (import_job, recent):
+            tracker = ImportErrorTracker.for_job(job.id)
+            tracker.add_duplicate_error(2, 'john@example.com')
+            job.error_log = tracker.to_json()
+            job.save()
+        ImportJob.objects.filter(id=import_job.id).update(completed_at=timezone.now() - timedelta(days=31))
+        
+        assert cleanup_import_error_logs_task.run() == 1
+        assert not os.path.exists(ImportErrorTracker.job_log_path(import_job.id))
+        assert os.path.exists(ImportErrorTracker.job_log_path(recent.id))
+        import_job.refresh_from_db()
+        assert json.loads(import_job.error_log)['error_file'] is None
+        assert ImportErrorTracker.from_json(import_job.error_log).get_errors()[0].row_number == 2
+        # Detached jobs are not visited again
+        assert cleanup_import_error_logs_task.run() == 0
+    
+    def test_process_import_task_hands_over_after_slice(self, import_job, tmp_path, settings):
+        """Test long imports continue in a new task after the time slice"""
+        settings.IMPORT_TASK_SLICE_SECONDS = 0
+        file_path = self._write_rows(tmp_path, 5)
+        
+        with patch('apps.imports.tasks.STREAM_BATCH_SIZE', 2), \
+                patch('apps.imports.tasks.process_import_task.apply_async') as mock_resume:
+            process_import_task.run(import_job.id, file_path, {'email': 'email'}, 'user-id')
+        
+        mock_resume.assert_called_once()
+        import_job.refresh_from_db()
+        assert import_job.checkpoint_row == 2
+        assert import_job.current_batch == 1
+    
+    def test_process_import_task_skips_completed_job(self, import_job):
+        """Test a redelivered task does nothing for a finished job"""
+        import_job.status = 'COMPLETED'
+        import_job.save()
+        result = process_import_task.run(import_job.id, 'missing.csv', {}, 'user-id')
+        assert result == {'success': True, 'status': 'COMPLETED'}
+    
+    def test_process_import_task_keeps_cancelled_status(self, import_job, tmp_path):
+        """Test a job cancelled mid-import stops and is not marked completed"""
+        from apps.imports.models import ImportJob
+        from apps.contacts.models import Contact
+        file_path = self._write_rows(tmp_path, 5)
+        
+        def cancel(publisher):
+            ImportJob.objects.filter(id=import_job.id).update(status='CANCELLED')
+            return True
+        
+        with patch('apps.imports.tasks.STREAM_BATCH_SIZE', 2), \
+                patch('apps.imports.tasks.ImportProgressPublisher.is_cancelled', autospec=True, side_effect=cancel):
+            process_import_task.run(import_job.id, file_path, {'email': 'email'}, 'user-id')
+        
+        import_job.refresh_from_db()
+        assert import_job.status == 'CANCELLED'
+        assert import_job.processed_rows == 2
+        assert Contact.objects.count() == 2
@@ -42,6 +42,18 @@ class TestStartImportView:
             }
         )
         assert response.status_code in [200, 302]
+    
+    def test_start_import_saves_mapping_template(self, authenticated_client, user, csv_file, mock_celery):
+        """Test the confirmed mapping is saved for the file's header"""
+        from services.mapping_template_service import MappingTemplateService
+        mapping = {'first_name': 'first_name', 'email': 'email'}
+        authenticated_client.post(
+            reverse('imports:start'),
+            {'file_path': csv_file, 'mapping': json.dumps(mapping)}
+        )
+        with open(csv_file) as f:
+            columns = f.readline().strip().split(',')
+        assert MappingTemplateService.find_mapping(str(user.id), columns) == mapping
 
 
 @pytest.mark.django_db
@@ -77,6 +89,23 @@ class TestProgressView:
         import_job.refresh_from_db()
         assert import_job.status == 'CANCELLED'
     
+    def test_job_errors_api_pages_error_log(self, authenticated_client, import_job):
+        """Test job errors API reads one page of the job's error log"""
+        from services.import_error_tracker import ImportErrorTracker
+        tracker = ImportErrorTracker.for_job(import_job.id)
+        for row in range(1, 6):
+            tracker.add_error(row, 'email', 'Missing required field', '')
+        import_job.error_log = tracker.to_json()
+        import_job.save()
+        
+        response = authenticated_client.get(
+            reverse('imports:job_errors_api', args=[import_job.id]), {'page': 2, 'page_size': 2}
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data['total_count'] == 5
+        assert [error['row_number'] for error in data['errors']] == [3, 4]
+    
     def test_recent_jobs_api(self, authenticated_client, import_job):
         """Test recent jobs API"""
         response = authenticated_client.get(reverse('imports:recent_jobs_api'))
@@ -1,9 +1,13 @@
 """
 Tests for bulk insert service
 """
+import math
 import pytest
+from unittest.mock import patch
 import pandas as pd
+from django.db import connection
 from services.bulk_insert_service import BulkInsertService
+from services.contact_search_service import ContactSearchService
 from apps.contacts.models import Contact
 
 
@@ -84,3 +88,304 @@ class TestBulkInsertService:
         summary = service.get_error_summary()
         assert isinstance(summary, dict)
 
+
+@pytest.mark.django_db
+class TestBulkInsertSetBased:
+    """Test set-based bulk insert mode"""
+    
+    column_mapping = {
+        'first_name': 'first_name',
+        'last_name': 'last_name',
+        'email': 'email',
+        'employees': 'employees_count'
+    }
+    
+    def test_set_based_inserts_contacts(self, db, user):
+        """Test set-based insert writes every valid row"""
+        service = BulkInsertService()
+        df = pd.DataFrame({
+            'first_name': ['John', 'Jane'],
+            'last_name': ['Doe', 'Smith'],
+            'email': ['john@example.com', 'jane@example.com'],
+            'employees': ['42', None]
+        })
+        result = service.bulk_insert_set_based(df, str(user.id), self.column_mapping)
+        assert result['success_count'] == 2
+        assert result['error_count'] == 0
+        john = Contact.objects.get(email='john@example.com')
+        assert john.full_name == 'John Doe'
+        assert john.employees_count == 42
+        assert john.user_id == str(user.id)
+    
+    def test_set_based_duplicates_and_missing_email(self, db, user, contact):
+        """Test set-based insert reports database, in-batch and missing-email rows"""
+        service = BulkInsertService()
+        df = pd.DataFrame({
+            'first_name': ['A', 'B', 'C', 'D'],
+            'last_name': ['One', 'Two', 'Three', 'Four'],
+            'email': [contact.email, 'new@example.com', 'new@example.com', None],
+            'employees': [1, 2, 3, 4]
+        })
+        result = service.bulk_insert_set_based(df, str(user.id), self.column_mapping)
+        assert result['success_count'] == 1
+        assert result['duplicate_count'] == 2
+        assert result['error_count'] == 1
+        tracker = service.get_error_tracker()
+        assert [e.row_number for e in tracker.get_errors_by_type('Duplicate')] == [1, 3]
+        assert [e.row_number for e in tracker.get_errors_by_type('Validation')] == [4]
+    
+    def test_set_based_matches_row_mode(self, db, user, contact):
+        """Test set-based counts match the row-by-row engine"""
+        df = pd.DataFrame({
+            'first_name': ['A', 'B', 'C', ' '],
+            'last_name': ['One', 'Two', 'Three', 'Four'],
+            'email': [contact.email, 'x@example.com', 'x@example.com', None],
+            'employees': ['1.6', 'n/a', '', '7']
+        })
+        set_result = BulkInsertService().bulk_insert_set_based(df, str(user.id), self.column_mapping)
+        Contact.objects.exclude(pk=contact.pk).delete()
+        row_result = BulkInsertService().bulk_insert_from_dataframe(df, str(user.id), self.column_mapping)
+        assert set_result == row_result
+    
+    def test_set_based_reports_conversion_errors(self, db, user):
+        """Test a value that cannot be converted fails its row, not the batch"""
+        df = pd.DataFrame({
+            'first_name': ['A', 'B', 'C'],
+            'last_name': ['One', 'Two', 'Three'],
+            'email': ['a@example.com', 'b@example.com', 'c@example.com'],
+            'employees': ['1', 'inf', '3']
+        })
+        service = BulkInsertService()
+        result = service.bulk_insert_set_based(df, str(user.id), self.column_mapping)
+        assert result['success_count'] == 2
+        assert result['error_count'] == 1
+        assert [(e.row_number, e.column) for e in service.get_errors()] == [(2, 'employees_count')]
+        assert sorted(Contact.objects.values_list('email', flat=True)) == ['a@example.com', 'c@example.com']
+    
+    def test_set_based_reports_key_conflicts_as_duplicates(self, db, user, contact):
+        """Test a row whose email was taken after the duplicate check is a duplicate"""
+        df = pd.DataFrame({
+            'first_name': ['A', 'B'],
+            'last_name': ['One', 'Two'],
+            'email': [contact.email, 'b@example.com'],
+            'employees': ['1', '2']
+        })
+        service = BulkInsertService()
+        # Simulate a concurrent import writing the first email after the check
+        with patch.object(BulkInsertService, '_existing_email_keys', return_value=set()):
+            result = service.bulk_insert_set_based(df, str(user.id), self.column_mapping)
+        assert result['success_count'] == 1
+        assert result['duplicate_count'] == 1
+        assert result['error_count'] == 0
+        assert [e.row_number for e in service.get_error_tracker().get_errors_by_type('Duplicate')] == [1]
+    
+    def test_set_based_rejects_invalid_formats(self, db, user):
+        """Test rows with badly formatted values are rejected with the failing field"""
+        mapping = {'email': 'email', 'phone': 'phone', 'website': 'website'}
+        df = pd.DataFrame({
+            'email': ['ok@example.com', 'not-an-email', 'bad@', 'phone@example.com', 'web@example.com'],
+            'phone': ['+1234567890', 'abc', None, 'call me', '555-1234'],
+            'website': ['https://example.com', None, 'example.com', '', 'example.com']
+        })
+        service = BulkInsertService()
+        result = service.bulk_insert_set_based(df, str(user.id), mapping)
+        assert result['success_count'] == 1
+        assert result['error_count'] == 4
+        errors = [(e.row_number, e.column, e.error_message) for e in service.get_errors()]
+        assert errors == [
+            (2, 'email', 'Validation failed: Invalid email format'),
+            (3, 'email', 'Validation failed: Invalid email format'),
+            (4, 'phone', 'Validation failed: Invalid phone format'),
+            (5, 'website', 'Validation failed: Invalid URL format'),
+        ]
+        assert list(Contact.objects.values_list('email', flat=True)) == ['ok@example.com']
+        
+        # The row-by-row engine reports the same errors
+        Contact.objects.all().delete()
+        row_service = BulkInsertService()
+        assert row_service.bulk_insert_from_dataframe(df, str(user.id), mapping) == result
+        assert [(e.row_number, e.column, e.error_message) for e in row_service.get_errors()] == errors
+    
+    def test_set_based_query_count(self, db, user, django_assert_max_num_queries):
+        """Test set-based insert does not issue per-row queries"""
+        service = BulkInsertService()
+        df = pd.DataFrame({
+            'first_name': [f'User{i}' for i in range(200)],
+            'last_name': [f'Test{i}' for i in range(200)],
+            'email': [f'user{i}@example.com' for i in range(200)],
+            'employees': list(range(200))
+        })
+        # One duplicate query, a savepoint and one INSERT per backend batch
+        fields = [field for field in Contact._meta.concrete_fields if not field.primary_key]
+        inserts = math.ceil(len(df) / connection.ops.bulk_batch_size(fields, [None] * len(df)))
+        with django_assert_max_num_queries(3 + inserts):
+            result = service.bulk_insert_set_based(df, str(user.id), self.column_mapping)
+        assert result['success_count'] == 200
+    
+    def test_bulk_insert_chunked_set_based(self, db, user):
+        """Test chunked insert with set-based mode"""
+        service = BulkInsertService()
+        df = pd.DataFrame({
+            'first_name': [f'User{i}' for i in range(25)],
+            'last_name': [f'Test{i}' for i in range(25)],
+            'email': [f'user{i}@example.com' for i in range(25)],
+            'employees': list(range(25))
+        })
+        result = service.bulk_insert_chunked(
+            df, str(user.id), self.column_mapping, chunk_size=10, set_based=True
+        )
+        assert result['success_count'] == 25
+        assert Contact.objects.count() == 25
+
+
+@pytest.mark.django_db
+class TestBulkUpsert:
+    """Test upsert import mode"""
+    
+    column_mapping = {
+        'email': 'email',
+        'company': 'company',
+        'city': 'city',
+        'employees': 'employees_count'
+    }
+    
+    def test_upsert_inserts_and_updates(self, db, user, contact):
+        """Test new emails are inserted and existing ones updated case-insensitively"""
+        service = BulkInsertService()
+        df = pd.DataFrame({
+            'email': [contact.email.upper(), 'new@example.com', None],
+            'company': ['New Corp', 'Fresh Inc', 'Nobody'],
+            'city': [None, 'Austin', None],
+            'employees': ['50', '10', '1']
+        })
+        result = service.bulk_upsert(df, str(user.id), self.column_mapping)
+        assert result['created_count'] == 1
+        assert result['updated_count'] == 1
+        assert result['success_count'] == 2
+        assert result['error_count'] == 1
+        
+        contact.refresh_from_db()
+        assert contact.company == 'New Corp'
+        assert contact.employees_count == 50
+        # Blank cells never overwrite stored values
+        assert contact.city == 'San Francisco'
+        assert contact.first_name == 'John'
+        assert Contact.objects.get(email='new@example.com').city == 'Austin'
+        assert Contact.objects.count() == 2
+    
+    def test_upsert_fill_blanks(self, db, user, contact):
+        """Test fill_blanks only sets empty fields"""
+        df = pd.DataFrame({
+            'email': [contact.email],
+            'company': ['Other Corp'],
+            'employees': ['75']
+        })
+        BulkInsertService().bulk_upsert(df, str(user.id), self.column_mapping, merge_policy='fill_blanks')
+        contact.refresh_from_db()
+        assert contact.company == 'Example Corp'
+        assert contact.employees_count == 75
+    
+    def test_upsert_field_policies(self, db, user, contact):
+        """Test per-field policies override the default"""
+        df = pd.DataFrame({
+            'email': [contact.email],
+            'company': ['Other Corp'],
+            'city': ['Boston']
+        })
+        BulkInsertService().bulk_upsert(
+            df, str(user.id), self.column_mapping,
+            merge_policy='overwrite', field_policies={'company': 'keep_existing'}
+        )
+        contact.refresh_from_db()
+        assert contact.company == 'Example Corp'
+        assert contact.city == 'Boston'
+    
+    @pytest.mark.skipif(connection.vendor != 'postgresql', reason='search_vector trigger requires PostgreSQL')
+    def test_upsert_leaves_search_vector_to_trigger(self, search_trigger, user, contact):
+        """Test a kept company stays searchable after an upsert"""
+        df = pd.DataFrame({'email': [contact.email], 'company': ['Other Corp'], 'city': ['Boston']})
+        BulkInsertService().bulk_upsert(
+            df, str(user.id), self.column_mapping,
+            merge_policy='overwrite', field_policies={'company': 'keep_existing'}
+        )
+        
+        assert 'search_vector' not in {field.name for field in BulkInsertService._upsert_fields()}
+        assert ContactSearchService.filter(Contact.objects.all(), 'example corp').get().pk == contact.pk
+    
+    def test_upsert_merges_rows_in_batch(self, db, user):
+        """Test repeated emails in a batch are merged in file order"""
+        df = pd.DataFrame({
+            'email': ['dup@example.com', 'DUP@example.com', 'dup@example.com'],
+            'company': ['First', None, 'Third'],
+            'city': [None, 'Denver', 'Miami']
+        })
+        result = BulkInsertService().bulk_upsert(
+            df, str(user.id), self.column_mapping,
+            merge_policy='overwrite', field_policies={'city': 'fill_blanks'}
+        )
+        assert result['created_count'] == 1
+        assert result['updated_count'] == 2
+        merged = Contact.objects.get(email_key='dup@example.com')
+        assert merged.company == 'Third'
+        assert merged.city == 'Denver'
+    
+    def test_upsert_unknown_policy(self, db, user):
+        """Test unknown policies are rejected"""
+        df = pd.DataFrame({'email': ['a@example.com']})
+        with pytest.raises(ValueError):
+            BulkInsertService().bulk_upsert(df, str(user.id), self.column_mapping, merge_policy='replace')
+        with pytest.raises(ValueError):
+            BulkInsertService().bulk_upsert(
+                df, str(user.id), self.column_mapping, field_policies={'email_key': 'overwrite'}
+            )
+    
+    def test_upsert_query_count(self, db, user, contact, django_assert_max_num_queries):
+        """Test upserts are written in multi-row statements"""
+        df = pd.DataFrame({
+            'email': [contact.email] + [f'user{i}@example.com' for i in range(199)],
+            'company': [f'Company {i}' for i in range(200)]
+        })
+        # One existing-key query, then a savepoint and one statement per
+        # statement-sized group of rows, as limited by the backend's parameters
+        fields = BulkInsertService._upsert_fields()
+        max_params = connection.features.max_query_params or 65535
+        statements = math.ceil(len(df) / max(1, min(1000, max_params // len(fields))))
+        with django_assert_max_num_queries(1 + 3 * statements):
+            result = BulkInsertService().bulk_upsert(df, str(user.id), self.column_mapping)
+        assert result['created_count'] == 199
+        assert result['updated_count'] == 1
+
+
+@pytest.mark.django_db
+class TestInFileDuplicates:
+    """Test duplicates within one import are rejected from the dedup index"""
+    
+    column_mapping = {'email': 'email', 'first_name': 'first_name'}
+    
+    def test_row_mode_in_file_duplicate_skips_query(self, db, user, django_assert_num_queries):
+        """Test a repeated email is reported without a database query"""
+        service = BulkInsertService()
+        service.dedup_index.add('seen@example.com')
+        df = pd.DataFrame({'email': ['Seen@Example.com'], 'first_name': ['Again']})
+        with django_assert_num_queries(0):
+            result = service.bulk_insert_from_dataframe(df, str(user.id), self.column_mapping)
+        assert result['duplicate_count'] == 1
+        assert [e.row_number for e in service.get_error_tracker().get_errors_by_type('Duplicate')] == [1]
+    
+    def test_set_based_duplicates_across_batches(self, db, user):
+        """Test emails from earlier batches are rejected without being looked up"""
+        service = BulkInsertService()
+        first = pd.DataFrame({'email': ['a@example.com', 'b@example.com'], 'first_name': ['A', 'B']})
+        second = pd.DataFrame(
+            {'email': ['A@example.com', 'c@example.com'], 'first_name': ['A2', 'C']},
+            index=[2, 3]
+        )
+        service.bulk_insert_set_based(first, str(user.id), self.column_mapping)
+        
+        with patch.object(service, '_existing_email_keys', wraps=service._existing_email_keys) as lookup:
+            result = service.bulk_insert_set_based(second, str(user.id), self.column_mapping)
+        looked_up = [data['email_key'] for _, data in lookup.call_args[0][0]]
+        assert looked_up == ['c@example.com']
+        assert result['success_count'] == 1
+        assert result['duplicate_count'] == 1
+        assert [e.row_number for e in service.get_error_tracker().get_errors_by_type('Duplicate')] == [3]
@@ -0,0 +1,98 @@
+"""
+Tests for contact export service
+"""
+import csv
+import io
+import json
+import pytest
+import pandas as pd
+from unittest.mock import patch
+from apps.contacts.models import Contact
+from services.contact_export_service import CONTACT_EXPORT_COLUMNS, ContactExportService
+
+
+@pytest.mark.django_db
+class TestContactExportService:
+    """Test ContactExportService"""
+
+    def _legacy_csv(self, queryset):
+        """CSV as the DataFrame-based export produced it"""
+        data = []
+        for contact in queryset:
+            row = {}
+            for header, field in CONTACT_EXPORT_COLUMNS:
+                value = getattr(contact, field)
+                if field == 'created_at':
+                    value = value.strftime('%Y-%m-%d') if value else ''
+                row[header] = value
+            data.append(row)
+        output = io.StringIO()
+        pd.DataFrame(data).to_csv(output, index=False)
+        return output.getvalue()
+
+    def test_iter_csv_matches_dataframe_export(self, multiple_contacts):
+        """Test streamed CSV is identical to the old DataFrame export"""
+        Contact.objects.filter(pk=multiple_contacts[0].pk).update(
+            notes='Line one\nline "two", three', phone=''
+        )
+        queryset = Contact.objects.all()
+
+        streamed = ''.join(ContactExportService.iter_csv(queryset, CONTACT_EXPORT_COLUMNS))
+
+        assert streamed == self._legacy_csv(queryset)
+
+    def test_iter_csv_yields_header_before_query(self, multiple_contacts):
+        """Test the header is sent before any row is read"""
+        chunks = ContactExportService.iter_csv(Contact.objects.all(), CONTACT_EXPORT_COLUMNS)
+
+        with patch.object(ContactExportService, 'iter_rows') as mock_rows:
+            header = next(chunks)
+
+        mock_rows.assert_not_called()
+        assert header == ','.join(header for header, _ in CONTACT_EXPORT_COLUMNS) + '\n'
+
+    def test_iter_csv_flushes_in_pieces(self, multiple_contacts):
+        """Test rows are sent in pieces once the buffer fills"""
+        with patch.object(ContactExportService, 'FLUSH_SIZE', 1):
+            chunks = list(ContactExportService.iter_csv(Contact.objects.all(), CONTACT_EXPORT_COLUMNS))
+
+        assert len(chunks) == len(multiple_contacts) + 1
+        rows = list(csv.reader(io.StringIO(''.join(chunks))))
+        assert len(rows) == len(multiple_contacts) + 1
+
+    def test_iter_rows_reads_only_export_columns(self, contact):
+        """Test rows are fetched as tuples of the exported fields"""
+        rows = list(ContactExportService.iter_rows(
+            Contact.objects.all(), [('Email', 'email'), ('Employees', 'employees_count')]
+        ))
+        assert rows == [['john.doe@example.com', None]]
+
+    def test_csv_response_streams(self, contact):
+        """Test the response is streamed as a CSV attachment"""
+        response = ContactExportService.csv_response(
+            Contact.objects.all(), CONTACT_EXPORT_COLUMNS, 'contacts_export.csv'
+        )
+        assert response.streaming
+        assert response['Content-Type'] == 'text/csv'
+        assert response['Content-Disposition'] == 'attachment; filename="contacts_export.csv"'
+        assert 'john.doe@example.com' in b''.join(response.streaming_content).decode()
+
+    def test_write_file_jsonl(self, contact, tmp_path):
+        """Test JSON Lines keeps NULL values and formats datetimes"""
+        file_path = str(tmp_path / 'contacts.jsonl')
+        count = ContactExportService.write_file(
+            Contact.objects.all(), [('email', 'email'), ('employees', 'employees_count'), ('created_at', 'created_at')],
+            file_path, 'jsonl'
+        )
+        with open(file_path) as f:
+            record = json.loads(f.readline())
+        assert count == 1
+        assert record['employees'] is None
+        assert record['created_at'] == contact.created_at.strftime('%Y-%m-%d %H:%M:%S')
+
+    def test_write_file_unsupported_format(self, tmp_path):
+        """Test unknown formats are rejected"""
+        with pytest.raises(ValueError):
+            ContactExportService.write_file(
+                Contact.objects.all(), CONTACT_EXPORT_COLUMNS, str(tmp_path / 'contacts.pdf'), 'pdf'
+            )
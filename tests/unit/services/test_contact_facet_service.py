@@ -0,0 +1,96 @@
+"""
+Tests for contact facet service
+"""
+import pytest
+from unittest.mock import patch
+from django.core.cache import cache
+from apps.contacts.models import Contact
+from services.contact_facet_service import ContactFacetService
+
+
+@pytest.fixture(autouse=True)
+def locmem_cache(settings):
+    """Fresh in-process cache, so cached facets do not leak between tests"""
+    settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.mark.django_db
+class TestContactFacetService:
+    """Test ContactFacetService"""
+    
+    def test_get_facets_counts_values(self, multiple_contacts):
+        """Test facets list each value once with its contact count"""
+        Contact.objects.filter(email='user0@example.com').update(industry='')
+        
+        assert ContactFacetService.get_facets('industry') == [('Finance', 3), ('Healthcare', 3), ('Technology', 3)]
+        assert ContactFacetService.get_facets('country') == [('Canada', 3), ('UK', 3), ('USA', 4)]
+    
+    def test_get_facets_is_cached(self, multiple_contacts):
+        """Test a cached facet does not query the database"""
+        ContactFacetService.get_facets('country')
+        
+        with patch.object(ContactFacetService, 'compute') as mock_compute:
+            ContactFacetService.get_facets('country')
+        mock_compute.assert_not_called()
+    
+    def test_contact_writes_adjust_counts(self, multiple_contacts, django_capture_on_commit_callbacks):
+        """Test saves and deletes adjust the cached counts without recounting"""
+        ContactFacetService.get_facets('country')
+        contact = multiple_contacts[1]  # Canada
+        
+        with patch.object(ContactFacetService, 'compute') as mock_compute:
+            with django_capture_on_commit_callbacks(execute=True):
+                contact.country = 'Germany'
+                contact.save()
+            with django_capture_on_commit_callbacks(execute=True):
+                Contact.objects.create(
+                    first_name='New', last_name='Person', full_name='New Person',
+                    email='new@example.com', country='USA'
+                )
+            with django_capture_on_commit_callbacks(execute=True):
+                multiple_contacts[2].delete()  # UK
+            facets = ContactFacetService.get_facets('country')
+        
+        mock_compute.assert_not_called()
+        assert facets == [('Canada', 2), ('Germany', 1), ('UK', 2), ('USA', 5)]
+        assert facets == sorted(ContactFacetService.compute('country').items())
+    
+    def test_saving_a_loaded_contact_needs_no_facet_query(self, multiple_contacts, django_capture_on_commit_callbacks,
+                                                          django_assert_num_queries):
+        """Test the stored facet values come from the loaded row, not a second SELECT"""
+        ContactFacetService.get_facets('country')
+        contact = Contact.objects.get(pk=multiple_contacts[1].pk)  # Canada
+        
+        with django_capture_on_commit_callbacks(execute=True):
+            with django_assert_num_queries(1):
+                contact.country = 'Germany'
+                contact.save()
+        with django_capture_on_commit_callbacks(execute=True):
+            contact.country = 'France'
+            contact.industry = 'Retail'
+            contact.save(update_fields=['country'])
+        
+        assert dict(ContactFacetService.get_facets('country'))['France'] == 1
+        assert 'Germany' not in dict(ContactFacetService.get_facets('country'))
+        assert 'Retail' not in dict(ContactFacetService.get_facets('industry'))
+        assert ContactFacetService.get_facets('country') == sorted(ContactFacetService.compute('country').items())
+    
+    def test_adjust_drops_empty_values(self, contact):
+        """Test a value whose count reaches zero leaves the facet"""
+        ContactFacetService.get_facets('country')
+        
+        ContactFacetService.adjust('country', contact.country, -1)
+        
+        assert ContactFacetService.get_facets('country') == []
+    
+    def test_invalidate(self, multiple_contacts):
+        """Test invalidated facets are recounted"""
+        ContactFacetService.get_facets('industry')
+        Contact.objects.filter(industry='Finance').update(industry='Banking')
+        
+        ContactFacetService.invalidate()
+        
+        assert ('Banking', 3) in ContactFacetService.get_facets('industry')
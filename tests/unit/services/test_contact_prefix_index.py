@@ -0,0 +1,150 @@
+"""
+Tests for contact prefix index
+"""
+import time
+import pytest
+from unittest.mock import patch
+from apps.contacts.models import Contact
+from services.contact_prefix_index import ContactPrefixIndex, contact_prefix_index
+
+
+ROWS = [
+    (1, 'John Doe', 'Acme Corp', 'john.doe@example.com'),
+    (2, 'Jane Doering', 'Globex', 'jane@globex.com'),
+    (3, 'Bob Johnson', '', 'bob@example.com'),
+]
+
+
+@pytest.fixture
+def index():
+    index = ContactPrefixIndex()
+    index.build(ROWS)
+    return index
+
+
+@pytest.fixture
+def shared_index():
+    """The process-wide index, emptied before and after the test"""
+    contact_prefix_index.clear()
+    yield contact_prefix_index
+    contact_prefix_index.clear()
+
+
+class TestContactPrefixIndex:
+    """Test ContactPrefixIndex lookups"""
+    
+    def test_terms(self):
+        """Test names and companies match from each word, emails from the start"""
+        assert ContactPrefixIndex.terms(('John  Doe', 'Acme Corp', ' J@X.com')) == [
+            'acme corp', 'corp', 'doe', 'j@x.com', 'john doe'
+        ]
+    
+    def test_search_prefix(self, index):
+        """Test a prefix finds every contact with a matching term"""
+        assert [r['id'] for r in index.search('doe')] == [1, 2]
+        assert [r['id'] for r in index.search('JOHN')] == [1, 3]
+        assert index.search('glob')[0] == {
+            'id': 2, 'full_name': 'Jane Doering', 'company': 'Globex', 'email': 'jane@globex.com'
+        }
+    
+    def test_search_multi_word_and_limit(self, index):
+        """Test multi-word prefixes and the result limit"""
+        assert [r['id'] for r in index.search('john   d')] == [1]
+        assert len(index.search('j', limit=2)) == 2
+        assert index.search('  ') == []
+    
+    def test_update_and_remove(self, index):
+        """Test incremental updates replace the old terms"""
+        index.update(1, 'Johnny Walker', 'Acme Corp', 'john.doe@example.com')
+        index.update(4, 'Dora Explorer', '', '')
+        
+        assert [r['id'] for r in index.search('doe')] == [2]
+        assert [r['id'] for r in index.search('walk')] == [1]
+        assert [r['id'] for r in index.search('do')] == [2, 4]
+        
+        index.remove(2)
+        assert [r['id'] for r in index.search('do')] == [4]
+    
+    def test_updates_before_build_are_ignored(self):
+        """Test an unbuilt index stays empty until its first build"""
+        index = ContactPrefixIndex()
+        index.update(1, 'John Doe', '', '')
+        
+        assert not index.is_built
+        with patch.object(index, 'build') as mock_build, \
+                patch.object(index, 'search_database', return_value=[]) as mock_search_database:
+            assert index.search('john') == []
+            index._refresh_thread.join()
+        mock_build.assert_called_once_with()
+        mock_search_database.assert_called_once_with('john', 10)
+    
+    def test_rebuilds_in_background_when_stale(self, settings):
+        """Test a stale index keeps answering while it is rebuilt after TYPEAHEAD_INDEX_TTL"""
+        settings.TYPEAHEAD_INDEX_TTL = 0
+        index = ContactPrefixIndex()
+        index.build(ROWS)
+        with patch('services.contact_prefix_index.time.monotonic', return_value=index._built_at + 1), \
+                patch.object(index, 'build') as mock_build:
+            assert [r['id'] for r in index.search('john')] == [1, 3]
+            index._refresh_thread.join()
+        mock_build.assert_called_once_with()
+    
+    def test_one_refresh_at_a_time(self, index):
+        """Test a rebuild is not started while another one runs"""
+        with patch.object(index, 'build', side_effect=lambda: time.sleep(0.1)):
+            assert index.refresh() is True
+            assert index.refresh() is False
+            index._refresh_thread.join()
+        assert index.refresh() is True
+        index._refresh_thread.join()
+    
+    def test_updates_during_build_are_kept(self, index):
+        """Test writes that arrive while a build reads rows survive the build"""
+        def rows():
+            yield ROWS[0]
+            index.update(5, 'Zed Newcomer', '', '')
+            index.remove(2)
+            yield from ROWS[1:]
+        
+        index.build(rows())
+        
+        assert [r['id'] for r in index.search('zed')] == [5]
+        assert [r['id'] for r in index.search('jane')] == []
+        assert index._pending is None
+
+
+@pytest.mark.django_db
+class TestContactPrefixIndexSignals:
+    """Test the shared index follows Contact writes"""
+    
+    def test_build_reads_contacts(self, shared_index, multiple_contacts):
+        """Test the build loads contacts from the database"""
+        shared_index.build()
+        with patch.object(ContactPrefixIndex, 'search_database') as mock_search_database:
+            assert [r['email'] for r in shared_index.search('company7')] == ['user7@example.com']
+        mock_search_database.assert_not_called()
+    
+    def test_database_fallback_before_build(self, shared_index, multiple_contacts):
+        """Test lookups query the database while the first build runs"""
+        with patch.object(shared_index, 'refresh') as mock_refresh:
+            assert [r['email'] for r in shared_index.search('company7')] == ['user7@example.com']
+            assert [r['email'] for r in shared_index.search('test3')] == ['user3@example.com']
+            assert shared_index.search('user3@') == [{
+                'id': multiple_contacts[3].pk, 'full_name': 'User3 Test3',
+                'company': 'Company3', 'email': 'user3@example.com'
+            }]
+        assert mock_refresh.call_count == 3
+        assert not shared_index.is_built
+    
+    def test_save_and_delete_update_index(self, shared_index, contact, django_capture_on_commit_callbacks):
+        """Test post_save and post_delete keep the built index current"""
+        shared_index.build()
+        
+        with django_capture_on_commit_callbacks(execute=True):
+            contact.full_name = 'Johnny Renamed'
+            contact.save()
+        assert [r['id'] for r in shared_index.search('renam')] == [contact.pk]
+        
+        with django_capture_on_commit_callbacks(execute=True):
+            Contact.objects.filter(pk=contact.pk).delete()
+        assert shared_index.search('renam') == []
@@ -0,0 +1,104 @@
+"""
+Tests for contact search service
+"""
+import importlib
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch
+from django.db import connection
+from apps.contacts.models import Contact
+from services.contact_search_service import ContactSearchService
+from services.contact_service import ContactService
+
+
+requires_postgres = pytest.mark.skipif(
+    connection.vendor != 'postgresql',
+    reason='tsvector search requires PostgreSQL'
+)
+
+
+class TestBuildQuery:
+    """Test ContactSearchService.build_query"""
+    
+    def test_prefix_matches_every_word(self):
+        """Test each word becomes a prefix term"""
+        assert ContactSearchService.build_query('John  Sm') == 'john:* & sm:*'
+    
+    def test_strips_tsquery_operators(self):
+        """Test user input cannot inject tsquery syntax"""
+        assert ContactSearchService.build_query("o'brien & (acme | !x):*") == 'o:* & brien:* & acme:* & x:*'
+    
+    def test_no_words(self):
+        """Test punctuation-only input gives no query"""
+        assert ContactSearchService.build_query(' !! ') is None
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('search_trigger')
+class TestContactSearchService:
+    """Test ContactSearchService against the database"""
+    
+    def test_filter_matches_name_company_email(self, multiple_contacts):
+        """Test searches find contacts by name, company and email"""
+        queryset = Contact.objects.all()
+        
+        assert [c.email for c in ContactSearchService.filter(queryset, 'User3')] == ['user3@example.com']
+        assert ContactSearchService.filter(queryset, 'Company7').get().email == 'user7@example.com'
+        assert ContactSearchService.filter(queryset, 'user5@example.com').get().full_name == 'User5 Test5'
+    
+    def test_filter_keeps_ordering_and_filters(self, multiple_contacts):
+        """Test search combines with other filters and keeps the ordering"""
+        queryset = Contact.objects.filter(country='USA').order_by('-created_at', '-id')
+        
+        results = list(ContactSearchService.filter(queryset, 'example'))
+        
+        assert [c.pk for c in results] == list(queryset.values_list('pk', flat=True))
+    
+    def test_blank_search_returns_queryset(self, multiple_contacts):
+        """Test blank input does not filter"""
+        assert ContactSearchService.filter(Contact.objects.all(), '   ').count() == 10
+    
+    def test_search_contacts_limit(self, multiple_contacts):
+        """Test ContactService.search_contacts applies the limit"""
+        assert len(ContactService.search_contacts('example', limit=3)) == 3
+    
+    def test_filter_contacts_search(self, multiple_contacts):
+        """Test ContactService.filter_contacts searches through the service"""
+        result = ContactService.filter_contacts({'search': 'Company2'})
+        assert [c.email for c in result['contacts']] == ['user2@example.com']
+    
+    @requires_postgres
+    def test_trigger_maintains_search_vector(self, contact):
+        """Test inserts and updates keep search_vector current"""
+        assert ContactSearchService.filter(Contact.objects.all(), 'joh do').exists()
+        
+        Contact.objects.filter(pk=contact.pk).update(company='Initech')
+        
+        assert not ContactSearchService.filter(Contact.objects.all(), 'corp').exists()
+        assert ContactSearchService.filter(Contact.objects.all(), 'initec').get().pk == contact.pk
+    
+    @requires_postgres
+    def test_email_parts_match(self, contact):
+        """Test parts of an email address match as prefixes"""
+        assert ContactSearchService.filter(Contact.objects.all(), 'example').exists()
+    
+    @requires_postgres
+    def test_search_ranks_name_above_title(self, multiple_contacts):
+        """Test name matches rank above title matches"""
+        Contact.objects.filter(email='user1@example.com').update(title='Analyst')
+        Contact.objects.filter(email='user2@example.com').update(full_name='Analyst Person')
+        
+        results = ContactSearchService.search(Contact.objects.all(), 'analyst')
+        
+        assert [c.email for c in results] == ['user2@example.com', 'user1@example.com']
+    
+    @requires_postgres
+    def test_migration_backfill(self, multiple_contacts):
+        """Test the migration backfill rebuilds search_vector for existing contacts"""
+        migration = importlib.import_module('apps.contacts.migrations.0004_contact_search_vector')
+        Contact.objects.update(search_vector=None)
+        
+        with patch.object(migration, 'BACKFILL_BATCH_SIZE', 3):
+            migration.backfill_search_vectors(None, SimpleNamespace(connection=connection))
+        
+        assert ContactSearchService.filter(Contact.objects.all(), 'user4').count() == 1
@@ -2,7 +2,11 @@
 Tests for contact service
 """
 import pytest
-from services.contact_service import ContactService, validate_email, validate_phone, validate_url
+import pandas as pd
+from services.contact_service import (
+    ContactService, validate_email, validate_phone, validate_url,
+    validate_email_series, validate_phone_series, validate_url_series
+)
 from apps.contacts.models import Contact
 
 
@@ -41,6 +45,20 @@ class TestContactServiceValidation:
         """Test invalid URL validation"""
         assert validate_url('not-a-url') is False
         assert validate_url('example.com') is False  # Missing protocol
+    
+    def test_series_validators_match_scalar_validators(self):
+        """Test batch validators return the scalar result per value, False for missing"""
+        cases = [
+            (validate_email_series, validate_email,
+             ['test@example.com', 'user.name@domain.co.uk', 'invalid-email', '@example.com', 'test@']),
+            (validate_phone_series, validate_phone, ['+1234567890', '(123) 456-7890', 'abc', '1-2']),
+            (validate_url_series, validate_url, ['https://example.com', 'http://x.io/a', 'example.com']),
+        ]
+        for validate_series, validate, values in cases:
+            mask = validate_series(pd.Series(values + [None], index=range(10, 11 + len(values))))
+            assert mask.dtype == bool
+            assert mask.index.tolist() == list(range(10, 11 + len(values)))
+            assert mask.tolist() == [validate(value) for value in values] + [False]
 
 
 @pytest.mark.django_db
@@ -70,6 +88,12 @@ class TestContactServiceMethods:
         with pytest.raises(ValueError):
             ContactService.create_contact(contact_data)
     
+    def test_create_contact_duplicate_email(self, contact):
+        """Test creating a contact with a taken email raises ValueError"""
+        with pytest.raises(ValueError, match='Email already exists'):
+            ContactService.create_contact({'first_name': 'Dup', 'email': contact.email.upper()})
+        assert Contact.objects.count() == 1
+    
     def test_get_contact(self, contact):
         """Test get contact by ID"""
         retrieved = ContactService.get_contact(contact.id)
@@ -98,7 +122,7 @@ class TestContactServiceMethods:
         assert result is True
         assert not Contact.objects.filter(id=contact_id).exists()
     
-    def test_search_contacts(self, multiple_contacts):
+    def test_search_contacts(self, search_trigger, multiple_contacts):
         """Test search contacts"""
         results = ContactService.search_contacts('User', limit=5)
         assert len(results) > 0
@@ -0,0 +1,103 @@
+"""
+Tests for COPY import service
+"""
+import pytest
+from django.db import connection
+from services.copy_import_service import CopyImportService
+from apps.contacts.models import Contact
+from services.contact_search_service import ContactSearchService
+
+
+requires_postgres = pytest.mark.skipif(
+    connection.vendor != 'postgresql',
+    reason='COPY import requires PostgreSQL'
+)
+
+
+@pytest.fixture
+def large_csv_file(tmp_path):
+    """CSV with duplicates, a missing email and an over-length value"""
+    test_file = tmp_path / 'contacts.csv'
+    test_file.write_text(
+        'First Name,Last Name,Email,Employees,City\n'
+        'John,Doe,john.doe@example.com,10,Boston\n'
+        'Ann,Lee,ann@example.com,12.6,Austin\n'
+        'Ann,Lee,ann@example.com,3,Austin\n'
+        'No,Email,,5,Denver\n'
+        f'Long,City,long@example.com,1,{"x" * 200}\n'
+        'Bob,Ray,bob@example.com,,\n'
+    )
+    return str(test_file)
+
+
+class TestCopyImportService:
+    """Test CopyImportService"""
+    
+    column_mapping = {
+        'First Name': 'first_name',
+        'Last Name': 'last_name',
+        'Email': 'email',
+        'Employees': 'employees_count',
+        'City': 'city'
+    }
+    
+    def test_is_available_matches_vendor(self):
+        """Test COPY engine is only available on PostgreSQL"""
+        assert CopyImportService.is_available() == (connection.vendor == 'postgresql')
+    
+    def test_unknown_mapping_field_rejected(self, large_csv_file):
+        """Test mapping to a non-existent field fails before any COPY"""
+        service = CopyImportService()
+        with pytest.raises(ValueError):
+            service.import_file(large_csv_file, '1', {'Email': 'not_a_field'})
+    
+    @requires_postgres
+    @pytest.mark.django_db
+    def test_import_file(self, large_csv_file, contact):
+        """Test COPY import counts, errors and inserted rows"""
+        service = CopyImportService(chunk_size=2)
+        result = service.import_file(large_csv_file, '42', self.column_mapping)
+        
+        assert result['total_processed'] == 6
+        assert result['success_count'] == 2
+        assert result['duplicate_count'] == 2
+        assert result['error_count'] == 2
+        
+        ann = Contact.objects.get(email='ann@example.com')
+        assert ann.full_name == 'Ann Lee'
+        # CSV text '12.6' is rounded like every other string integer (TypeConverter.to_integer)
+        assert ann.employees_count == 13
+        assert ann.city == 'Austin'
+        assert ann.user_id == '42'
+        assert ann.is_active is True
+        assert Contact.objects.get(email='bob@example.com').city == ''
+        
+        tracker = service.get_error_tracker()
+        assert sorted(e.row_number for e in tracker.get_errors_by_type('Duplicate')) == [1, 3]
+        assert [e.column for e in tracker.get_row_errors(5)] == ['city']
+    
+    @requires_postgres
+    @pytest.mark.django_db
+    def test_import_file_keeps_text_across_chunks(self, tmp_path):
+        """Test numeric-looking text is not re-typed by the chunk it falls in"""
+        test_file = tmp_path / 'contacts.csv'
+        test_file.write_text(
+            'Email,Zip\n'
+            'a@example.com,02134\n'
+            'b@example.com,\n'
+            'c@example.com,SW1A 1AA\n'
+        )
+        CopyImportService(chunk_size=2).import_file(str(test_file), '42', {'Email': 'email', 'Zip': 'postal_code'})
+        assert Contact.objects.get(email='a@example.com').postal_code == '02134'
+        assert Contact.objects.get(email='c@example.com').postal_code == 'SW1A 1AA'
+    
+    @requires_postgres
+    @pytest.mark.django_db
+    def test_import_file_with_search_trigger(self, search_trigger, large_csv_file):
+        """Test the merge leaves search_vector to the trigger"""
+        service = CopyImportService(chunk_size=2)
+        result = service.import_file(large_csv_file, '42', self.column_mapping)
+        
+        assert 'search_vector' not in service.field_names
+        assert result['success_count'] == 3
+        assert [c.email for c in ContactSearchService.filter(Contact.objects.all(), 'ann lee')] == ['ann@example.com']
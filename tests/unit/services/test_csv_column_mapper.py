@@ -72,3 +72,50 @@ class TestCSVColumnMapper:
         mapped_df = mapper.apply_mapping(df, mapping)
         assert 'first_name' in mapped_df.columns or 'last_name' in mapped_df.columns
 
+    
+    def test_auto_map_columns_matches_alias_scan(self):
+        """Test the compiled alias index maps headers exactly like a full alias scan"""
+        mapper = CSVColumnMapper()
+        
+        def scan(col):
+            col_lower = col.lower().strip()
+            col_cleaned = col_lower.replace('_', ' ').replace('-', ' ')
+            if col_lower in mapper.field_mappings:
+                return col_lower
+            best_match, best_score = None, 0
+            for field, keywords in mapper.field_mappings.items():
+                for keyword in keywords:
+                    if keyword == col_lower or keyword == col_cleaned:
+                        return field
+                    if keyword in col_lower or keyword in col_cleaned:
+                        score = len(keyword) / len(col_lower)
+                        if score > best_score:
+                            best_match, best_score = field, score
+            return best_match
+        
+        aliases = [alias for keywords in mapper.field_mappings.values() for alias in keywords]
+        columns = aliases + list(mapper.field_mappings) + [
+            'First Name', 'E-Mail', 'Phone Number', 'Company Size', 'Corporate Phone',
+            'Work Direct Phone', 'Person Linkedin Url', 'Twitter Handle', 'zip_code',
+            'Lead_Status', ' Company Name ', 'Annual Revenue (USD)', 'Employees Count',
+            'Technologies Used', 'unknown', 'x', 'Stage of lead', 'website_url'
+        ]
+        columns += [f'{alias.upper()}_2' for alias in aliases]
+        
+        df = pd.DataFrame(columns=columns)
+        expected = {col: scan(col) for col in columns if scan(col)}
+        assert mapper.auto_map_columns(df) == expected
+    
+    def test_auto_map_columns_fuzzy(self):
+        """Test fuzzy matching maps misspelled headers that match no alias"""
+        mapper = CSVColumnMapper()
+        df = pd.DataFrame(columns=['Emial', 'Compnay', 'Zzzz'])
+        assert mapper.auto_map_columns(df) == {}
+        assert mapper.auto_map_columns(df, fuzzy=True) == {'Emial': 'email', 'Compnay': 'company'}
+        assert mapper.score_column('Emial')[0][0] == 'email'
+    
+    def test_header_signature(self):
+        """Test header signatures ignore column order, case and spacing"""
+        signature = CSVColumnMapper.header_signature(['Email', 'First Name'])
+        assert signature == CSVColumnMapper.header_signature([' first name', 'EMAIL'])
+        assert signature != CSVColumnMapper.header_signature(['Email', 'Last Name'])
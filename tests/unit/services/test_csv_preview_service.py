@@ -0,0 +1,53 @@
+"""
+Tests for CSV preview service
+"""
+import os
+import pytest
+from unittest.mock import patch
+from django.core.cache import cache
+from services.csv_preview_service import CSVPreviewService
+
+
+class TestCSVPreviewService:
+    """Test CSVPreviewService"""
+    
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        cache.clear()
+    
+    def _write_rows(self, tmp_path, count):
+        test_file = tmp_path / 'contacts.csv'
+        test_file.write_text('email,first_name\n' + ''.join(f'user{i}@example.com,User{i}\n' for i in range(count)))
+        return str(test_file)
+    
+    def test_get_preview(self, tmp_path):
+        """Test preview parses the first rows and counts every row"""
+        file_path = self._write_rows(tmp_path, 25)
+        preview = CSVPreviewService.get_preview(file_path)
+        assert len(preview.df) == CSVPreviewService.PREVIEW_ROWS
+        assert preview.df.columns.tolist() == ['email', 'first_name']
+        assert preview.total_rows == 25
+    
+    def test_get_preview_uses_cache(self, tmp_path):
+        """Test an unchanged file is not read again"""
+        file_path = self._write_rows(tmp_path, 5)
+        CSVPreviewService.get_preview(file_path)
+        
+        with patch('services.csv_preview_service.pd.read_csv') as mock_read, \
+                patch('services.csv_preview_service.CSVStreamReader.count_rows') as mock_count:
+            preview = CSVPreviewService.get_preview(file_path)
+        
+        mock_read.assert_not_called()
+        mock_count.assert_not_called()
+        assert preview.total_rows == 5
+    
+    def test_modified_file_gets_new_preview(self, tmp_path):
+        """Test the cache key follows the file's modification time and size"""
+        file_path = self._write_rows(tmp_path, 5)
+        key = CSVPreviewService.cache_key(file_path, 10)
+        assert CSVPreviewService.get_preview(file_path).total_rows == 5
+        
+        self._write_rows(tmp_path, 8)
+        os.utime(file_path, ns=(0, 10 ** 18))
+        assert CSVPreviewService.cache_key(file_path, 10) != key
+        assert CSVPreviewService.get_preview(file_path).total_rows == 8
@@ -0,0 +1,100 @@
+"""
+Tests for CSV stream reader
+"""
+import pandas as pd
+import pytest
+from services.csv_stream_reader import CSVStreamReader
+
+
+@pytest.fixture
+def multiline_csv(tmp_path):
+    """CSV with a quoted field spanning two lines and no trailing newline"""
+    test_file = tmp_path / 'contacts.csv'
+    test_file.write_text(
+        'name,email,notes\n'
+        'John,john@example.com,plain\n'
+        'Jane,jane@example.com,"first line\nsecond ""quoted"" line"\n'
+        'Bob,bob@example.com,\n'
+        'Ann,ann@example.com,last'
+    )
+    return str(test_file)
+
+
+class TestCSVStreamReader:
+    """Test CSVStreamReader"""
+    
+    def test_count_rows(self, csv_file):
+        """Test row count excludes the header"""
+        assert CSVStreamReader.count_rows(csv_file) == 3
+    
+    def test_count_rows_without_trailing_newline(self, tmp_path):
+        """Test the last line is counted without a trailing newline"""
+        test_file = tmp_path / 'contacts.csv'
+        test_file.write_text('email\na@example.com\nb@example.com')
+        assert CSVStreamReader.count_rows(str(test_file)) == 2
+    
+    def test_iter_batches(self, multiline_csv):
+        """Test batches keep multi-line records intact and use global row indexes"""
+        batches = list(CSVStreamReader.iter_batches(multiline_csv, batch_size=3))
+        assert [len(batch.df) for batch in batches] == [3, 1]
+        assert list(batches[1].df.index) == [3]
+        assert batches[1].start_row == 3
+        assert batches[0].df.loc[1, 'notes'] == 'first line\nsecond "quoted" line'
+        assert batches[1].df.loc[3, 'email'] == 'ann@example.com'
+    
+    def test_iter_batches_reads_text_across_boundaries(self, tmp_path):
+        """Test values read the same in every batch, whatever the batch holds"""
+        test_file = tmp_path / 'contacts.csv'
+        test_file.write_text(
+            'email,phone,postal_code\n'
+            'a@example.com,5550001,02134\n'
+            'b@example.com,,02135\n'
+            'c@example.com,555-0003,SW1A 1AA\n'
+        )
+        batches = list(CSVStreamReader.iter_batches(str(test_file), batch_size=2))
+        assert batches[0].df.loc[0, 'phone'] == '5550001'
+        assert list(batches[0].df['postal_code']) == ['02134', '02135']
+        assert pd.isna(batches[0].df.loc[1, 'phone'])
+        assert batches[1].df.loc[2, 'postal_code'] == 'SW1A 1AA'
+    
+    def test_iter_batches_resume_from_offset(self, multiline_csv):
+        """Test reading resumes from a batch end offset"""
+        first = next(CSVStreamReader.iter_batches(multiline_csv, batch_size=2))
+        resumed = list(CSVStreamReader.iter_batches(
+            multiline_csv, batch_size=10, start_offset=first.end_offset, start_row=2
+        ))
+        assert len(resumed) == 1
+        assert list(resumed[0].df['name']) == ['Bob', 'Ann']
+        assert list(resumed[0].df.index) == [2, 3]
+    
+    def test_iter_batches_end_offset(self, multiline_csv):
+        """Test records starting at or after end_offset are excluded"""
+        first = next(CSVStreamReader.iter_batches(multiline_csv, batch_size=2))
+        limited = list(CSVStreamReader.iter_batches(
+            multiline_csv, batch_size=10, end_offset=first.end_offset
+        ))
+        assert list(limited[0].df['name']) == ['John', 'Jane']
+    
+    def test_plan_partitions(self, multiline_csv):
+        """Test partitions cover every record and read back the whole file"""
+        partitions = CSVStreamReader.plan_partitions(multiline_csv, 2)
+        assert len(partitions) == 2
+        assert sum(partition.row_count for partition in partitions) == 4
+        assert partitions[0].end_offset == partitions[1].start_offset
+        assert partitions[1].start_row == partitions[0].row_count
+        
+        names = []
+        for partition in partitions:
+            for batch in CSVStreamReader.iter_batches(
+                multiline_csv, batch_size=10, start_offset=partition.start_offset,
+                end_offset=partition.end_offset, start_row=partition.start_row
+            ):
+                assert batch.start_row == partition.start_row
+                names += list(batch.df['name'])
+        assert names == ['John', 'Jane', 'Bob', 'Ann']
+    
+    def test_plan_partitions_small_file(self, multiline_csv):
+        """Test no more partitions than records are planned"""
+        partitions = CSVStreamReader.plan_partitions(multiline_csv, 10)
+        assert len(partitions) == 4
+        assert [partition.start_row for partition in partitions] == [0, 1, 2, 3]
@@ -0,0 +1,29 @@
+"""
+Tests for email dedup index
+"""
+from services.email_dedup_index import EmailDedupIndex
+
+
+class TestEmailDedupIndex:
+    """Test EmailDedupIndex"""
+    
+    def test_add_reports_first_sighting(self):
+        """Test add returns False for emails already in the index"""
+        index = EmailDedupIndex()
+        assert index.add('john@example.com') is True
+        assert index.add('jane@example.com') is True
+        assert index.add('john@example.com') is False
+        assert len(index) == 2
+    
+    def test_contains(self):
+        """Test membership checks use the digest"""
+        index = EmailDedupIndex()
+        index.add('john@example.com')
+        assert 'john@example.com' in index
+        assert 'jane@example.com' not in index
+    
+    def test_digest_is_stable(self):
+        """Test digests are deterministic 128-bit integers"""
+        digest = EmailDedupIndex.digest('john@example.com')
+        assert digest == EmailDedupIndex.digest('john@example.com')
+        assert 0 <= digest < 2 ** 128
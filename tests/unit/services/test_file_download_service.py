@@ -0,0 +1,100 @@
+"""
+Tests for file download service
+"""
+import pytest
+from django.test import RequestFactory
+from services.file_download_service import FileDownloadService
+
+
+@pytest.fixture
+def export_file(settings, tmp_path):
+    """1000-byte file under MEDIA_ROOT"""
+    settings.MEDIA_ROOT = str(tmp_path)
+    settings.EXPORT_DOWNLOAD_MODE = ''
+    file_path = tmp_path / 'exports' / 'contacts.csv'
+    file_path.parent.mkdir()
+    file_path.write_bytes(bytes(range(250)) * 4)
+    return str(file_path)
+
+
+class TestFileDownloadService:
+    """Test FileDownloadService"""
+    
+    @pytest.mark.parametrize('header,expected', [
+        (None, None),
+        ('bytes=0-99', (0, 99)),
+        ('bytes=900-', (900, 999)),
+        ('bytes=-100', (900, 999)),
+        ('bytes=-5000', (0, 999)),
+        ('bytes=990-5000', (990, 999)),
+        ('bytes=0-1,5-6', None),
+        ('items=0-1', None),
+    ])
+    def test_parse_range(self, header, expected):
+        """Test single byte ranges are parsed and other forms ignored"""
+        assert FileDownloadService.parse_range(header, 1000) == expected
+    
+    @pytest.mark.parametrize('header', ['bytes=1000-', 'bytes=50-10', 'bytes=-0'])
+    def test_parse_range_unsatisfiable(self, header):
+        """Test ranges outside the file are rejected"""
+        with pytest.raises(ValueError):
+            FileDownloadService.parse_range(header, 1000)
+    
+    def test_file_response_streams_whole_file(self, export_file):
+        """Test files are streamed as attachments"""
+        request = RequestFactory().get('/')
+        response = FileDownloadService.file_response(request, export_file, 'contacts.csv')
+        
+        assert response.status_code == 200
+        assert response.streaming
+        assert response['Content-Length'] == '1000'
+        assert response['Accept-Ranges'] == 'bytes'
+        assert response['Content-Disposition'] == 'attachment; filename="contacts.csv"'
+        assert b''.join(response.streaming_content) == bytes(range(250)) * 4
+        response.file_to_stream.close()
+    
+    def test_file_response_range(self, export_file):
+        """Test a range request gets 206 with only the requested bytes"""
+        request = RequestFactory().get('/', HTTP_RANGE='bytes=245-254')
+        response = FileDownloadService.file_response(request, export_file, 'contacts.csv')
+        
+        assert response.status_code == 206
+        assert response['Content-Range'] == 'bytes 245-254/1000'
+        assert response['Content-Length'] == '10'
+        assert b''.join(response.streaming_content) == bytes([245, 246, 247, 248, 249, 0, 1, 2, 3, 4])
+        response.file_to_stream.close()
+    
+    def test_file_response_unsatisfiable_range(self, export_file):
+        """Test a range past the end gets 416"""
+        request = RequestFactory().get('/', HTTP_RANGE='bytes=2000-')
+        response = FileDownloadService.file_response(request, export_file, 'contacts.csv')
+        
+        assert response.status_code == 416
+        assert response['Content-Range'] == 'bytes */1000'
+    
+    def test_file_response_x_accel_redirect(self, export_file, settings):
+        """Test nginx offload points at the protected media location"""
+        settings.EXPORT_DOWNLOAD_MODE = 'x-accel-redirect'
+        settings.PROTECTED_MEDIA_URL = '/protected-media/'
+        response = FileDownloadService.file_response(RequestFactory().get('/'), export_file, 'contacts.csv')
+        
+        assert response['X-Accel-Redirect'] == '/protected-media/exports/contacts.csv'
+        assert response['Content-Disposition'] == 'attachment; filename="contacts.csv"'
+        assert response.content == b''
+    
+    def test_file_response_x_accel_redirect_outside_media(self, export_file, settings, tmp_path_factory):
+        """Test files outside MEDIA_ROOT are streamed instead of offloaded"""
+        settings.EXPORT_DOWNLOAD_MODE = 'x-accel-redirect'
+        settings.MEDIA_ROOT = str(tmp_path_factory.mktemp('other_media'))
+        response = FileDownloadService.file_response(RequestFactory().get('/'), export_file, 'contacts.csv')
+        
+        assert 'X-Accel-Redirect' not in response
+        assert response.streaming
+        response.file_to_stream.close()
+    
+    def test_file_response_x_sendfile(self, export_file, settings):
+        """Test X-Sendfile offload sends the absolute path"""
+        settings.EXPORT_DOWNLOAD_MODE = 'x-sendfile'
+        response = FileDownloadService.file_response(RequestFactory().get('/'), export_file, 'contacts.csv')
+        
+        assert response['X-Sendfile'] == export_file
@@ -64,3 +64,12 @@ class TestFileValidator:
         # Should recommend PySpark for large files
         assert isinstance(should_use, bool)
 
+    
+    def test_should_use_copy_threshold(self, tmp_path, settings):
+        """Test COPY engine is selected above the configured threshold"""
+        test_file = tmp_path / 'contacts.csv'
+        test_file.write_text('email\n' + 'user@example.com\n' * 1000)
+        
+        assert FileValidator.should_use_copy(str(test_file), threshold_mb=0.001) is True
+        settings.COPY_IMPORT_THRESHOLD_MB = 100
+        assert FileValidator.should_use_copy(str(test_file)) is False
@@ -0,0 +1,226 @@
+"""
+Tests for import error tracker
+"""
+import gc
+import json
+import os
+from unittest.mock import patch
+import pytest
+from services.import_error_tracker import ImportError, ImportErrorTracker
+
+
+class TestImportErrorTracker:
+    """Test ImportErrorTracker"""
+    
+    def _tracker(self, tmp_path, name='errors.jsonl.gz'):
+        return ImportErrorTracker(spill_path=str(tmp_path / name))
+    
+    def test_keeps_bounded_sample_and_spills_to_file(self, tmp_path):
+        """Test only a sample stays in memory while every error is logged"""
+        tracker = self._tracker(tmp_path)
+        with patch.object(ImportErrorTracker, 'FLUSH_SIZE', 7):
+            for row in range(1, 251):
+                tracker.add_validation_error(row, 'email', 'bad', 'Missing required field')
+        
+        assert len(tracker.errors) == ImportErrorTracker.SAMPLE_SIZE
+        assert tracker.get_error_count() == 250
+        assert tracker.get_validation_error_count() == 250
+        assert tracker.get_error_summary() == {'Validation failed': 250}
+        assert os.path.getsize(tmp_path / 'errors.jsonl.gz') > 0
+        
+        page = tracker.get_errors_page(offset=240, limit=20)
+        assert [error.row_number for error in page] == list(range(241, 251))
+        assert len(tracker.get_errors()) == 250
+    
+    def test_to_json_is_bounded(self, tmp_path):
+        """Test the payload carries the sample and the log location, not every error"""
+        tracker = self._tracker(tmp_path)
+        for row in range(1, 501):
+            tracker.add_duplicate_error(row, f'user{row}@example.com')
+        
+        data = json.loads(tracker.to_json())
+        assert data['total_count'] == 500
+        assert len(data['errors']) == ImportErrorTracker.SAMPLE_SIZE
+        assert data['error_file'] == str(tmp_path / 'errors.jsonl.gz')
+        assert data['error_file_size'] == os.path.getsize(data['error_file'])
+    
+    def test_truncates_long_original_data(self, tmp_path):
+        """Test whole-row original data is capped"""
+        tracker = self._tracker(tmp_path)
+        tracker.add_error(1, 'row', 'Insert failed', 'x' * 5000)
+        original = tracker.get_errors()[0].original_data
+        assert len(original) == ImportErrorTracker.MAX_ORIGINAL_DATA_LENGTH + 3
+    
+    def test_restore_discards_errors_after_checkpoint(self, tmp_path):
+        """Test resuming from a payload drops errors logged by a rolled-back batch"""
+        tracker = self._tracker(tmp_path)
+        tracker.add_error(1, 'email', 'Missing required field', '')
+        tracker.add_error(2, 'email', 'Missing required field', '')
+        checkpoint = tracker.to_json()
+        tracker.add_error(3, 'email', 'Missing required field', '')
+        tracker.flush()
+        
+        resumed = self._tracker(tmp_path)
+        resumed.load_json(checkpoint)
+        resumed.add_error(4, 'email', 'Missing required field', '')
+        
+        assert resumed.get_error_count() == 3
+        assert [error.row_number for error in resumed.get_errors()] == [1, 2, 4]
+    
+    def test_load_json_merges_other_logs_in_order(self, tmp_path):
+        """Test partition logs are appended after the tracker's own errors"""
+        first = self._tracker(tmp_path, 'first.jsonl.gz')
+        first.add_error(1, 'email', 'Missing required field', '')
+        second = self._tracker(tmp_path, 'second.jsonl.gz')
+        second.add_duplicate_error(5, 'john@example.com')
+        second.add_duplicate_error(6, 'jane@example.com')
+        
+        merged = self._tracker(tmp_path, 'merged.jsonl.gz')
+        merged.load_json(first.to_json())
+        merged.load_json(second.to_json())
+        
+        assert merged.get_error_count() == 3
+        assert merged.get_duplicate_count() == 2
+        assert [error.row_number for error in merged.get_errors()] == [1, 5, 6]
+        assert [error.row_number for error in merged.errors] == [1, 5, 6]
+        
+        ImportErrorTracker.delete_log(second.to_json())
+        assert not os.path.exists(tmp_path / 'second.jsonl.gz')
+    
+    def test_from_json_reads_inline_errors(self):
+        """Test payloads without an error file are read from their inline errors"""
+        payload = json.dumps({
+            'errors': [{
+                'row_number': 3,
+                'column': 'email',
+                'error_message': 'Duplicate email found',
+                'original_data': 'john@example.com',
+                'timestamp': '2024-01-01T00:00:00'
+            }],
+            'summary': {'Duplicate email found': 1},
+            'total_count': 1
+        })
+        tracker = ImportErrorTracker.from_json(payload)
+        assert tracker.get_error_count() == 1
+        assert tracker.get_errors_page()[0].row_number == 3
+        # Reading does not create a log file
+        assert tracker.spill_path is None
+    
+    def test_for_job_uses_error_dir(self, import_error_dir):
+        """Test job logs live in IMPORT_ERROR_DIR"""
+        tracker = ImportErrorTracker.for_job(7)
+        assert tracker.spill_path == os.path.join(import_error_dir, 'job_7.jsonl.gz')
+        assert ImportErrorTracker.job_log_path(7, part=100).endswith('job_7.part100.jsonl.gz')
+    
+    def test_temporary_log_removed_on_close(self):
+        """Test close() deletes the temporary log a tracker created"""
+        tracker = ImportErrorTracker()
+        tracker.add_error(1, 'email', 'Missing required field', '')
+        tracker.flush()
+        spill_path = tracker.spill_path
+        assert os.path.exists(spill_path) and os.path.exists(f'{spill_path}.idx')
+        tracker.close()
+        assert not os.path.exists(spill_path) and not os.path.exists(f'{spill_path}.idx')
+    
+    def test_temporary_log_removed_when_collected(self):
+        """Test a temporary log is deleted with its tracker"""
+        tracker = ImportErrorTracker()
+        tracker.add_error(1, 'email', 'Missing required field', '')
+        tracker.flush()
+        spill_path = tracker.spill_path
+        del tracker
+        gc.collect()
+        assert not os.path.exists(spill_path)
+    
+    def test_close_keeps_job_logs(self, import_error_dir):
+        """Test close() leaves a job's log for later reads"""
+        tracker = ImportErrorTracker.for_job(7)
+        tracker.add_error(1, 'email', 'Missing required field', '')
+        tracker.flush()
+        tracker.close()
+        assert os.path.exists(tracker.spill_path)
+    
+    def test_delete_job_logs(self, import_error_dir):
+        """Test a job's log and its partitions' logs are removed, other jobs' are kept"""
+        for tracker in (ImportErrorTracker.for_job(7), ImportErrorTracker.for_job(7, part=100),
+                        ImportErrorTracker.for_job(70)):
+            tracker.add_error(1, 'email', 'Missing required field', '')
+            tracker.flush()
+        assert ImportErrorTracker.delete_job_logs(7) == 4
+        assert sorted(os.listdir(import_error_dir)) == ['job_70.jsonl.gz', 'job_70.jsonl.gz.idx']
+    
+    def test_detach_log_keeps_sample(self, tmp_path):
+        """Test a payload detached from its log still reads its error sample"""
+        tracker = self._tracker(tmp_path)
+        tracker.add_duplicate_error(4, 'john@example.com')
+        payload = ImportErrorTracker.detach_log(tracker.to_json())
+        assert json.loads(payload)['error_file'] is None
+        reader = ImportErrorTracker.from_json(payload)
+        assert [error.row_number for error in reader.get_errors_page()] == [4]
+    
+    def test_error_records_use_slots(self):
+        """Test error records carry no per-instance dict"""
+        error = ImportError(1, 'email', 'Duplicate email found', 'john@example.com')
+        assert not hasattr(error, '__dict__')
+    
+    def test_get_errors_by_type_matches_whole_message(self, tmp_path):
+        """Test get_errors_by_type matches text anywhere in the message"""
+        tracker = self._tracker(tmp_path)
+        tracker.add_duplicate_error(1, 'john@example.com')
+        tracker.add_validation_error(2, 'email', '', 'Email is required')
+        tracker.add_validation_error(3, 'phone', 'abc', 'Invalid phone format')
+        
+        assert [e.row_number for e in tracker.get_errors_by_type('required')] == [2]
+        assert [e.row_number for e in tracker.get_errors_by_type('email')] == [1]
+        assert [e.row_number for e in tracker.get_errors_by_type('Validation failed')] == [2, 3]
+        assert tracker.get_errors_of_type('required') == []
+    
+    def test_get_errors_of_type_reads_only_needed_blocks(self, tmp_path):
+        """Test type drill-downs decompress only the blocks holding matching errors"""
+        tracker = self._tracker(tmp_path)
+        with patch.object(ImportErrorTracker, 'FLUSH_SIZE', 10):
+            for row in range(1, 101):
+                if row % 50 == 0:
+                    tracker.add_duplicate_error(row, f'user{row}@example.com')
+                else:
+                    tracker.add_validation_error(row, 'email', '', 'Email is required')
+        
+        with patch.object(ImportErrorTracker, '_read_block', autospec=True,
+                          side_effect=ImportErrorTracker._read_block) as mock_read:
+            duplicates = tracker.get_errors_of_type('Duplicate')
+        
+        assert [error.row_number for error in duplicates] == [50, 100]
+        assert mock_read.call_count == 2
+        assert tracker.get_duplicate_count() == 2
+        assert tracker.get_validation_error_count() == 98
+        assert [e.row_number for e in tracker.get_errors_of_type('Validation', offset=10, limit=2)] == [11, 12]
+    
+    @pytest.mark.parametrize('flush_size', [2, 1000])
+    def test_get_row_errors(self, tmp_path, flush_size):
+        """Test row drill-downs find every error of a row, flushed or buffered"""
+        tracker = self._tracker(tmp_path)
+        with patch.object(ImportErrorTracker, 'FLUSH_SIZE', flush_size):
+            for row, column in [(9, 'email'), (3, 'email'), (9, 'phone'), (5, 'email'), (9, 'website')]:
+                tracker.add_error(row, column, 'Validation failed: bad', '')
+        
+        assert [error.column for error in tracker.get_row_errors(9)] == ['email', 'phone', 'website']
+        assert [error.column for error in tracker.get_row_errors(3)] == ['email']
+        assert tracker.get_row_errors(4) == []
+    
+    def test_indexes_survive_from_json(self, tmp_path):
+        """Test a reader rebuilt from the payload can drill down without scanning"""
+        first = self._tracker(tmp_path, 'first.jsonl.gz')
+        first.add_error(1, 'email', 'Missing required field', '')
+        second = self._tracker(tmp_path, 'second.jsonl.gz')
+        second.add_duplicate_error(2, 'john@example.com')
+        second.add_error(2, 'phone', 'Missing required field', '')
+        
+        merged = self._tracker(tmp_path, 'merged.jsonl.gz')
+        merged.load_json(first.to_json())
+        merged.load_json(second.to_json())
+        
+        reader = ImportErrorTracker.from_json(merged.to_json())
+        assert reader.get_error_count() == 3
+        assert [error.column for error in reader.get_row_errors(2)] == ['email', 'phone']
+        assert [error.row_number for error in reader.get_errors_of_type('Missing')] == [1, 2]
+        assert [error.row_number for error in reader.get_errors_page(1, 1)] == [2]
@@ -0,0 +1,97 @@
+"""
+Tests for import progress publisher
+"""
+import pytest
+from unittest.mock import patch
+from django.core.cache import cache
+from services.import_error_tracker import ImportErrorTracker
+from services.import_progress_publisher import ImportProgressPublisher
+
+
+LOCMEM_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+
+@pytest.mark.django_db
+class TestImportProgressPublisher:
+    """Test ImportProgressPublisher"""
+    
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        cache.clear()
+    
+    def test_is_due_coalesces_to_cadence(self, import_job):
+        """Test only the first update within a cadence interval is due"""
+        publisher = ImportProgressPublisher(import_job, cadence=60)
+        assert publisher.is_due() is True
+        assert publisher.is_due() is False
+        
+        publisher = ImportProgressPublisher(import_job, cadence=0)
+        assert publisher.is_due() is True
+        assert publisher.is_due() is True
+    
+    def test_save_checkpoint_writes_counters_only(self, import_job):
+        """Test checkpoints leave other columns, such as a cancelled status, untouched"""
+        publisher = ImportProgressPublisher(import_job)
+        import_job.__class__.objects.filter(id=import_job.id).update(status='CANCELLED')
+        
+        import_job.processed_rows = 10
+        import_job.success_count = 9
+        import_job.status = 'PROCESSING'
+        publisher.save_checkpoint(ImportErrorTracker())
+        
+        import_job.refresh_from_db()
+        assert import_job.processed_rows == 10
+        assert import_job.success_count == 9
+        assert import_job.status == 'CANCELLED'
+    
+    def test_save_checkpoint_writes_error_log_when_errors_change(self, import_job):
+        """Test the error log is serialized only after new errors"""
+        publisher = ImportProgressPublisher(import_job)
+        tracker = ImportErrorTracker()
+        tracker.add_error(2, 'email', 'Missing required field', '')
+        
+        with patch.object(tracker, 'to_json', wraps=tracker.to_json) as mock_to_json:
+            publisher.save_checkpoint(tracker)
+            publisher.save_checkpoint(tracker)
+        
+        assert mock_to_json.call_count == 1
+        import_job.refresh_from_db()
+        assert 'Missing required field' in import_job.error_log
+    
+    def test_publish_sends_progress(self, import_job):
+        """Test publish writes the speed and sends a WebSocket update"""
+        import_job.total_rows = 100
+        import_job.processed_rows = 50
+        publisher = ImportProgressPublisher(import_job)
+        publisher.start_rows = 0
+        
+        with patch.object(publisher, 'send') as mock_send:
+            publisher.publish()
+        
+        data = mock_send.call_args[0][0]
+        assert data['job_id'] == import_job.id
+        assert data['processed_rows'] == 50
+        assert data['progress'] == 50.0
+    
+    def test_request_cancel_sets_cache_flag(self, import_job, settings):
+        """Test cancellation is read from the cache without querying the job"""
+        settings.CACHES = LOCMEM_CACHES
+        publisher = ImportProgressPublisher(import_job)
+        assert publisher.is_cancelled() is False
+        
+        ImportProgressPublisher.request_cancel(import_job.id)
+        assert publisher.is_cancelled() is True
+    
+    def test_is_cancelled_falls_back_to_database(self, import_job):
+        """Test cancellation is still seen when the cache is not shared"""
+        publisher = ImportProgressPublisher(import_job)
+        import_job.__class__.objects.filter(id=import_job.id).update(status='CANCELLED')
+        # Not checked again until the database interval has passed
+        assert publisher.is_cancelled() is False
+        
+        publisher._last_cancel_check -= ImportProgressPublisher.CANCEL_DB_CHECK_SECONDS
+        assert publisher.is_cancelled() is True
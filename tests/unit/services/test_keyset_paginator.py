@@ -0,0 +1,148 @@
+"""
+Tests for keyset paginator
+"""
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import patch
+from django.core.cache import cache
+from apps.contacts.models import Contact
+from services.contact_service import ContactService
+from services.keyset_paginator import ApproximateCountPaginator, CountEstimator, KeysetPaginator
+
+
+@pytest.fixture(autouse=True)
+def locmem_cache(settings):
+    """Fresh in-process cache, so cached counts do not leak between tests"""
+    settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def same_time_contacts(multiple_contacts):
+    """Contacts that all share one created_at, so only id orders them"""
+    Contact.objects.update(created_at=datetime(2026, 1, 1, tzinfo=timezone.utc))
+    return multiple_contacts
+
+
+@pytest.mark.django_db
+class TestKeysetPaginator:
+    """Test KeysetPaginator"""
+    
+    def _walk_forward(self, paginator):
+        """Follow next cursors from the first page"""
+        pages = [paginator.get_page()]
+        while pages[-1].has_next():
+            pages.append(paginator.get_page(pages[-1].next_cursor))
+        return pages
+    
+    def test_pages_match_offset_order(self, multiple_contacts):
+        """Test walking cursors visits every contact in offset order"""
+        queryset = Contact.objects.order_by('-created_at', '-id')
+        pages = self._walk_forward(KeysetPaginator(queryset, 3))
+        
+        assert [len(page) for page in pages] == [3, 3, 3, 1]
+        assert [c.pk for page in pages for c in page] == list(queryset.values_list('pk', flat=True))
+        assert not pages[0].has_previous()
+        assert pages[-1].has_previous() and not pages[-1].has_next()
+    
+    def test_ties_on_created_at_break_by_id(self, same_time_contacts):
+        """Test contacts with the same created_at are neither skipped nor repeated"""
+        pages = self._walk_forward(KeysetPaginator(Contact.objects.all(), 4))
+        ids = [c.pk for page in pages for c in page]
+        
+        assert ids == sorted((c.pk for c in same_time_contacts), reverse=True)
+    
+    def test_previous_cursor_returns_previous_page(self, same_time_contacts):
+        """Test going back gives the same rows as going forward"""
+        paginator = KeysetPaginator(Contact.objects.all(), 4)
+        pages = self._walk_forward(paginator)
+        
+        back = paginator.get_page(pages[2].previous_cursor)
+        
+        assert [c.pk for c in back] == [c.pk for c in pages[1]]
+        assert back.has_next() and back.has_previous()
+        first = paginator.get_page(back.previous_cursor)
+        assert [c.pk for c in first] == [c.pk for c in pages[0]]
+        assert not first.has_previous()
+    
+    def test_invalid_cursor_gives_first_page(self, multiple_contacts):
+        """Test a malformed cursor falls back to the first page"""
+        paginator = KeysetPaginator(Contact.objects.all(), 3)
+        
+        page = paginator.get_page('not-a-cursor')
+        
+        assert [c.pk for c in page] == [c.pk for c in paginator.get_page()]
+        with pytest.raises(ValueError):
+            KeysetPaginator.decode_cursor('not-a-cursor')
+    
+    def test_cursor_round_trip(self, contact):
+        """Test cursors decode to the object's position"""
+        cursor = KeysetPaginator.encode_cursor('n', contact)
+        
+        assert KeysetPaginator.decode_cursor(cursor) == ('n', contact.created_at, contact.pk)
+
+
+@pytest.mark.django_db
+class TestCountEstimator:
+    """Test CountEstimator"""
+    
+    def test_count_is_cached(self, multiple_contacts):
+        """Test a repeated count does not query again"""
+        queryset = Contact.objects.filter(country='USA')
+        assert CountEstimator.count(queryset) == 4
+        
+        with patch.object(type(queryset), 'count') as mock_count:
+            assert CountEstimator.count(Contact.objects.filter(country='USA')) == 4
+        mock_count.assert_not_called()
+    
+    def test_unfiltered_postgres_uses_planner_estimate(self, multiple_contacts):
+        """Test large unfiltered tables use pg_class.reltuples on PostgreSQL"""
+        with patch('services.keyset_paginator.connection') as mock_connection, \
+                patch.object(CountEstimator, 'table_estimate', return_value=2500000) as mock_estimate:
+            mock_connection.vendor = 'postgresql'
+            assert CountEstimator.count(Contact.objects.all()) == 2500000
+            # Filtered querysets are counted
+            assert CountEstimator.count(Contact.objects.filter(country='UK')) == 3
+        
+        mock_estimate.assert_called_once_with('contacts')
+    
+    def test_small_estimate_counts_exactly(self, multiple_contacts):
+        """Test small or unanalyzed tables are counted exactly"""
+        with patch('services.keyset_paginator.connection') as mock_connection, \
+                patch.object(CountEstimator, 'table_estimate', return_value=-1):
+            mock_connection.vendor = 'postgresql'
+            assert CountEstimator.count(Contact.objects.all()) == 10
+    
+    def test_approximate_count_paginator(self, multiple_contacts):
+        """Test the offset paginator takes its count from the estimator"""
+        paginator = ApproximateCountPaginator(Contact.objects.order_by('-created_at', '-id'), 3)
+        
+        assert paginator.count == 10
+        assert paginator.num_pages == 4
+
+
+@pytest.mark.django_db
+class TestFilterContactsCursor:
+    """Test ContactService.filter_contacts cursor mode"""
+    
+    def test_cursor_mode(self, same_time_contacts):
+        """Test cursor mode returns cursors and pages without overlap"""
+        first = ContactService.filter_contacts({'country': ['USA', 'UK']}, per_page=5, cursor='')
+        second = ContactService.filter_contacts({'country': ['USA', 'UK']}, per_page=5, cursor=first['next_cursor'])
+        
+        assert first['total'] == 7
+        assert first['previous_cursor'] is None
+        assert len(first['contacts']) == 5 and len(second['contacts']) == 2
+        assert second['next_cursor'] is None
+        assert not {c.pk for c in first['contacts']} & {c.pk for c in second['contacts']}
+    
+    def test_offset_mode(self, multiple_contacts):
+        """Test page numbers still work without a cursor"""
+        result = ContactService.filter_contacts({}, page=2, per_page=4)
+        
+        assert result['total'] == 10
+        assert result['pages'] == 3
+        assert len(result['contacts']) == 4
+        assert 'next_cursor' not in result
@@ -0,0 +1,36 @@
+"""
+Tests for mapping template service
+"""
+import pytest
+from apps.imports.models import ColumnMappingTemplate
+from services.mapping_template_service import MappingTemplateService
+
+
+@pytest.mark.django_db
+class TestMappingTemplateService:
+    """Test MappingTemplateService"""
+    
+    def test_find_mapping_without_template(self):
+        """Test unknown headers have no saved mapping"""
+        assert MappingTemplateService.find_mapping('user-id', ['Email']) is None
+    
+    def test_save_and_find_mapping(self):
+        """Test a saved mapping is found for the same header in another order"""
+        MappingTemplateService.save_mapping(
+            'user-id', ['Mail', 'Given'], {'Mail': 'email', 'Given': 'first_name'}
+        )
+        
+        mapping = MappingTemplateService.find_mapping('user-id', ['given ', 'MAIL'])
+        assert mapping == {'given ': 'first_name', 'MAIL': 'email'}
+        # Finding a mapping for a preview is not a use
+        assert ColumnMappingTemplate.objects.get().use_count == 1
+        # Templates are per user
+        assert MappingTemplateService.find_mapping('other-user', ['Mail', 'Given']) is None
+    
+    def test_save_mapping_replaces_template(self):
+        """Test saving the same header again updates the template"""
+        MappingTemplateService.save_mapping('user-id', ['Mail'], {'Mail': 'email'})
+        template = MappingTemplateService.save_mapping('user-id', ['Mail'], {})
+        assert ColumnMappingTemplate.objects.count() == 1
+        assert template.use_count == ColumnMappingTemplate.objects.get().use_count == 2
+        assert MappingTemplateService.find_mapping('user-id', ['Mail']) == {}
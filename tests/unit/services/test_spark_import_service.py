@@ -0,0 +1,245 @@
+"""
+Tests for Spark import service
+"""
+import pytest
+from unittest.mock import patch
+from django.db import connection
+from apps.contacts.models import Contact
+from services import spark_import_service
+from services.bulk_insert_service import BulkInsertService, import_fields
+from services.csv_stream_reader import CSVStreamReader, NA_VALUES
+from services.spark_import_service import SparkImportService, PYSPARK_AVAILABLE
+from services.type_converter import TypeConverter
+
+
+requires_pyspark = pytest.mark.skipif(not PYSPARK_AVAILABLE, reason='PySpark is not installed')
+requires_postgres = pytest.mark.skipif(
+    connection.vendor != 'postgresql',
+    reason='Spark import requires PostgreSQL'
+)
+
+
+@pytest.fixture(scope='module')
+def spark():
+    """Local SparkSession without the JDBC package"""
+    from pyspark.sql import SparkSession
+    session = SparkSession.builder.master('local[1]').appName('test-import').getOrCreate()
+    yield session
+    session.stop()
+
+
+@pytest.fixture
+def service(spark):
+    """Spark import service whose existing contacts are taken@example.com only"""
+    service = SparkImportService(spark=spark)
+    existing = spark.createDataFrame([('taken@example.com',)], ['_existing_key'])
+    with patch.object(service, '_existing_keys', return_value=existing):
+        yield service
+
+
+def classify(service, tmp_path, text, mapping):
+    """Read, convert and classify CSV text; returns rows by row number"""
+    path = tmp_path / 'contacts.csv'
+    path.write_text(text)
+    raw = service._with_row_numbers(service._read_csv(str(path)))
+    classified = service._classify(service._map_and_convert(raw, 'user-1', mapping))
+    return {row['_row_number']: row for row in classified.collect()}
+
+
+class TestSparkImportService:
+    """Test SparkImportService"""
+    
+    def test_is_available_requires_pyspark(self):
+        """Test Spark engine is unavailable without PySpark"""
+        with patch.object(spark_import_service, 'PYSPARK_AVAILABLE', False):
+            assert SparkImportService.is_available() is False
+    
+    def test_init_requires_pyspark(self):
+        """Test service cannot be created without PySpark"""
+        with patch.object(spark_import_service, 'PYSPARK_AVAILABLE', False):
+            with pytest.raises(RuntimeError):
+                SparkImportService()
+    
+    @requires_pyspark
+    @pytest.mark.parametrize('field_name', ['employees_count', 'is_active', 'company'])
+    def test_convert_column_matches_type_converter(self, spark, field_name):
+        """Test Spark conversion matches TypeConverter for CSV string values"""
+        from pyspark.sql import functions as F
+        values = ['42', ' 12.5 ', '13.5', 'abc', 'null', 'None', 'yes', 'False', ' Acme ', '']
+        df = spark.createDataFrame([(value,) for value in values], ['value'])
+        converted = df.select(
+            SparkImportService._convert_column(F.col('value'), field_name).alias('converted')
+        ).collect()
+        
+        for value, row in zip(values, converted):
+            if value.strip() == '' or value in NA_VALUES:
+                # CSVStreamReader reads these cells as missing values
+                assert row['converted'] is None
+            elif field_name == 'is_active':
+                # Booleans stay text until they are staged
+                expected = TypeConverter.convert_value(field_name, value)
+                assert row['converted'] == (expected if expected == '' else str(expected).lower())
+            else:
+                assert row['converted'] == TypeConverter.convert_value(field_name, value)
+    
+    @requires_postgres
+    @pytest.mark.django_db
+    def test_merge_contacts_inserts_staged_rows_once(self):
+        """Test staged rows are merged in CSV order and conflicts count separately"""
+        Contact.objects.create(first_name='Taken', last_name='User', email='taken@example.com')
+        fields = import_fields()
+        types = {'IntegerField': 'bigint', 'BooleanField': 'boolean'}
+        staged = [
+            (2, {'email': 'b@example.com', 'email_key': 'b@example.com', 'employees_count': 7, 'is_active': False}),
+            (1, {'email': 'a@example.com', 'email_key': 'a@example.com'}),
+            (3, {'email': 'Taken@example.com', 'email_key': 'taken@example.com'}),
+        ]
+        columns = [field.column for field in fields]
+        with connection.cursor() as cursor:
+            cursor.execute('CREATE TABLE contacts_import_spark_test (_row_number bigint, {})'.format(', '.join(
+                f'"{field.column}" {types.get(field.get_internal_type(), "text")}' for field in fields
+            )))
+            for row_number, values in staged:
+                cursor.execute(
+                    f"INSERT INTO contacts_import_spark_test VALUES (%s{', %s' * len(fields)})",
+                    [row_number] + [values.get(field.name, field.get_default()) for field in fields]
+                )
+        
+        assert SparkImportService._merge_contacts('contacts_import_spark_test', columns) == (2, 1)
+        merged = Contact.objects.exclude(email='taken@example.com').order_by('id')
+        assert [(c.email, c.employees_count, c.is_active) for c in merged] == [
+            ('a@example.com', None, True), ('b@example.com', 7, False)
+        ]
+        assert all(c.created_at and c.updated_at for c in merged)
+    
+    @requires_pyspark
+    def test_with_row_numbers(self, spark):
+        """Test rows are numbered from 1 in file order"""
+        service = SparkImportService(spark=spark)
+        rows = spark.sparkContext.parallelize([(f'user{i}@example.com',) for i in range(5)], 3)
+        numbered = service._with_row_numbers(spark.createDataFrame(rows, ['email'])).collect()
+        
+        assert [row['_row_number'] for row in numbered] == [1, 2, 3, 4, 5]
+        assert [row['email'] for row in numbered] == [f'user{i}@example.com' for i in range(5)]
+        assert numbered[0]['_original_data'] == '{"email":"user0@example.com"}'
+    
+    @requires_pyspark
+    def test_classify_duplicates_take_precedence(self, service, tmp_path):
+        """Test existing and repeated emails are duplicates even when otherwise invalid"""
+        rows = classify(service, tmp_path, (
+            'email,phone\n'
+            'a@example.com,555-1234\n'
+            'Taken@Example.com,not a phone\n'
+            'A@EXAMPLE.COM,not a phone\n'
+            'b@example.com,not a phone\n'
+        ), {'email': 'email', 'phone': 'phone'})
+        
+        assert rows[1]['_status'] is None
+        assert rows[2]['_status'] == 'duplicate'
+        assert rows[3]['_status'] == 'duplicate'
+        assert (rows[4]['_status'], rows[4]['_error_column']) == ('error', 'phone')
+    
+    @requires_pyspark
+    def test_classify_reports_first_failing_check(self, service, tmp_path):
+        """Test missing emails, formats and database bounds are errors in ORM order"""
+        long_name = 'x' * 151
+        rows = classify(service, tmp_path, (
+            'email,website,first_name,employees_count,is_active\n'
+            ',ftp://bad,,,\n'
+            'NONE,,,,\n'
+            'bad-email,ftp://bad,,,\n'
+            'c@example.com,ftp://bad,,,\n'
+            f'd@example.com,,{long_name},3000000000,\n'
+            'e@example.com,,,,Null\n'
+            'f@example.com,,,,null\n'
+        ), {
+            'email': 'email', 'website': 'website', 'first_name': 'first_name',
+            'employees_count': 'employees_count', 'is_active': 'is_active'
+        })
+        
+        errors = {number: (row['_status'], row['_error_column']) for number, row in rows.items()}
+        assert errors == {
+            1: ('error', 'email'),
+            2: ('error', 'email'),
+            3: ('error', 'email'),
+            4: ('error', 'website'),
+            5: ('error', 'first_name'),
+            6: ('error', 'is_active'),
+            7: (None, None),
+        }
+        assert rows[1]['_error_message'] == 'Validation failed: Email is required'
+        assert rows[3]['_error_message'] == 'Validation failed: Invalid email format'
+        assert rows[6]['_error_message'] == "Error: ['“” value must be either True or False.']"
+    
+    @requires_pyspark
+    def test_classify_integer_bounds(self, service, tmp_path):
+        """Test integers outside the PostgreSQL integer range are errors"""
+        rows = classify(service, tmp_path, (
+            'email,employees_count\n'
+            'a@example.com,2147483647\n'
+            'b@example.com,2147483648\n'
+            'c@example.com,-2147483649\n'
+        ), {'email': 'email', 'employees_count': 'employees_count'})
+        
+        assert rows[1]['_status'] is None
+        assert rows[2]['_error_message'] == 'Error: integer out of range'
+        assert rows[3]['_error_column'] == 'employees_count'
+    
+    @requires_pyspark
+    def test_report_errors_in_row_order(self, service, tmp_path):
+        """Test duplicates and errors reach the tracker in row order"""
+        path = tmp_path / 'contacts.csv'
+        path.write_text('email\nbad-email\ntaken@example.com\nok@example.com\n""\n')
+        raw = service._with_row_numbers(service._read_csv(str(path)))
+        service._report_errors(service._classify(service._map_and_convert(raw, 'user-1', {'email': 'email'})))
+        
+        errors = service.get_error_tracker().get_errors()
+        assert [(error.row_number, error.column) for error in errors] == [(1, 'email'), (2, 'email'), (4, 'email')]
+        assert errors[1].error_message == 'Duplicate email found'
+        assert errors[1].original_data == 'taken@example.com'
+    
+    @requires_pyspark
+    @pytest.mark.django_db
+    def test_classify_matches_bulk_insert_service(self, service, tmp_path, user):
+        """Test Spark rejects and converts the same rows as the ORM engine"""
+        text = (
+            'email,first_name,employees_count,is_active,phone\n'
+            'a@example.com,Ann,12.5,yes,\n'
+            'Taken@Example.com,Ben,,,\n'
+            'A@EXAMPLE.COM,Ann,,,not a phone\n'
+            ',Nobody,,,\n'
+            'not-an-email,Bad,,,\n'
+            'c@example.com,Cal,7,NONE,\n'
+            'd@example.com,Dee,abc,False,555-1234\n'
+            'e@example.com,Eve,,null,\n'
+            'f@example.com,Fay, 3 ,Null,\n'
+            'null,Nil,,,\n'
+            'g@example.com,Gus,,nan,\n'
+        )
+        mapping = {
+            'email': 'email', 'first_name': 'first_name', 'employees_count': 'employees_count',
+            'is_active': 'is_active', 'phone': 'phone'
+        }
+        Contact.objects.create(first_name='Taken', last_name='User', email='taken@example.com')
+        
+        bulk_service = BulkInsertService()
+        df = CSVStreamReader.parse(text.encode())
+        bulk_service.bulk_insert_set_based(df, str(user.id), mapping)
+        orm_statuses = {
+            error.row_number: 'duplicate' if error.error_message == 'Duplicate email found' else 'error'
+            for error in bulk_service.get_errors()
+        }
+        orm_contacts = set(
+            Contact.objects.exclude(email='taken@example.com')
+            .values_list('email', 'employees_count', 'is_active')
+        )
+        
+        rows = classify(service, tmp_path, text, mapping)
+        spark_statuses = {number: row['_status'] for number, row in rows.items() if row['_status']}
+        spark_contacts = {
+            (row['email'], row['employees_count'], row['is_active'] != 'false')
+            for row in rows.values() if row['_status'] is None
+        }
+        
+        assert spark_statuses == orm_statuses
+        assert spark_contacts == orm_contacts
@@ -88,3 +88,97 @@ class TestTypeConverter:
         # Should keep existing full_name or merge
         assert 'full_name' in result
 
+
+PARITY_FIELDS = ['employees_count', 'is_active', 'company']
+
+PARITY_COLUMNS = {
+    'strings': [
+        '42', ' 42 ', '42.0', '12.5', '13.5', '-2.5', '1e3', '1_000', '1,000', 'abc', '',
+        '   ', 'NaN', ' null ', 'None', 'nan ', '-nan', 'TRUE', ' true', 'Yes', 't', '0', '1',
+        '9007199254740993', '123456789012345678901234567890', 'Ünïcode', None, float('nan')
+    ],
+    'floats': [1.0, 0.0, -0.0, 12.6, -12.6, 2.5, 1e20, 9427000.0, float('nan'), 0.1],
+    'ints': [0, 1, -7, 2 ** 40],
+    'bools': [True, False, True],
+    'mixed': ['12', 7, 0, 3.5, None, True, ' x ', float('nan')],
+    'nulls': [None, None],
+    'all_nan': [float('nan'), float('nan')],
+}
+
+
+def _typed(values):
+    """Pair values with their types so 1, 1.0 and True are not considered equal"""
+    return [(type(value), value) for value in values]
+
+
+class TestConvertSeriesParity:
+    """Test convert_series matches convert_value cell for cell"""
+    
+    @pytest.mark.parametrize('field_name', PARITY_FIELDS)
+    @pytest.mark.parametrize('column', sorted(PARITY_COLUMNS))
+    def test_parity(self, field_name, column):
+        """Test vectorized conversion matches the scalar function"""
+        series = pd.Series(PARITY_COLUMNS[column])
+        expected = [TypeConverter.convert_value(field_name, value) for value in series.tolist()]
+        assert _typed(TypeConverter.convert_series(field_name, series).tolist()) == _typed(expected)
+    
+    @pytest.mark.parametrize('field_name', PARITY_FIELDS)
+    def test_parity_read_csv(self, field_name, tmp_path):
+        """Test parity on columns typed by pd.read_csv"""
+        test_file = tmp_path / 'values.csv'
+        test_file.write_text(
+            'text,number,integer,flag\n'
+            ' a ,1.5,1,true\n'
+            'null,,0,false\n'
+            ',3.0,-4,true\n'
+        )
+        df = pd.read_csv(test_file)
+        for column in df.columns:
+            expected = [TypeConverter.convert_value(field_name, value) for value in df[column].tolist()]
+            assert _typed(TypeConverter.convert_series(field_name, df[column]).tolist()) == _typed(expected)
+    
+    def test_parity_random_decimals(self):
+        """Test integer rounding matches float() parsing and round()"""
+        import random
+        rng = random.Random(7)
+        values = [f"{rng.uniform(-1e6, 1e6):.{rng.randint(0, 12)}f}" for _ in range(2000)]
+        values += [f"{rng.randint(0, 10 ** 6)}.5" for _ in range(500)]
+        series = pd.Series(values)
+        expected = [TypeConverter.convert_value('employees_count', value) for value in values]
+        assert _typed(TypeConverter.convert_series('employees_count', series).tolist()) == _typed(expected)
+    
+    def test_infinity_reported_per_row(self):
+        """Test infinite integers only fail their own row when errors are collected"""
+        with pytest.raises(OverflowError):
+            TypeConverter.convert_value('employees_count', 'inf')
+        with pytest.raises(OverflowError):
+            TypeConverter.convert_series('employees_count', pd.Series(['1', 'inf']))
+        errors = {}
+        series = pd.Series(['1', 'inf', '1e999', '3.0'], index=[10, 11, 12, 13])
+        result = TypeConverter.convert_series('employees_count', series, errors)
+        assert result.tolist() == [1, None, None, 3]
+        assert sorted(errors) == [11, 12]
+        assert all(isinstance(error, OverflowError) for error in errors.values())
+    
+    def test_convert_frame_collects_errors(self):
+        """Test convert_frame reports each failing row once with its column"""
+        df = pd.DataFrame({'employees': ['1', 'inf', '2'], 'revenue': ['5', 'inf', '6']})
+        errors = {}
+        frame = TypeConverter.convert_frame(df, {'employees': 'employees_count', 'revenue': 'annual_revenue'}, errors)
+        assert frame['employees'].tolist() == [1, None, 2]
+        assert list(errors) == [1]
+        assert errors[1][0] == 'employees'
+    
+    def test_convert_frame(self):
+        """Test convert_frame converts mapped columns and keeps the index"""
+        df = pd.DataFrame(
+            {'Employees': ['10', 'n/a'], 'Company': [' Acme ', None], 'Ignored': ['x', 'y']},
+            index=[5, 6]
+        )
+        converted = TypeConverter.convert_frame(
+            df, {'Employees': 'employees_count', 'Company': 'company', 'Missing': 'title'}
+        )
+        assert list(converted.columns) == ['Employees', 'Company']
+        assert list(converted.index) == [5, 6]
+        assert converted['Employees'].tolist() == [10, None]
+        assert converted['Company'].tolist() == ['Acme', None]